@@ -0,0 +1,82 @@
+"""
+Memory benchmark: regular vs slotted config classes vs columnar record tables
+
+Builds a large synthetic routing table config with from_dict in every mode
+and reports the memory held by the resulting config objects.
+
+usage: python benchmarks/memory_benchmark.py [--entries 50000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Any
+
+from heracless.utils.class_cache import class_cache_clear
+from heracless.utils.helper import from_dict
+
+
+def synthetic_config(entries: int) -> dict[str, Any]:
+    """
+    Generate a routing table config with `entries` uniform records.
+
+    :param entries: Number of route records.
+    :return: The config dict.
+    """
+    return {
+        "service": {"name": "router", "port": 8080},
+        "routes": [
+            {
+                "path": f"/api/v1/resource/{index}",
+                "upstream": f"backend-{index % 32}",
+                "weight": index % 10,
+                "timeout": 2.5,
+                "retries": 3,
+                "enabled": index % 7 != 0,
+            }
+            for index in range(entries)
+        ],
+    }
+
+
+def measure(config_dict: dict[str, Any], slots: bool = False, tables: bool = False) -> int:
+    """
+    Measure the memory retained by the config objects built from config_dict.
+
+    :param config_dict: The config dict.
+    :param slots: Whether slotted classes are used.
+    :param tables: Whether uniform lists are stored as RecordTables.
+    :return: Retained bytes.
+    """
+    class_cache_clear()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    config = from_dict(config_dict, slots=slots, tables=tables)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del config
+    return retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare memory of regular, slotted and columnar configs")
+    parser.add_argument("--entries", type=int, default=50_000, help="number of route records")
+    args = parser.parse_args()
+
+    config_dict = synthetic_config(args.entries)
+    regular = measure(config_dict, slots=False)
+    slotted = measure(config_dict, slots=True)
+    columnar = measure(config_dict, tables=True)
+    print(f"entries:        {args.entries}")
+    print(f"regular:        {regular / 2**20:8.2f} MiB ({regular / args.entries:6.1f} B/record)")
+    print(f"slots=True:     {slotted / 2**20:8.2f} MiB ({slotted / args.entries:6.1f} B/record)")
+    print(f"reduction:      {100 * (1 - slotted / regular):8.1f} %")
+    print(f"tables=True:    {columnar / 2**20:8.2f} MiB ({columnar / args.entries:6.1f} B/record)")
+    print(f"reduction:      {100 * (1 - columnar / regular):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
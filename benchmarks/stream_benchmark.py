@@ -0,0 +1,78 @@
+"""
+Peak memory benchmark: loading through a dict vs streaming from YAML events
+
+Writes a large synthetic routing table YAML file and reports the peak memory
+allocated while loading it with fight(stream=False) and fight(stream=True).
+
+usage: python benchmarks/stream_benchmark.py [--entries 100000]
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from heracless.fight import fight
+from heracless.utils.class_cache import class_cache_clear
+
+
+def write_config(path: Path, entries: int) -> None:
+    """
+    Write a routing table config with `entries` records.
+
+    :param path: Target YAML file.
+    :param entries: Number of route records.
+    """
+    with open(path, "w") as config:
+        config.write("service:\n  name: router\n  port: 8080\nroutes:\n")
+        for index in range(entries):
+            config.write(
+                f"  - path: /api/v1/resource/{index}\n"
+                f"    upstream: backend-{index % 32}\n"
+                f"    weight: {index % 10}\n"
+                "    timeout: 2.5\n"
+                f"    enabled: {'false' if index % 7 == 0 else 'true'}\n"
+            )
+
+
+def measure(path: Path, stream: bool) -> tuple[int, float]:
+    """
+    Measure peak traced memory and wall time of one load.
+
+    :param path: The YAML file.
+    :param stream: Whether the config is built from the event stream.
+    :return: Peak bytes and seconds.
+    """
+    class_cache_clear()
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    config = fight(path, None, frozen=True, loader="libyaml", stream=stream)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del config
+    return peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare peak memory of dict based and streaming loads")
+    parser.add_argument("--entries", type=int, default=100_000, help="number of route records")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "routes.yaml"
+        write_config(path, args.entries)
+        size = path.stat().st_size
+        regular, regular_time = measure(path, stream=False)
+        streamed, streamed_time = measure(path, stream=True)
+    print(f"file size:      {size / 2**20:8.2f} MiB ({args.entries} records)")
+    print(f"dict + build:   {regular / 2**20:8.2f} MiB peak, {regular_time:6.2f} s")
+    print(f"stream=True:    {streamed / 2**20:8.2f} MiB peak, {streamed_time:6.2f} s")
+    print(f"reduction:      {100 * (1 - streamed / regular):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
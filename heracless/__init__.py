@@ -1,4 +1,7 @@
 from heracless.cli_tool import run_cli as _run_cli
 from heracless.fight import fight as load_config
+from heracless.fight import fight_all as load_config_all
+from heracless.fight import fight_many as load_configs
+
 if __name__ == "__main__":
     _run_cli()
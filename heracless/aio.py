@@ -0,0 +1,119 @@
+"""
+asyncio interface of heracless
+
+Loading and reloading run file I/O and parsing in the event loop's default executor,
+so large config files do not block the loop. Concurrent loads of the same file with the
+same options are coalesced into one parse, every awaiter gets the same config object.
+"""
+
+import asyncio
+import os
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+from heracless.fight import fight
+from heracless.watch import DEFAULT_DEBOUNCE, DEFAULT_INTERVAL, ConfigHandle
+
+# (loop, path, options) -> future of the running parse
+_IN_FLIGHT: dict[tuple[Any, ...], "asyncio.Future[Optional[Any]]"] = {}
+
+
+async def aload_config(
+    cfg_dir: Path | str,
+    dump_dir: Optional[Path | str] = None,
+    frozen: bool = True,
+    loader: Optional[str] = None,
+    cache_dir: Optional[Path | str] = None,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    lazy: bool = False,
+    stream: bool = False,
+    select: Optional[Iterable[str]] = None,
+    includes: bool = False,
+) -> Optional[Any]:
+    """
+    Load a YAML config without blocking the event loop, the parameters are the ones of fight().
+    While a load of the same file with the same options is running, callers await that load
+    instead of parsing the file again (with frozen=False they share the mutable config object).
+
+    :param cfg_dir: Path to the YAML configuration file.
+    :param dump_dir: Stub file to write, None to skip dumping.
+    :return: Configuration object or None if the config is empty.
+    :raises Exception: Whatever fight raises, every coalesced awaiter gets the exception.
+    """
+    loop = asyncio.get_running_loop()
+    selection = ((select,) if isinstance(select, str) else tuple(select)) if select is not None else None
+    key = (
+        loop,
+        os.path.realpath(cfg_dir),
+        str(dump_dir) if dump_dir is not None else None,
+        frozen,
+        loader,
+        str(cache_dir) if cache_dir is not None else None,
+        slots,
+        arrays,
+        tables,
+        lazy,
+        stream,
+        selection,
+        includes,
+    )
+    pending = _IN_FLIGHT.get(key)
+    if pending is None:
+        load = partial(
+            fight,
+            cfg_dir,
+            Path(dump_dir) if dump_dir is not None else None,
+            frozen,
+            loader=loader,
+            cache_dir=cache_dir,
+            slots=slots,
+            arrays=arrays,
+            tables=tables,
+            lazy=lazy,
+            stream=stream,
+            select=selection,
+            includes=includes,
+        )
+        pending = _IN_FLIGHT[key] = loop.run_in_executor(None, load)
+        pending.add_done_callback(lambda _: _IN_FLIGHT.pop(key, None))
+    return await asyncio.shield(pending)  # a cancelled awaiter does not cancel the others
+
+
+async def watch(
+    cfg_dir: Path | str,
+    frozen: bool = True,
+    loader: Optional[str] = None,
+    dump_dir: Optional[Path] = None,
+    interval: float = DEFAULT_INTERVAL,
+    debounce: float = DEFAULT_DEBOUNCE,
+    on_error: Optional[Callable[[BaseException], None]] = None,
+) -> AsyncIterator[Any]:
+    """
+    Async iterator over the versions of a config: yields the current config first and a new one
+    after every successful reload (see ConfigHandle). Polling and parsing run in the default executor,
+    a failed reload keeps the previous config and is passed to on_error. Stops polling when the iteration ends.
+
+    :param cfg_dir: Path to the YAML configuration file.
+    :param frozen: Whether the config object is frozen.
+    :param loader: YAML loader backend, None selects the fastest available one.
+    :param dump_dir: Stub file to update on reloads, None to skip dumping.
+    :param interval: Seconds between two polls of the config file.
+    :param debounce: Seconds the file has to stay unchanged before it is reloaded.
+    :param on_error: Called with the exception if a reload fails.
+    :return: Async iterator over the config objects.
+    :raises Exception: Whatever reload_config raises if the initial load fails.
+    """
+    loop = asyncio.get_running_loop()
+    create = partial(ConfigHandle, cfg_dir, frozen, loader, dump_dir, interval, debounce, None, on_error, False)
+    handle = await loop.run_in_executor(None, create)
+    try:
+        yield handle.config
+        while True:
+            await asyncio.sleep(interval)
+            if await loop.run_in_executor(None, handle.poll):
+                yield handle.config
+    finally:
+        handle.stop()  # ends a debounce wait of a running poll
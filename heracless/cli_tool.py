@@ -5,10 +5,11 @@ from pathlib import Path
 from typing import Optional
 
 from art import text2art
-from yaml import full_load
 
 from heracless.fight import dump_in_console, dump_in_file
 from heracless.fight import fight as main
+from heracless.loaders import available_loaders, last_backend
+from heracless.utils.compiler import compile_config
 
 
 def parse_args() -> argparse.Namespace:
@@ -19,11 +20,17 @@ def parse_args() -> argparse.Namespace:
     """
     parser = argparse.ArgumentParser(
         description="Heracless Client Tool",
-        usage="""heracless [-h] cfg_dir [--parse [PARSE]] [--dry] [--version]""",
+        usage="""heracless [-h] cfg_dir [--parse [PARSE]] [--dry] [--compile COMPILE] [--loader LOADER] [--version]""",
     )
     parser.add_argument("cfg_dir", help="Path to the configuration file", type=str)
     parser.add_argument("--parse", "-p", help="path to where to parse the input as a python file ", type=str)
     parser.add_argument("--dry", "-d", action="store_true", help="Dry run")
+    parser.add_argument(
+        "--compile", "-c", help="path to a python module to compile the config into (dataclasses + CONFIG)", type=str
+    )
+    parser.add_argument(
+        "--loader", "-l", choices=available_loaders(), help="YAML loader backend (default: fastest available)"
+    )
     parser.add_argument("--version", action="version", version="Heracless 0.2")
 
     if "-h" in sys.argv or "--help" in sys.argv or "--version" in sys.argv:
@@ -39,9 +46,11 @@ def run_cli() -> None:
 
     If --dry is provided, it runs the main function with dump_dir set to None (no file output).
     If --parse is provided, it runs the main function with dump_dir set to the specified path.
+    If --compile is provided, it compiles the config into an importable python module.
     """
     args = parse_args()
     cfg_path: str = args.cfg_dir
+    loader: Optional[str] = getattr(args, "loader", None)
 
     if not os.path.exists(cfg_path) or not cfg_path.endswith(".yaml"):
         print("Config file does not exist or is not a YAML file.")
@@ -52,8 +61,9 @@ def run_cli() -> None:
             cfg_dir=cfg_path,
             dump_dir=None,
             frozen=True,
+            loader=loader,
         )
-        print(f"Loaded config: {config}")
+        print(f"Loaded config (loader: {last_backend()}): {config}")
     elif args.parse:
         dump_path: Optional[str] = args.parse
         if dump_path and (not dump_path.endswith(".py") and not dump_path.endswith(".pyi")):
@@ -64,8 +74,16 @@ def run_cli() -> None:
             cfg_dir=cfg_path,
             dump_dir=dump_path_obj,
             frozen=True,
+            loader=loader,
         )
         print(f"Config generated and written to {dump_path}")
+    elif getattr(args, "compile", None):
+        module_path: str = args.compile
+        if not module_path.endswith(".py"):
+            print("Compile target must be a Python module (.py).")
+            return
+        compile_config(cfg_path, Path(module_path), frozen=True, loader=loader)
+        print(f"Config compiled and written to {module_path}")
 
 
 if __name__ == "__main__":
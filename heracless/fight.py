@@ -3,26 +3,61 @@ heracless YAML TO PyObject parser
 
 """
 
+import errno
 import os
+from collections import namedtuple
+from functools import partial
+from io import BytesIO, TextIOWrapper
 from pathlib import Path
-from typing import Callable, Optional, Any
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Any, cast
 
-from yaml import full_load
+import yaml
 
-from heracless.utils.cfg_tree import (Tree, tree_parser, tree_to_config_obj,
-                                      tree_to_string_translator)
+from heracless.loaders import get_loader
+from heracless.utils.cfg_tree import (
+    SCHEMA_HEADER,
+    Tree,
+    dict_to_config_obj,
+    schema_fingerprint,
+    tree_parser,
+    tree_to_config_obj,
+    tree_to_config_obj_incremental,
+    tree_to_string_translator,
+)
+from heracless.utils.batch import parse_files, resolve_executor
+from heracless.utils.compact_arrays import resolve_array_mode
+from heracless.utils.documents import iter_documents, iter_documents_parallel
+from heracless.utils.event_builder import (
+    EventBuilder,
+    UnsupportedEvent,
+    config_builder,
+    parse_events,
+    select_dict,
+    selection_tree,
+    tree_event_builder,
+)
+from heracless.utils.snapshot import loader_id, read_snapshot, resolve_cache_dir, snapshot_key, write_snapshot
 from heracless.utils.utils import path_exists
 from heracless.utils.exceptions import YamlSyntaxError
+from heracless.utils.include import include_loader, load_with_includes
 
 DEFAULT_DIR = Path("./config/config.yaml")
 
+LoadedConfig = namedtuple("LoadedConfig", ("tree", "config"))
+LoadResult = namedtuple("LoadResult", ("path", "config", "error"))
 
-def load_as_dict(cfg_dir: Path, yaml_load_func: Callable[[Any], dict]) -> Optional[dict]:
+
+def load_as_dict(
+    cfg_dir: Path, yaml_load_func: Callable[[Any], dict], cache_dir: Optional[Path | str] = None
+) -> Optional[dict]:
     """
     Load a YAML configuration file and return it as a dictionary.
+    If a snapshot cache directory is configured (cache_dir or HERACLESS_CACHE_DIR), the parsed content
+    is read from a snapshot keyed by the content hash and the load function instead of parsing the YAML again.
 
     :param cfg_dir: Path to the YAML configuration file.
     :param yaml_load_func: Function to load YAML content.
+    :param cache_dir: Snapshot cache directory, None uses HERACLESS_CACHE_DIR (disabled if unset).
     :return: Dictionary representation of the YAML content, or None if the file is empty.
     :raises FileNotFoundError: If the config file does not exist.
     :raises OSError: If there is an issue reading the file.
@@ -30,11 +65,51 @@ def load_as_dict(cfg_dir: Path, yaml_load_func: Callable[[Any], dict]) -> Option
     path_exists(cfg_dir)
     if os.stat(cfg_dir).st_size == 0:
         return None
-    stream = open(cfg_dir, "r")
+    snapshot_dir = resolve_cache_dir(cache_dir)
+    if snapshot_dir is None:
+        with open(cfg_dir, "r") as stream:
+            try:
+                return yaml_load_func(stream)
+            except Exception as e:
+                raise YamlSyntaxError(str(e))
+    with open(cfg_dir, "rb") as raw:
+        content = raw.read()
+    key = snapshot_key(content, loader_id(yaml_load_func))
+    hit, snapshot = read_snapshot(snapshot_dir, key)
+    if hit:
+        return cast(Optional[dict], snapshot)
     try:
-        return yaml_load_func(stream)
+        cfg_dict = yaml_load_func(TextIOWrapper(BytesIO(content)))  # decodes like open(cfg_dir, "r")
     except Exception as e:
         raise YamlSyntaxError(str(e))
+    write_snapshot(snapshot_dir, key, cfg_dict)
+    return cfg_dict
+
+
+def load_streaming(
+    cfg_dir: Path, builder: EventBuilder, plain: bool = False, select: Optional[dict[str, Any]] = None
+) -> Any:
+    """
+    Build a YAML configuration file from its event stream, the file is read in bounded chunks.
+
+    :param cfg_dir: Path to the YAML configuration file.
+    :param builder: Event builder deciding what is built (config objects or tree nodes).
+    :param plain: Build plain dicts and lists instead.
+    :param select: Only build these subtrees (see selection_tree), the events of all others are skipped.
+    :return: The built root mapping, or None if the file is empty.
+    :raises UnsupportedEvent: If the file needs a regular loader (e.g. explicit tags).
+    :raises ConfigPathError: If a selected path does not exist.
+    :raises YamlSyntaxError: If the YAML is malformed.
+    :raises FileNotFoundError: If the config file does not exist.
+    """
+    path_exists(cfg_dir)
+    if os.stat(cfg_dir).st_size == 0:
+        return None
+    with open(cfg_dir, "r") as stream:
+        try:
+            return builder.build(parse_events(stream), plain=plain, select=select)
+        except yaml.YAMLError as e:
+            raise YamlSyntaxError(str(e))
 
 
 def dump_in_console(frozen: bool, cfg_tree: Tree, _: Optional[Path], *args: Any, **kwargs: Any) -> None:
@@ -47,7 +122,11 @@ def dump_in_console(frozen: bool, cfg_tree: Tree, _: Optional[Path], *args: Any,
     :param args: Additional arguments.
     :param kwargs: Additional keyword arguments.
     """
-    print(tree_to_string_translator(frozen, cfg_tree))
+    print(
+        tree_to_string_translator(
+            frozen, cfg_tree, kwargs.get("slots", False), kwargs.get("arrays"), kwargs.get("tables", False)
+        )
+    )
 
 
 def dump_dummy(frozen: bool, cfg_tree: Tree, dump_dir: Optional[Path], *args: Any, **kwargs: Any) -> None:
@@ -63,13 +142,40 @@ def dump_dummy(frozen: bool, cfg_tree: Tree, dump_dir: Optional[Path], *args: An
     pass
 
 
-def dump_in_file(frozen: bool, cfg_tree: Tree, dump_dir: Optional[Path]) -> None:
+def stub_is_current(dump_dir: Path, header: str) -> bool:
+    """
+    Check whether an existing stub file was generated for the same schema.
+
+    :param dump_dir: Path of the stub file.
+    :param header: Schema header line the stub would be generated with.
+    :return: True if the stub file starts with the given header.
+    """
+    try:
+        with open(dump_dir, "r") as dd:
+            return dd.readline() == header
+    except OSError:
+        return False
+
+
+def dump_in_file(
+    frozen: bool,
+    cfg_tree: Tree,
+    dump_dir: Optional[Path],
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+) -> None:
     """
     File dumper: dumps config types into a file.
+    The stub starts with a schema fingerprint header, generation and writing are skipped
+    if the existing stub already matches the schema (e.g. only values changed).
 
     :param frozen: Whether the config object is frozen.
     :param cfg_tree: Configuration tree.
     :param dump_dir: Directory to dump the config file.
+    :param slots: Whether the config classes use __slots__.
+    :param arrays: Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+    :param tables: Whether lists of uniform mappings are stored as RecordTables.
     :raises FileNotFoundError: If the dump directory does not exist.
     :raises OSError: If there is an issue writing to the file.
     :raises ValueError: If dump_dir is None.
@@ -78,18 +184,72 @@ def dump_in_file(frozen: bool, cfg_tree: Tree, dump_dir: Optional[Path]) -> None
         raise ValueError("dump_dir cannot be None for file dumping")
     if not dump_dir.suffix == ".pyi":
         dump_dir = dump_dir.with_suffix(".pyi")
+    header = f"{SCHEMA_HEADER}{schema_fingerprint(frozen, cfg_tree, slots, arrays, tables)}\n"
+    if stub_is_current(dump_dir, header):
+        return
     path_exists(dump_dir)
     with open(dump_dir, "w") as dd:
-        string = tree_to_string_translator(frozen, cfg_tree)
-        dd.write(string)
+        string = tree_to_string_translator(frozen, cfg_tree, slots, arrays, tables)
+        dd.write(header + string)
+
+
+def _fight_stream(
+    cfg_dir: Path,
+    dump_dir: Optional[Path],
+    dump_func: Callable[..., None],
+    frozen: bool,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    lazy: bool = False,
+    select: Optional[dict[str, Any]] = None,
+) -> Optional[Any]:
+    """
+    Internal function building the config directly from the YAML event stream, no dict of the whole file is built.
+    Stubs need the tree, it is built in a separate streaming pass and dropped before the config is built.
+
+    :param cfg_dir: Path to the YAML configuration file.
+    :param dump_dir: Directory to dump the config file.
+    :param dump_func: Function to dump the config.
+    :param frozen: Whether the config object is frozen.
+    :param slots: Whether the config classes use __slots__ instead of a per-instance __dict__.
+    :param arrays: Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+    :param tables: Whether lists of uniform mappings are stored as RecordTables.
+    :param lazy: Whether top level sections are only built on first access, lazy sections keep the plain values.
+    :param select: Only build these subtrees (see selection_tree), stubs describe the same subset.
+    :return: Configuration object or None if the config is empty.
+    :raises UnsupportedEvent: If the file needs a regular loader (e.g. explicit tags).
+    :raises ConfigPathError: If a selected path does not exist.
+    """
+    if dump_func is not dump_dummy:
+        cfg_tree = load_streaming(cfg_dir, tree_event_builder(), select=select)
+        if cfg_tree is None:
+            return None
+        dump_func(frozen, cfg_tree, dump_dir, slots=slots, arrays=arrays, tables=tables)
+        del cfg_tree
+    builder = config_builder(frozen, slots, arrays, tables)
+    if not lazy:
+        return load_streaming(cfg_dir, builder, select=select)
+    cfg_dict = load_streaming(cfg_dir, builder, plain=True, select=select)
+    if cfg_dict is None:
+        return None
+    return dict_to_config_obj(frozen, cfg_dict, slots=slots, arrays=arrays, tables=tables, lazy=True)
 
 
 def _fight_hydra(
     cfg_dir: Path,
     dump_dir: Optional[Path],
-    dump_func: Callable[[bool, Tree, Optional[Path]], None],
+    dump_func: Callable[..., None],
     yaml_load_func: Callable[[Any], dict],
     frozen: bool,
+    cache_dir: Optional[Path | str] = None,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    lazy: bool = False,
+    stream: bool = False,
+    select: Optional[dict[str, Any]] = None,
+    includes: bool = False,
 ) -> Optional[Any]:
     """
     Internal function to parse YAML config and dump it using the specified function.
@@ -99,33 +259,93 @@ def _fight_hydra(
     :param dump_func: Function to dump the config.
     :param yaml_load_func: Function to load YAML content.
     :param frozen: Whether the config object is frozen.
+    :param cache_dir: Snapshot cache directory, None uses HERACLESS_CACHE_DIR (disabled if unset).
+    :param slots: Whether the config classes use __slots__ instead of a per-instance __dict__.
+    :param arrays: Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+    :param tables: Whether lists of uniform mappings are stored as RecordTables.
+    :param lazy: Whether top level sections are only built on first access.
+    :param stream: Build the config from the YAML event stream (see _fight_stream).
+    :param select: Only build these subtrees (see selection_tree), uses the event stream if possible.
+    :param includes: Resolve !include tags and include keys (see load_with_includes), the included files
+        are loaded into dicts, stream and select do not skip events then.
     :return: Configuration object or None if the config is empty.
     :raises ValueError: If the config file is empty.
     :raises FileNotFoundError: If the config file does not exist.
     :raises OSError: If there is an issue reading the file.
+    :raises ConfigPathError: If a selected path does not exist.
+    :raises IncludeError: If an included file is missing, not a mapping or includes itself.
     """
-    cfg_dict = load_as_dict(cfg_dir, yaml_load_func)
+    if (stream or select is not None) and not includes:
+        try:
+            return _fight_stream(cfg_dir, dump_dir, dump_func, frozen, slots, arrays, tables, lazy, select)
+        except UnsupportedEvent:
+            pass  # e.g. explicit tags, parsed by the regular loader below
+    if includes:
+        load_fragment = partial(load_as_dict, yaml_load_func=include_loader(yaml_load_func), cache_dir=cache_dir)
+        cfg_dict = load_with_includes(cfg_dir, load_fragment)
+    else:
+        cfg_dict = load_as_dict(cfg_dir, yaml_load_func, cache_dir)
     if cfg_dict is None:  # in case dict is empty and config
         return None
-    cfg_tree = tree_parser(cfg_dict)
-    dump_func(
-        frozen,
-        cfg_tree,
-        dump_dir,
-    )
-    config_obj = tree_to_config_obj(frozen, cfg_tree)
+    if select is not None:
+        cfg_dict = select_dict(cfg_dict, select)
+    if dump_func is not dump_dummy:  # the tree is only needed to generate stubs
+        dump_func(
+            frozen,
+            tree_parser(cfg_dict),
+            dump_dir,
+            slots=slots,
+            arrays=arrays,
+            tables=tables,
+        )
+    config_obj = dict_to_config_obj(frozen, cfg_dict, slots=slots, arrays=arrays, tables=tables, lazy=lazy)
     return config_obj
 
 
-def fight(cfg_dir: Path|str, dump_dir: Path|None, frozen: bool) -> Optional[Any]:
+def fight(
+    cfg_dir: Path | str,
+    dump_dir: Path | None,
+    frozen: bool,
+    loader: Optional[str] = None,
+    cache_dir: Optional[Path | str] = None,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    lazy: bool = False,
+    stream: bool = False,
+    select: Optional[Iterable[str]] = None,
+    includes: bool = False,
+) -> Optional[Any]:
     """
     Parse YAML config and dump it into a file.
 
     :param cfg_dir: Path to the YAML configuration file.
     :param dump_dir: Directory to dump the config file.
     :param frozen: Whether the config object is frozen.
+    :param loader: YAML loader backend ("rust", "libyaml", "python"), None selects the fastest available one.
+    :param cache_dir: Snapshot cache directory for parsed YAML, None uses HERACLESS_CACHE_DIR (disabled if unset).
+    :param slots: Whether the config classes use __slots__ instead of a per-instance __dict__ (smaller instances).
+    :param arrays: Store homogeneous int/float/bool lists as compact arrays: "array" (array.array),
+        "numpy" (read-only NumPy arrays, 2-D for lists of equal-length rows) or "auto". None keeps tuples.
+    :param tables: Store lists of uniform mappings with scalar values as columnar RecordTables
+        (one compact column per field, rows are read-only views).
+    :param lazy: Build top level sections (mappings and lists) on first attribute access instead of at load time,
+        so startup cost scales with the sections a program uses. Errors in a section surface on first access.
+    :param stream: Build the config directly from the PyYAML event stream (read in bounded chunks) instead of
+        loading the whole file into a dict first, which keeps peak memory low for very large files.
+        Ignores loader and cache_dir, files with explicit collection or custom tags are loaded regularly.
+    :param select: Dotted paths of the mapping keys to load, e.g. ["database", "cache.redis"]. The config (and stub)
+        only contains these subtrees and the mappings leading to them, the events of all other subtrees are skipped
+        while parsing, without building any values. Parses like stream=True.
+    :param includes: Assemble the config from several files: `key: !include other.yaml` is replaced by the
+        content of other.yaml, the files listed under a top level `include:` key are merged into the mapping
+        (its own keys win). Paths are relative to the including file, included files may include further files.
+        All referenced files are parsed concurrently in a thread pool, each file once per load.
     :return: Configuration object or None if the config is empty.
-    :raises ValueError: If the config file is empty.
+    :raises ValueError: If the config file is empty, the loader is unknown, the array mode is not available
+        or a select path is empty.
+    :raises ConfigPathError: If a selected path does not exist or does not lead through mappings.
+    :raises IncludeError: If an included file is missing, not a mapping (include key) or includes itself.
     :raises FileNotFoundError: If the config file does not exist.
     :raises OSError: If there is an issue reading the file.
     """
@@ -136,8 +356,171 @@ def fight(cfg_dir: Path|str, dump_dir: Path|None, frozen: bool) -> Optional[Any]
     if cfg_dir is None:
         raise TypeError("cfg_dir cannot be None. please set the path to the config files location")
     dump_func = dump_in_file if dump_dir else dump_dummy # if dump_dir is None, then dump_dummy is used
-    yaml_load_func = full_load
-    return _fight_hydra(cfg_dir, dump_dir, dump_func, yaml_load_func, frozen)
+    yaml_load_func = get_loader(loader).load
+    arrays = resolve_array_mode(arrays)
+    selection = selection_tree(select) if select is not None else None
+    return _fight_hydra(
+        cfg_dir,
+        dump_dir,
+        dump_func,
+        yaml_load_func,
+        frozen,
+        cache_dir,
+        slots,
+        arrays,
+        tables,
+        lazy,
+        stream,
+        selection,
+        includes,
+    )
+
+
+def fight_all(
+    cfg_dir: Path | str,
+    frozen: bool = True,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    workers: Optional[int] = None,
+) -> Iterator[Optional[Any]]:
+    """
+    Lazily load every document of a multi-document YAML file (documents separated by `---`).
+    Each document is parsed from the event stream when the iterator reaches it, the file stays open until
+    the iterator is exhausted or closed. Configs of documents with the same shape share their classes.
+    No stub is generated, the documents may have different shapes.
+
+    :param cfg_dir: Path to the YAML file.
+    :param frozen: Whether the config objects are frozen.
+    :param slots: Whether the config classes use __slots__ instead of a per-instance __dict__.
+    :param arrays: Compact array mode for homogeneous scalar lists ("array", "numpy", "auto"), None keeps tuples.
+    :param tables: Whether lists of uniform mappings are stored as RecordTables.
+    :param workers: Build the documents in this many worker processes (in batches, results keep the document
+        order), None builds them in this process. Worth it for thousands of documents.
+    :return: Iterator over the config objects, None for empty documents.
+    :raises ValueError: If the array mode is not available, raised by the iterator if a document is not a mapping.
+    :raises YamlSyntaxError: Raised by the iterator if the YAML is malformed.
+    :raises FileNotFoundError: If the config file does not exist.
+    """
+    cfg_dir = Path(cfg_dir)
+    path_exists(cfg_dir)
+    arrays = resolve_array_mode(arrays)
+    return _fight_all(cfg_dir, frozen, slots, arrays, tables, workers)
+
+
+def _fight_all(
+    cfg_dir: Path, frozen: bool, slots: bool, arrays: Optional[str], tables: bool, workers: Optional[int]
+) -> Iterator[Optional[Any]]:
+    """
+    Internal generator of fight_all, opens the file on the first next().
+    """
+    with open(cfg_dir, "r") as stream:
+        try:
+            if workers:
+                yield from iter_documents_parallel(stream, workers, frozen, slots, arrays, tables)
+            else:
+                yield from iter_documents(stream, frozen, slots, arrays, tables)
+        except yaml.YAMLError as e:
+            raise YamlSyntaxError(str(e))
+
+
+def fight_many(
+    paths: Sequence[Path | str],
+    frozen: bool = True,
+    loader: Optional[str] = None,
+    cache_dir: Optional[Path | str] = None,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    workers: Optional[int] = None,
+    executor: str = "auto",
+) -> list[LoadResult]:
+    """
+    Load many YAML config files concurrently.
+    The files are parsed in a thread or process pool, the config objects are built in this process as the results
+    arrive, so configs with the same shape share their classes. A file that fails does not abort the batch,
+    its exception is returned in its result. No stubs are generated.
+
+    :param paths: Paths to the YAML configuration files.
+    :param frozen: Whether the config objects are frozen.
+    :param loader: YAML loader backend ("rust", "libyaml", "python"), None selects the fastest available one.
+    :param cache_dir: Snapshot cache directory for parsed YAML, None uses HERACLESS_CACHE_DIR (disabled if unset).
+    :param slots: Whether the config classes use __slots__ instead of a per-instance __dict__.
+    :param arrays: Compact array mode for homogeneous scalar lists ("array", "numpy", "auto"), None keeps tuples.
+    :param tables: Whether lists of uniform mappings are stored as RecordTables.
+    :param workers: Number of threads or processes, None uses the CPU count, 1 loads the files one by one.
+    :param executor: "thread", "process" or "auto": threads if the loader parses without holding the GIL (rust),
+        processes otherwise.
+    :return: One LoadResult(path, config, error) per path in input order, config is None for empty files
+        and failed files, error is the exception a failed file raised (FileNotFoundError for missing files,
+        which are not created).
+    :raises ValueError: If the loader, the array mode or the executor is unknown or not available.
+    """
+    backend = get_loader(loader)
+    arrays = resolve_array_mode(arrays)
+    kind = resolve_executor(executor, backend.name)
+    cfg_paths = [Path(path) for path in paths]
+    parse = partial(_load_existing_as_dict, yaml_load_func=backend.load, cache_dir=cache_dir)
+    results = []
+    for cfg_path, (cfg_dict, error) in zip(cfg_paths, parse_files(cfg_paths, parse, workers, kind)):
+        config = None
+        if error is None and cfg_dict is not None:
+            try:
+                config = dict_to_config_obj(frozen, cfg_dict, slots=slots, arrays=arrays, tables=tables)
+            except Exception as e:
+                error = e
+        results.append(LoadResult(cfg_path, config, error))
+    return results
+
+
+def _load_existing_as_dict(
+    cfg_dir: Path, yaml_load_func: Callable[[Any], dict], cache_dir: Optional[Path | str] = None
+) -> Optional[dict]:
+    """
+    load_as_dict for batch loads, raises for missing files instead of creating them.
+    """
+    if not cfg_dir.is_file():
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(cfg_dir))
+    return load_as_dict(cfg_dir, yaml_load_func, cache_dir)
+
+
+def reload_config(
+    cfg_dir: Path | str,
+    previous: Optional[LoadedConfig],
+    dump_dir: Optional[Path | str] = None,
+    frozen: bool = True,
+    loader: Optional[str] = None,
+    cache_dir: Optional[Path | str] = None,
+    slots: bool = False,
+) -> Optional[LoadedConfig]:
+    """
+    Parse YAML config again, sharing unchanged subtrees with a previously loaded config.
+    Mappings that did not change are the identical instances in the new config
+    (previous.config.database is new.config.database), so identity tells what did not change.
+
+    :param cfg_dir: Path to the YAML configuration file.
+    :param previous: Result of the previous load, None loads from scratch.
+    :param dump_dir: Directory to dump the config file, None to skip dumping.
+    :param frozen: Whether the config object is frozen.
+    :param loader: YAML loader backend ("rust", "libyaml", "python"), None selects the fastest available one.
+    :param cache_dir: Snapshot cache directory for parsed YAML, None uses HERACLESS_CACHE_DIR (disabled if unset).
+    :param slots: Whether the config classes use __slots__ instead of a per-instance __dict__.
+    :return: The tree and config object, or None if the config is empty.
+    :raises FileNotFoundError: If the config file does not exist.
+    :raises OSError: If there is an issue reading the file.
+    """
+    cfg_dir = Path(cfg_dir)
+    cfg_dict = load_as_dict(cfg_dir, get_loader(loader).load, cache_dir)
+    if cfg_dict is None:
+        return None
+    cfg_tree = tree_parser(cfg_dict)
+    if dump_dir:
+        dump_in_file(frozen, cfg_tree, Path(dump_dir), slots)
+    if previous is None:
+        return LoadedConfig(cfg_tree, tree_to_config_obj(frozen, cfg_tree, slots))
+    return LoadedConfig(
+        cfg_tree, tree_to_config_obj_incremental(frozen, cfg_tree, previous.tree, previous.config, slots)
+    )
 
 
 if __name__ == "__main__":
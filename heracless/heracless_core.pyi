@@ -1,5 +1,7 @@
 """Type stubs for heracless_core Rust extension module"""
 
+from typing import Any
+
 def generate_python_stubs(config_path: str, frozen: bool) -> str:
     """
     Generate Python type stubs from YAML configuration
@@ -13,6 +15,19 @@ def generate_python_stubs(config_path: str, frozen: bool) -> str:
     """
     ...
 
+def generate_python_stubs_from_tree(tree: Any, frozen: bool) -> str:
+    """
+    Generate Python type stubs from a heracless Tree (Leaf/Structure namedtuples)
+
+    Args:
+        tree: Parsed heracless.utils.cfg_tree.Tree
+        frozen: Whether to generate frozen dataclasses
+
+    Returns:
+        Python stub code as a string, identical to the Python generator output
+    """
+    ...
+
 def parse_yaml_to_json(config_path: str) -> str:
     """
     Parse YAML file and convert to JSON string
@@ -24,3 +39,27 @@ def parse_yaml_to_json(config_path: str) -> str:
         JSON string representation of the YAML data
     """
     ...
+
+def load_yaml(content: str) -> Any:
+    """
+    Parse YAML text and build Python dicts, lists and scalars directly
+
+    Args:
+        content: YAML document as a string
+
+    Returns:
+        Parsed YAML with PyYAML compatible scalar types
+    """
+    ...
+
+def parse_yaml_to_py(config_path: str) -> Any:
+    """
+    Parse YAML file and build Python dicts, lists and scalars directly
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        Parsed YAML with PyYAML compatible scalar types
+    """
+    ...
@@ -0,0 +1,213 @@
+"""
+YAML loader backends for heracless
+
+Every backend turns a text stream into plain Python objects exactly like
+PyYAML's full_load does, so all of them produce identical Trees.
+The fastest available backend is selected automatically.
+"""
+
+import re
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from io import StringIO
+from typing import IO, Any, Callable, Optional
+
+import yaml
+
+from heracless.rust_backend import is_rust_available, load_yaml_rust
+
+LoaderBackend = namedtuple("LoaderBackend", ("name", "load", "is_available", "priority"))
+
+# explicit tags (!!set, !!python/tuple, custom tags, ...) are only understood by PyYAML
+_EXPLICIT_TAG = re.compile(r"(?:^|[\s\[{,])!")
+# merge keys (also quoted ones, serde_yaml merges those too): the Rust parser appends the merged keys after the
+# mapping's own keys, PyYAML puts them first, so the key order (and with it field order and stubs) would differ
+_MERGE_KEY = re.compile(r"<<")
+# anchors: the Rust parser expands aliases into independent copies, PyYAML returns the anchored object itself,
+# which lets the config builders share aliased subtrees
+_ANCHOR = re.compile(r"(?:^|[\s\[{,])&", re.MULTILINE)
+# a plain scalar token, PLAIN % pattern matches the whole token
+_PLAIN = r"(?:^|(?<=[\s\[{,]))(?:%s)(?=[ \t]*(?:$|#|[,\]}]|:(?:[ \t]|$)))"
+_DATE = r"[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}"
+# scalars PyYAML resolves with YAML 1.1 rules but the Rust parser (serde_yaml, YAML 1.2 core schema) does not,
+# or resolves differently: yes/no/on/off, ints with underscores, leading zeros, 0o/0b prefixes and sexagesimal
+# notation, ints outside the 64 bit range (would become floats), exponents without dot or sign, inf/nan without dot,
+# and timestamps in quoted or block scalars (serde_yaml drops the scalar style, so they would become dates)
+_YAML11_SCALAR = re.compile(
+    "|".join(
+        (
+            _PLAIN % r"yes|Yes|YES|no|No|NO|on|On|ON|off|Off|OFF",
+            _PLAIN % r"[-+]?0[0-9_]+|[-+]?0[oObB][0-9a-fA-F_]*",
+            _PLAIN % r"[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+(?:\.[0-9_]*)?",
+            _PLAIN % r"[-+]?[0-9_]{20,}|-[0-9_]{19}",
+            _PLAIN % r"[-+]?[0-9][0-9_]*[eE][-+]?[0-9]+|[-+]?[0-9._]*[eE][0-9]+",
+            _PLAIN % r"(?i:[-+]?(?:inf|infinity|nan))",
+            r"(?:^|(?<=[\s\[{,]))[-+]?\.?[0-9][^\s,\[\]{}#]*_",
+            r"[\"']" + _DATE,
+        )
+    ),
+    re.MULTILINE,
+)
+_BLOCK_SCALAR = re.compile(r"(?:^|[\s:-])[|>][-+1-9]*[ \t]*(?:#.*)?$", re.MULTILINE)
+_TIMESTAMP = re.compile(_DATE)
+# a backend has to load both documents exactly like full_load: the first covers the scalars the YAML 1.1 and 1.2
+# resolvers disagree on (rust_load hands it to PyYAML), the second avoids every fallback trigger of rust_load,
+# so it checks the Rust parser itself
+_PROBE_DOCUMENTS: tuple[str, ...] = (
+    "probe:\n  date: 2001-01-23\n  items: [1, 2.5, true, null]\n"
+    "  quoted_date: '2001-01-23'\n  flags: [yes, No, on, OFF]\n"
+    "  ints: [0o17, 017, 1_000, 1:30, 18446744073709551616, -9223372036854775809]\n"
+    "  floats: [1e3, 1.5e3, inf, .inf]\n",
+    "probe:\n  date: 2001-01-23\n  when: 2001-12-14 21:59:43.10 -5\n  items: [1, 2.5, true, null, ~, 0x1F]\n"
+    "  floats: [-1.5e+3, .inf, -.inf]\n  big: 9223372036854775807\n  text: 'quoted: yes'\n"
+    "  nested: {a: [x, y], b: {c: 1}}\n",
+)
+_PROBE_RESULTS: tuple[Any, ...] = tuple(yaml.full_load(document) for document in _PROBE_DOCUMENTS)
+
+_REGISTRY: dict[str, LoaderBackend] = {}
+_backend_state = threading.local()
+
+
+def register_loader(
+    name: str, load: Callable[[IO[str]], Any], is_available: Callable[[], bool] = lambda: True, priority: int = 0
+) -> None:
+    """
+    Register a YAML loader backend.
+
+    :param name: Name used to select the backend (e.g. fight(..., loader=name)).
+    :param load: Function loading a text stream into Python objects, must behave like yaml.full_load.
+    :param is_available: Function telling whether the backend can be used in this environment.
+    :param priority: Backends with higher priority are preferred by the automatic selection.
+    """
+    _REGISTRY[name] = LoaderBackend(name, load, is_available, priority)
+    probe_loader.cache_clear()
+
+
+def available_loaders() -> tuple[str, ...]:
+    """
+    Names of all usable backends, fastest first.
+
+    :return: Tuple of backend names.
+    """
+    backends = sorted(_REGISTRY.values(), key=lambda backend: -backend.priority)
+    return tuple(backend.name for backend in backends if backend.is_available())
+
+
+@lru_cache(maxsize=None)
+def probe_loader() -> str:
+    """
+    Startup probe: load small documents with every available backend (fastest first)
+    and report the first one producing the reference results.
+
+    :return: Name of the backend used when no loader is requested explicitly.
+    """
+    for name in available_loaders():
+        try:
+            load = _REGISTRY[name].load
+            if all(load(StringIO(doc)) == result for doc, result in zip(_PROBE_DOCUMENTS, _PROBE_RESULTS)):
+                return name
+        except Exception:
+            continue
+    return "python"
+
+
+def get_loader(name: Optional[str] = None) -> LoaderBackend:
+    """
+    Look up a loader backend.
+
+    :param name: Backend name, None or "auto" selects the fastest working backend.
+    :return: The loader backend.
+    :raises ValueError: If the backend is unknown or not available.
+    """
+    if name is None or name == "auto":
+        name = probe_loader()
+    backend = _REGISTRY.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown YAML loader '{name}', choose one of: {', '.join(_REGISTRY)}")
+    if not backend.is_available():
+        raise ValueError(f"YAML loader '{name}' is not available in this environment")
+    return backend
+
+
+def last_backend() -> Optional[str]:
+    """
+    Name of the backend that served the last load in the current thread.
+
+    :return: Backend name, or None if nothing was loaded yet.
+    """
+    return getattr(_backend_state, "name", None)
+
+
+def python_load(stream: IO[str]) -> Any:
+    """
+    Load YAML with PyYAML's pure Python full loader.
+
+    :param stream: Text stream containing the YAML document.
+    :return: Parsed YAML content.
+    """
+    result = yaml.load(stream, Loader=yaml.FullLoader)
+    _backend_state.name = "python"
+    return result
+
+
+def libyaml_load(stream: IO[str]) -> Any:
+    """
+    Load YAML with PyYAML's libyaml based full loader (CFullLoader).
+
+    :param stream: Text stream containing the YAML document.
+    :return: Parsed YAML content.
+    """
+    result = yaml.load(stream, Loader=yaml.CFullLoader)
+    _backend_state.name = "libyaml"
+    return result
+
+
+def pyyaml_load(stream: IO[str]) -> Any:
+    """
+    Load YAML with the fastest PyYAML loader.
+
+    :param stream: Text stream containing the YAML document.
+    :return: Parsed YAML content.
+    """
+    return libyaml_load(stream) if yaml.__with_libyaml__ else python_load(stream)
+
+
+def needs_yaml11(content: str) -> bool:
+    """
+    Check whether a document contains scalars the Rust parser would resolve differently than PyYAML.
+    May report documents that would load identically, never misses a difference it knows about.
+
+    :param content: The YAML text.
+    :return: True if the document has to be loaded by PyYAML.
+    """
+    if _YAML11_SCALAR.search(content):
+        return True
+    return bool(_BLOCK_SCALAR.search(content)) and bool(_TIMESTAMP.search(content))
+
+
+def rust_load(stream: IO[str]) -> Any:
+    """
+    Load YAML with the Rust extension.
+    Documents with explicit tags, anchors or merge keys, with scalars YAML 1.1 resolves differently than the Rust
+    parser (see needs_yaml11) or documents the Rust parser rejects are loaded by PyYAML, which keeps the results
+    identical to full_load, including the key order and aliases sharing one object.
+
+    :param stream: Text stream containing the YAML document.
+    :return: Parsed YAML content.
+    """
+    content = stream.read()
+    pyyaml_only = (_EXPLICIT_TAG, _ANCHOR, _MERGE_KEY)
+    if any(pattern.search(content) for pattern in pyyaml_only) or needs_yaml11(content):
+        return pyyaml_load(StringIO(content))
+    try:
+        result = load_yaml_rust(StringIO(content))
+    except Exception:
+        return pyyaml_load(StringIO(content))
+    _backend_state.name = "rust"
+    return result
+
+
+register_loader("python", python_load, priority=0)
+register_loader("libyaml", libyaml_load, lambda: bool(yaml.__with_libyaml__), priority=10)
+register_loader("rust", rust_load, is_rust_available, priority=20)
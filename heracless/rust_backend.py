@@ -5,20 +5,36 @@ This module provides a Python interface to the Rust-powered core functions.
 Falls back to pure Python implementation if Rust extension is not available.
 """
 
-import json
 from pathlib import Path
-from typing import Optional, Any, cast
+from typing import IO, Optional, Any, cast
 import warnings
 
 try:
-    from heracless_core import generate_python_stubs, parse_yaml_to_json  # type: ignore[import-not-found]
+    # maturin installs the extension inside the package (module-name = "heracless.heracless_core")
+    from heracless.heracless_core import (
+        generate_python_stubs,
+        generate_python_stubs_from_tree,
+        load_yaml,
+        parse_yaml_to_py,
+    )
+
     RUST_AVAILABLE = True
 except ImportError:
-    RUST_AVAILABLE = False
-    warnings.warn(
-        "Rust backend not available, falling back to pure Python implementation. "
-        "For better performance, build the Rust extension with: maturin develop"
-    )
+    try:
+        from heracless_core import (  # type: ignore[import-not-found, no-redef, unused-ignore]
+            generate_python_stubs,
+            generate_python_stubs_from_tree,
+            load_yaml,
+            parse_yaml_to_py,
+        )
+
+        RUST_AVAILABLE = True
+    except ImportError:
+        RUST_AVAILABLE = False
+        warnings.warn(
+            "Rust backend not available, falling back to pure Python implementation. "
+            "For better performance, build the Rust extension with: maturin develop"
+        )
 
 
 def generate_stubs_rust(config_path: Path, frozen: bool) -> str:
@@ -39,6 +55,26 @@ def generate_stubs_rust(config_path: Path, frozen: bool) -> str:
     return result
 
 
+def generate_stubs_from_tree_rust(tree: Any, frozen: bool) -> str:
+    """
+    Generate Python type stubs for an already parsed heracless Tree using Rust backend
+
+    The output is identical to the pure Python stub generator.
+
+    Args:
+        tree: heracless.utils.cfg_tree.Tree to generate stubs for
+        frozen: Whether dataclasses should be frozen
+
+    Returns:
+        Generated Python code as string
+    """
+    if not RUST_AVAILABLE:
+        raise RuntimeError("Rust backend not available")
+
+    result: str = generate_python_stubs_from_tree(tree, frozen)
+    return result
+
+
 def parse_yaml_rust(config_path: Path) -> dict[Any, Any]:
     """
     Parse YAML file using Rust backend
@@ -52,11 +88,29 @@ def parse_yaml_rust(config_path: Path) -> dict[Any, Any]:
     if not RUST_AVAILABLE:
         raise RuntimeError("Rust backend not available")
 
-    json_str: str = parse_yaml_to_json(str(config_path))
-    result: dict[Any, Any] = json.loads(json_str)
+    result: dict[Any, Any] = parse_yaml_to_py(str(config_path))
     return result
 
 
+def load_yaml_rust(stream: IO[str]) -> Any:
+    """
+    Load YAML from an open stream using Rust backend
+
+    The Python objects are built directly by the extension, dates and
+    datetimes are typed like PyYAML types them.
+
+    Args:
+        stream: Text stream containing the YAML document
+
+    Returns:
+        Parsed YAML as Python objects
+    """
+    if not RUST_AVAILABLE:
+        raise RuntimeError("Rust backend not available")
+
+    return load_yaml(stream.read())
+
+
 def is_rust_available() -> bool:
     """Check if Rust backend is available"""
     return RUST_AVAILABLE
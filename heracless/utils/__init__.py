@@ -1 +1,11 @@
-from heracless.utils.helper import as_dict, from_dict, mutate_config
\ No newline at end of file
+from heracless.utils.helper import (
+    as_dict,
+    as_mapping,
+    as_readonly_dict,
+    compile_path,
+    from_dict,
+    get,
+    get_many,
+    mutate_config,
+    mutate_many,
+)
@@ -0,0 +1,94 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+"""
+concurrent parsing of many config files:
+the files are parsed into dicts in a thread or process pool, the results are returned in input order
+together with the exception each file raised, so one broken file does not abort the batch.
+Config objects are built from the dicts by the caller, so all configs share one class cache.
+"""
+
+EXECUTORS: tuple[str, ...] = ("auto", "thread", "process")
+# loader backends that parse without holding the GIL, threads run them in parallel
+GIL_FREE_LOADERS: frozenset[str] = frozenset({"rust"})
+# files handed to a worker process in one task, amortizes the inter-process round trip
+MAX_CHUNK: int = 64
+
+
+def resolve_executor(executor: str, loader: str) -> str:
+    """
+    Resolve the requested executor kind.
+
+    Args:
+        executor (str): "thread", "process" or "auto" (threads if the loader releases the GIL, else processes).
+        loader (str): Name of the loader backend used for parsing.
+
+    Returns:
+        str: "thread" or "process".
+
+    Raises:
+        ValueError: If the executor kind is unknown.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}', choose one of: {', '.join(EXECUTORS)}")
+    if executor == "auto":
+        return "thread" if loader in GIL_FREE_LOADERS else "process"
+    return executor
+
+
+def capture(parse: Callable[[Path], Any], path: Path) -> tuple[Any, Optional[BaseException]]:
+    """
+    Parse one file and return the exception instead of raising it.
+
+    Args:
+        parse (Callable[[Path], Any]): Function parsing a file (must be picklable for process pools).
+        path (Path): The file.
+
+    Returns:
+        tuple[Any, Optional[BaseException]]: (result, None) or (None, exception).
+    """
+    try:
+        return parse(path), None
+    except Exception as e:
+        return None, e
+
+
+def _capture_chunk(parse: Callable[[Path], Any], paths: Sequence[Path]) -> list[tuple[Any, Optional[BaseException]]]:
+    """
+    worker task of process pools: parses several files in one round trip
+    """
+    return [capture(parse, path) for path in paths]
+
+
+def parse_files(
+    paths: Sequence[Path], parse: Callable[[Path], Any], workers: Optional[int] = None, executor: str = "thread"
+) -> Iterator[tuple[Any, Optional[BaseException]]]:
+    """
+    Parse files concurrently, yielding (result, exception) pairs in input order as soon as they are ready.
+
+    Args:
+        paths (Sequence[Path]): The files.
+        parse (Callable[[Path], Any]): Function parsing one file, a module level function (or partial of one)
+            for process pools.
+        workers (int, optional): Number of threads or processes, None uses the CPU count, 1 parses in this thread.
+        executor (str): "thread" or "process".
+
+    Returns:
+        Iterator[tuple[Any, Optional[BaseException]]]: One (result, None) or (None, exception) pair per path.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        yield from (capture(parse, path) for path in paths)
+        return
+    if executor == "process":
+        chunk = max(1, min(MAX_CHUNK, len(paths) // (workers * 4)))
+        chunks = [paths[start : start + chunk] for start in range(0, len(paths), chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(_capture_chunk, [parse] * len(chunks), chunks):
+                yield from results
+        return
+    thread_pool: Executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="heracless-batch")
+    with thread_pool:
+        yield from thread_pool.map(capture, [parse] * len(paths), paths)
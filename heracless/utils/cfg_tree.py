@@ -1,16 +1,24 @@
 import builtins
+import hashlib
 import re
 from collections import namedtuple
-from dataclasses import make_dataclass
 from datetime import date, datetime
 from functools import *
-from itertools import repeat
+from itertools import groupby, repeat
 from pathlib import Path
-from typing import Any, Callable, Iterable, Iterator, Type, TypeAlias, Union
-
-import black
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Type, TypeAlias, Union
 
+from heracless.utils.class_cache import config_class
+from heracless.utils.compact_arrays import STUB_IMPORTS, array_annotation, compact_array
 from heracless.utils.exceptions import NotIterable
+from heracless.utils.lazy import LazySection
+from heracless.utils.record_table import (
+    RECORD_TABLE_IMPORT,
+    RecordTable,
+    column_annotation,
+    compact_column,
+    uniform_columns,
+)
 
 """
 contains domain logic for config handling:
@@ -19,12 +27,18 @@ constructs a meta obj tree: used to construct config obj and generate typing fil
 
 
 IMPORTS: str = (
-    "from dataclasses import dataclass\nfrom datetime import datetime\nfrom datetime import date\nfrom pathlib import Path"
+    "from dataclasses import dataclass\nfrom datetime import datetime\nfrom datetime import date\nfrom pathlib import Path\n"
 )
-FUNCTION_STUB: str = "\ndef load_config(config_path: str) -> Config: ..."
+FUNCTION_STUB: str = "\n\ndef load_config(config_path: str) -> Config: ...\n"
+INDENT: str = "    "
+SCHEMA_HEADER: str = "# heracless-schema: "
+# bump whenever the generated stub changes for an unchanged schema
+STUB_FORMAT_VERSION: int = 1
 # type aliases to avoid redundancy in type annotations
 Node: TypeAlias = Union["Leaf", "Structure"]
 Value: TypeAlias = Any
+# (id of a parsed mapping/list or tree node, YAML key) -> (the object, what was built from it)
+SharedValues: TypeAlias = dict[tuple[int, Any], tuple[Any, Any]]
 
 
 # helper_functions for string conversions
@@ -41,6 +55,7 @@ def replace_invalid_names(name: str) -> str:
     return re.sub(r"[^a-zA-Z0-9 \n]", "_", name)
 
 
+@lru_cache(maxsize=4096)
 def as_uppercase(name: str) -> str:
     """
     Convert a name to uppercase.
@@ -55,6 +70,7 @@ def as_uppercase(name: str) -> str:
     return "".join(word.title() for word in name.split("_"))
 
 
+@lru_cache(maxsize=4096)
 def as_lowercase(name: str) -> str:
     """
     Convert a name to lowercase.
@@ -74,6 +90,7 @@ def as_lowercase(name: str) -> str:
 def format_str(input: str) -> str:
     """
     Format a string using black.
+    black is an optional (dev) dependency: the stub generators already emit formatted code.
 
     Args:
         input (str): The string to be formatted.
@@ -81,6 +98,8 @@ def format_str(input: str) -> str:
     Returns:
         str: The formatted string.
     """
+    import black
+
     return str(black.format_str(input, mode=black.Mode()))
 
 
@@ -133,7 +152,35 @@ def iterable_to_type_mapper(name: str, value: Value) -> tuple[Type[Node], str, V
     return Leaf, name, value
 
 
-def tree_builder(obj_type: Type[Node], name: str, value: Union[Value, Iterable]) -> Union[Node, Tree]:
+def shared_value(shared: Optional[SharedValues], obj: Any, name: Any, build: Callable[[], Any]) -> Any:
+    """
+    Build something from an object once per (object identity, YAML key):
+    YAML aliases (and the values merge keys copy) are the identical parsed objects,
+    so every use of an anchored subtree gets the same instance instead of a copy.
+    The key name is part of the key because it names the generated class.
+
+    Args:
+        shared (SharedValues, optional): The values built so far, None disables sharing.
+        obj (Any): The parsed object (or tree node).
+        name (Any): The YAML key of the object.
+        build (Callable[[], Any]): Builds the value.
+
+    Returns:
+        Any: The (possibly shared) value.
+    """
+    if shared is None:
+        return build()
+    key = (id(obj), name)
+    entry = shared.get(key)
+    if entry is None:
+        # the object is stored too, so its id cannot be reused while the entry exists
+        entry = shared[key] = (obj, build())
+    return entry[1]
+
+
+def tree_builder(
+    obj_type: Type[Node], name: str, value: Union[Value, Iterable], shared: Optional[SharedValues] = None
+) -> Union[Node, Tree]:
     """
     Build a tree of nodes from a value.
 
@@ -141,6 +188,7 @@ def tree_builder(obj_type: Type[Node], name: str, value: Union[Value, Iterable])
         obj_type (Type[Node]): The type of the node (Leaf or Structure).
         name (str): The name associated with the value.
         value (Union[Value, Iterable]): The value to be converted into a tree.
+        shared (SharedValues, optional): Nodes built so far, aliased subtrees become the identical node.
 
     Returns:
         Union[Node, Tree]: The root node of the constructed tree.
@@ -149,15 +197,36 @@ def tree_builder(obj_type: Type[Node], name: str, value: Union[Value, Iterable])
         # Handle None type specially for mypy compatibility
         type_name = "None" if value is None else type(value).__name__
         return obj_type(name, type_name, value)
+    if obj_type == Structure and isinstance(value, (dict, list)):
+        build = partial(structure_builder, obj_type, name, value, shared)
+        node: Union[Node, Tree] = shared_value(shared, value, name, build)
+        return node
+    return structure_builder(obj_type, name, value, shared)
 
-    iterables = iterable_generator(value, name)
-    # Handle empty iterables (e.g., empty dict)
+
+def structure_builder(
+    obj_type: Type[Node], name: str, value: Union[Value, Iterable], shared: Optional[SharedValues] = None
+) -> Union[Node, Tree]:
+    """
+    Build a structure (or the tree root) and its children, see tree_builder.
+
+    Args:
+        obj_type (Type[Node]): Structure or Tree.
+        name (str): The name associated with the value.
+        value (Union[Value, Iterable]): The iterable value.
+        shared (SharedValues, optional): Nodes built so far, aliased subtrees become the identical node.
+
+    Returns:
+        Union[Node, Tree]: The built node.
+    """
+    iterables = tuple(iterable_generator(value, name))
+    # Handle empty iterables (e.g., empty dict or list)
     children: tuple[Union[Node, Tree], ...]
     if not iterables:
         children = tuple()
     else:
         type_value_name_elements = map(iterable_to_type_mapper, *zip(*iterables))
-        children = tuple(map(tree_builder, *zip(*type_value_name_elements)))
+        children = tuple(map(partial(tree_builder, shared=shared), *zip(*type_value_name_elements)))
     if obj_type == Tree:  # type: ignore[comparison-overlap]
         return Tree(name, children)
     if type(value) == list:  # dataclasses don't like lists
@@ -168,18 +237,20 @@ def tree_builder(obj_type: Type[Node], name: str, value: Union[Value, Iterable])
 # string generator
 
 
-def class_heading_generator(frozen: bool, structure: Structure) -> str:
+def class_heading_generator(frozen: bool, structure: Structure, slots: bool = False) -> str:
     """
     Generate the class heading for a structure.
 
     Args:
         frozen (bool): Whether the dataclass should be frozen.
         structure (Structure): The structure for which the class heading is generated.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
 
     Returns:
         str: The generated class heading.
     """
-    return f"""\n@dataclass(frozen={frozen})\nclass {as_uppercase(structure.name)}:\n"""
+    options = f"frozen={frozen}, slots=True" if slots else f"frozen={frozen}"
+    return f"""\n\n@dataclass({options})\nclass {as_uppercase(structure.name)}:\n"""
 
 
 def structure_class_entry_generator(structure: Structure) -> str:
@@ -192,7 +263,7 @@ def structure_class_entry_generator(structure: Structure) -> str:
     Returns:
         str: The generated class entry.
     """
-    return f"""\t{as_lowercase(structure.name)}: "{as_uppercase(structure.name)}"\n"""
+    return f"""{INDENT}{as_lowercase(structure.name)}: "{as_uppercase(structure.name)}"\n"""
 
 
 def leaf_class_entry_generator(leaf: Leaf) -> str:
@@ -205,7 +276,7 @@ def leaf_class_entry_generator(leaf: Leaf) -> str:
     Returns:
         str: The generated class entry.
     """
-    return f"""\t{as_lowercase(leaf.name)}: {leaf.type}\n"""
+    return f"""{INDENT}{as_lowercase(leaf.name)}: {leaf.type}\n"""
 
 
 def child_type_mapper(child: Node) -> str:
@@ -220,7 +291,9 @@ def child_type_mapper(child: Node) -> str:
     """
     match child, child.type:
         case Structure(), "dict":
-            return f""" "{as_uppercase(child.name)}" """
+            return f'"{as_uppercase(child.name)}"'
+        case Structure(), "table":
+            return f'"{as_uppercase(child.name + "_table")}"'
         case Structure(), _:
             if isinstance(child, Structure) and child.children:
                 return f"""{child.type}[{child_type_mapper(child.children[0])}]"""  # recursion if nested list tuple or set
@@ -239,7 +312,7 @@ def non_dict_structure_entry_generator(structure: Structure) -> str:
     Returns:
         str: The generated entry.
     """
-    return f"""\t{structure.name}: {structure.type}[{child_type_mapper(structure.children[0])}]\n"""
+    return f"""{INDENT}{as_lowercase(structure.name)}: {child_type_mapper(structure)}\n"""
 
 
 def entry_generator_mapping(node: Node) -> Callable[[Node], str]:
@@ -261,22 +334,44 @@ def entry_generator_mapping(node: Node) -> Callable[[Node], str]:
             return non_dict_structure_entry_generator  # type: ignore[return-value]
 
 
-def structure_to_str_generator(frozen: bool, structure: Structure) -> str:
+def structure_to_str_generator(frozen: bool, structure: Structure, slots: bool = False) -> str:
     """
     Generate the string representation of a structure.
 
     Args:
         frozen (bool): Whether the dataclass should be frozen.
         structure (Structure): The structure to be converted to a string.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
 
     Returns:
         str: The string representation of the structure.
     """
-    class_heading = class_heading_generator(frozen, structure)
+    if isinstance(structure, Structure) and structure.type == "table":
+        return table_to_str_generator(structure)
+    class_heading = class_heading_generator(frozen, structure, slots)
     child_entry_functions = map(entry_generator_mapping, structure.children)
     zipped_child_functions = zip(child_entry_functions, structure.children)
-    entries: str = reduce(lambda a, b: a + b, (func(elem) for func, elem in zipped_child_functions))
-    return class_heading + entries
+    entries = "".join(func(elem) for func, elem in zipped_child_functions)
+    return class_heading + (entries or f"{INDENT}pass\n")
+
+
+def table_to_str_generator(structure: Structure) -> str:
+    """
+    Generate the row class and the typed table class of a table node (see record_table_node).
+
+    Args:
+        structure (Structure): The table node.
+
+    Returns:
+        str: The string representation of both classes.
+    """
+    row_name = as_uppercase(structure.name + "_item")
+    row_entries = "".join(f"{INDENT}{as_lowercase(column.name)}: {column.value}\n" for column in structure.children)
+    table_entries = "".join(map(leaf_class_entry_generator, structure.children))
+    return (
+        f"\n\n@dataclass(frozen=True)\nclass {row_name}:\n{row_entries}"
+        f"\n\nclass {as_uppercase(structure.name + '_table')}(RecordTable[{row_name}]):\n{table_entries}"
+    )
 
 
 def tree_iterator(tree: Union[Tree, Structure]) -> Iterator[Union[Tree, Structure]]:
@@ -291,20 +386,21 @@ def tree_iterator(tree: Union[Tree, Structure]) -> Iterator[Union[Tree, Structur
     """
     if type(tree) == Tree:
         yield tree
-    elif isinstance(tree, Structure) and tree.type == "dict":
+    elif isinstance(tree, Structure) and tree.type in ("dict", "table"):
         yield tree
 
     filtered_structures = tuple(filter(lambda child: type(child) == Structure, tree.children))
     yield from (elem for child in filtered_structures for elem in (tree_iterator(child)))
 
 
-def tree_to_str_generator(frozen: bool, tree: Tree) -> str:
+def tree_to_str_generator(frozen: bool, tree: Tree, slots: bool = False) -> str:
     """
     Generate the string representation of a tree.
 
     Args:
         frozen (bool): Whether the dataclass should be frozen.
         tree (Tree): The tree to be converted to a string.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
 
     Returns:
         str: The string representation of the tree.
@@ -313,17 +409,20 @@ def tree_to_str_generator(frozen: bool, tree: Tree) -> str:
     strings = tuple(
         reversed(
             tuple(
-                map(partial(structure_to_str_generator, frozen), structure_children)
+                map(partial(structure_to_str_generator, frozen, slots=slots), structure_children)
             )  # reversing to have right order in file
         )
     )
-    filtered_strings = tuple(set(strings))  # filters duplicated strings
+    filtered_strings = dict.fromkeys(strings)  # filters duplicated strings, keeps a stable order
     return "".join(filtered_strings)
 
 
 def tree_to_string_translator(
     frozen: bool,
     tree: Tree,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
 ) -> str:
     """
     Translate a tree to a string representation.
@@ -331,24 +430,202 @@ def tree_to_string_translator(
     Args:
         frozen (bool): Whether the dataclass should be frozen.
         tree (Tree): The tree to be translated.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+        arrays (str, optional): Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+        tables (bool): Whether lists of uniform mappings are stored as RecordTables.
 
     Returns:
         str: The string representation of the tree.
     """
-    # Try Rust backend first for better performance
-    try:
-        from heracless.rust_backend import is_rust_available
-        if is_rust_available():
-            # Note: For now, we still use Python implementation
-            # Future: Use Rust for code generation
-            pass
-    except ImportError:
-        pass
+    # both generators emit already formatted code, the Rust one is used when the extension is built
+    # (it has no slots, compact array and record table support)
+    from heracless.rust_backend import generate_stubs_from_tree_rust, is_rust_available
 
+    if is_rust_available() and not slots and not arrays and not tables:
+        return generate_stubs_from_tree_rust(tree, frozen)
     import_str = IMPORTS
-    raw_str = tree_to_str_generator(frozen, tree)
+    if tables:  # before compact arrays, they would rewrite the columns of the rows
+        tree = record_table_tree(tree, arrays or "array")
+    if arrays:
+        tree = compact_array_tree(tree, arrays)
+    if arrays or tables:
+        import_str += STUB_IMPORTS[arrays or "array"]
+    if tables:
+        import_str += RECORD_TABLE_IMPORT
+    raw_str = tree_to_str_generator(frozen, tree, slots)
     function_str = FUNCTION_STUB
-    return format_str(import_str + raw_str + function_str)
+    return import_str + raw_str + function_str
+
+
+# compact arrays
+
+
+def node_values(node: Node) -> Any:
+    """
+    Rebuild the plain value of a leaf or sequence node, mappings are returned as nodes.
+
+    Args:
+        node (Node): The node.
+
+    Returns:
+        Any: The leaf value, a list for sequences or the node itself for mappings.
+    """
+    match node:
+        case Leaf():
+            return node.value
+        case Structure(type="tuple"):
+            return [node_values(child) for child in node.children]
+    return node
+
+
+def compact_array_node(node: Node, arrays: str) -> Node:
+    """
+    Replace sequences that are stored as compact arrays by leaves typed with the array annotation.
+
+    Args:
+        node (Node): The node.
+        arrays (str): Compact array mode ("array" or "numpy").
+
+    Returns:
+        Node: The rewritten node.
+    """
+    if not isinstance(node, Structure):
+        return node
+    if node.type == "tuple":
+        annotation = array_annotation(node_values(node), arrays)
+        if annotation is not None:
+            return Leaf(node.name, annotation, None)
+    return Structure(node.name, node.type, tuple(compact_array_node(child, arrays) for child in node.children))
+
+
+def compact_array_tree(tree: Tree, arrays: str) -> Tree:
+    """
+    Rewrite a tree for stub generation in compact array mode,
+    every list that value_to_config_attr stores as an array becomes an array typed leaf.
+
+    Args:
+        tree (Tree): The tree.
+        arrays (str): Compact array mode ("array" or "numpy").
+
+    Returns:
+        Tree: The rewritten tree.
+    """
+    return Tree(tree.name, tuple(compact_array_node(child, arrays) for child in tree.children))
+
+
+# record tables
+
+
+def record_table_node(node: Node, mode: str) -> Node:
+    """
+    Replace lists that are stored as RecordTables by table nodes: Structure(name, "table", columns)
+    with one Leaf(field name, column annotation, row field type) per column.
+
+    Args:
+        node (Node): The node.
+        mode (str): Compact array mode of the columns ("array" or "numpy").
+
+    Returns:
+        Node: The rewritten node.
+    """
+    if not isinstance(node, Structure):
+        return node
+    if node.type == "tuple":
+        rows = [
+            {child.name: node_values(child) for child in item.children} if item.type == "dict" else item
+            for item in node.children
+        ]
+        split = uniform_columns(rows)
+        if split is not None:
+            keys, columns = split
+            return Structure(
+                node.name,
+                "table",
+                tuple(
+                    Leaf(key, column_annotation(values, mode), type(values[0]).__name__)
+                    for key, values in zip(keys, columns)
+                ),
+            )
+    return Structure(node.name, node.type, tuple(record_table_node(child, mode) for child in node.children))
+
+
+def record_table_tree(tree: Tree, mode: str) -> Tree:
+    """
+    Rewrite a tree for stub generation in record table mode,
+    every list that value_to_config_attr stores as a RecordTable becomes a table node.
+
+    Args:
+        tree (Tree): The tree.
+        mode (str): Compact array mode of the columns ("array" or "numpy").
+
+    Returns:
+        Tree: The rewritten tree.
+    """
+    return Tree(tree.name, tuple(record_table_node(child, mode) for child in tree.children))
+
+
+# schema fingerprint
+
+
+def node_fingerprint(node: Union[Node, Tree]) -> bytes:
+    """
+    Compute a digest of the names and types of a node and its children, ignoring values.
+    Runs of adjacent sequence items that share a shape are counted once, so growing or shrinking a
+    list of uniform items keeps the fingerprint stable, while the order of differently shaped items
+    (which decides the order of their classes in the stub) is kept.
+
+    Args:
+        node (Union[Node, Tree]): The node to fingerprint.
+
+    Returns:
+        bytes: The digest of the node's schema.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    match node:
+        case Leaf():
+            digest.update(f"L\0{node.name}\0{node.type}".encode())
+            return digest.digest()
+        case Tree():
+            digest.update(f"T\0{node.name}".encode())
+            children: Iterable[bytes] = map(node_fingerprint, node.children)
+        case Structure(type="dict"):
+            digest.update(f"S\0{node.name}\0{node.type}".encode())
+            children = map(node_fingerprint, node.children)
+        case _:
+            digest.update(f"Q\0{node.name}\0{node.type}".encode())
+            children = (shape for shape, _ in groupby(map(node_fingerprint, node.children)))
+    for child in children:
+        digest.update(child)
+    return digest.digest()
+
+
+def schema_fingerprint(
+    frozen: bool, tree: Tree, slots: bool = False, arrays: Optional[str] = None, tables: bool = False
+) -> str:
+    """
+    Compute the stable schema fingerprint of a tree: it changes when the generated stub would change,
+    but not when only values change.
+
+    Args:
+        frozen (bool): Whether the dataclasses are frozen.
+        tree (Tree): The tree to fingerprint.
+        slots (bool): Whether the dataclasses use __slots__.
+        arrays (str, optional): Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+        tables (bool): Whether lists of uniform mappings are stored as RecordTables.
+
+    Returns:
+        str: Hex encoded fingerprint.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{STUB_FORMAT_VERSION}\0{frozen}\0{'slots' if slots else ''}".encode())
+    if tables:
+        digest.update(b"\0tables")
+        tree = record_table_tree(tree, arrays or "array")
+    if arrays:
+        digest.update(f"\0{arrays}".encode())
+        tree = compact_array_tree(tree, arrays)
+    digest.update(node_fingerprint(tree))
+    return digest.hexdigest()
 
 
 # dynamic dataclass generation
@@ -367,29 +644,38 @@ def leaf_attribute_mapper(leaf: Leaf) -> Value:
     return leaf.value
 
 
-def non_dict_structure_mapper(frozen: bool, child: Node) -> Any:
+def non_dict_structure_mapper(
+    frozen: bool, child: Node, slots: bool = False, shared: Optional[SharedValues] = None
+) -> Any:
     """
     Map a non-dict structure to its corresponding attributes.
 
     Args:
         frozen (bool): Whether the dataclass should be frozen.
         child (Node): The child node to be mapped.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+        shared (SharedValues, optional): Values built so far, shared nodes become the identical value.
 
     Returns:
         Any: An iterable of the mapped attributes.
     """
     if not isinstance(child, Structure):
         return child
-    return getattr(builtins, child.type)((attribute_generation_function_mapper(frozen, c)[1] for c in child.children))
+    values = (attribute_generation_function_mapper(frozen, c, slots, shared)[1] for c in child.children)
+    return getattr(builtins, child.type)(values)
 
 
-def attribute_generation_function_mapper(frozen: bool, child: Node) -> tuple[str, Any]:
+def attribute_generation_function_mapper(
+    frozen: bool, child: Node, slots: bool = False, shared: Optional[SharedValues] = None
+) -> tuple[str, Any]:
     """
     Map a child node to its corresponding attribute generation function.
 
     Args:
         frozen (bool): Whether the dataclass should be frozen.
         child (Node): The child node to be mapped.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+        shared (SharedValues, optional): Values built so far, shared nodes become the identical value.
 
     Returns:
         tuple[str, Any]: A tuple containing the attribute name and value.
@@ -398,51 +684,327 @@ def attribute_generation_function_mapper(frozen: bool, child: Node) -> tuple[str
         case (Leaf(), _):
             return as_lowercase(child.name), leaf_attribute_mapper(child)
         case (Structure(), "dict"):
-            return as_lowercase(child.name), tree_to_config_obj(frozen, child)
+            build = partial(tree_to_config_obj, frozen, child, slots, shared)
+            return as_lowercase(child.name), shared_value(shared, child, child.name, build)
         case (Structure(), _):
-            return as_lowercase(child.name), non_dict_structure_mapper(frozen, child)
+            build = partial(non_dict_structure_mapper, frozen, child, slots, shared)
+            return as_lowercase(child.name), shared_value(shared, child, child.name, build)
     # This should never be reached but mypy needs it
     return as_lowercase(child.name), None
 
 
-def tree_to_config_obj(frozen: bool, tree: Union[Tree, Structure]) -> Any:
+def dedupe_field_names(names: Iterable[str]) -> tuple[str, ...]:
+    """
+    Field names as build_config_obj deduplicates them.
+
+    Args:
+        names (Iterable[str]): Field names in YAML order.
+
+    Returns:
+        tuple[str, ...]: Unique field names.
+    """
+    seen_names: dict[str, int] = {}
+    deduped = []
+    for name in names:
+        if name in seen_names:
+            seen_names[name] += 1
+            deduped.append(f"{name}_{seen_names[name]}")
+        else:
+            seen_names[name] = 0
+            deduped.append(name)
+    return tuple(deduped)
+
+
+def build_config_obj(name: str, attrs: Iterable[tuple[str, Any]], slots: bool = False, lazy: bool = False) -> Any:
+    """
+    Instantiate the config class for a mapping from its (field name, value) pairs.
+
+    Args:
+        name (str): The YAML key of the mapping.
+        attrs (Iterable[tuple[str, Any]]): Field names and values in YAML order.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+        lazy (bool): Whether LazySection values are built on first access.
+
+    Returns:
+        Any: The config object.
+    """
+    attrs = tuple(attrs)
+    field_names = dedupe_field_names(field_name for field_name, _ in attrs)
+    # classes are shared between all objects of the same shape (e.g. every item of a list)
+    fields = ((field_name, type(value)) for field_name, (_, value) in zip(field_names, attrs))
+    dclass = config_class(as_uppercase(name), fields, frozen=True, slots=slots, lazy=lazy)
+    return dclass(*(value for _, value in attrs))
+
+
+def tree_to_config_obj(
+    frozen: bool, tree: Union[Tree, Structure], slots: bool = False, shared: Optional[SharedValues] = None
+) -> Any:
     """
     Generate a config object from a tree.
+    Nodes shared by aliases (see tree_parser) become the identical config objects.
 
     Args:
         frozen (bool): Whether the dataclass should be frozen.
         tree (Union[Tree, Structure]): The tree to be converted to a config object.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+        shared (SharedValues, optional): Values built so far, None starts a new build.
 
     Returns:
         Any: The generated config object.
     """
-    name = as_uppercase(tree.name)
-    attrs_dict = tuple((attribute_generation_function_mapper(frozen, child) for child in tree.children))
+    if shared is None:
+        shared = {}
+    return build_config_obj(
+        tree.name,
+        (attribute_generation_function_mapper(frozen, child, slots, shared) for child in tree.children),
+        slots,
+    )
+
+
+# incremental config generation
+
+
+def reuse_node_value(frozen: bool, child: Node, previous_child: Any, previous_value: Any, slots: bool = False) -> Any:
+    """
+    Generate the value of a node, reusing the previous value where the node did not change.
+
+    Args:
+        frozen (bool): Whether the dataclass should be frozen.
+        child (Node): The new node.
+        previous_child (Any): The node at the same position in the previous tree, or None.
+        previous_value (Any): The value generated for previous_child.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+
+    Returns:
+        Any: The (possibly reused) value.
+    """
+    if previous_child is None:
+        return attribute_generation_function_mapper(frozen, child, slots)[1]
+    if child == previous_child:
+        return previous_value
+    match (child, previous_child):
+        case (Structure(type="dict"), Structure(type="dict")):
+            return tree_to_config_obj_incremental(frozen, child, previous_child, previous_value, slots)
+        case (Structure(type="tuple"), Structure(type="tuple")):
+            previous_items: tuple[tuple[Any, Any], ...] = tuple(zip(previous_child.children, previous_value))
+            padding = ((None, None),) * (len(child.children) - len(previous_items))
+            return tuple(
+                reuse_node_value(frozen, item, previous_item, previous_item_value, slots)
+                for item, (previous_item, previous_item_value) in zip(child.children, previous_items + padding)
+            )
+    return attribute_generation_function_mapper(frozen, child, slots)[1]
+
+
+def tree_to_config_obj_incremental(
+    frozen: bool,
+    tree: Union[Tree, Structure],
+    previous_tree: Union[Tree, Structure],
+    previous_obj: Any,
+    slots: bool = False,
+) -> Any:
+    """
+    Generate a config object from a tree, sharing every unchanged subtree with the previous config object.
+    Unchanged mappings are the identical instances (previous.database is new.database),
+    only the mappings on the path to a change are rebuilt.
+
+    Args:
+        frozen (bool): Whether the dataclass should be frozen.
+        tree (Union[Tree, Structure]): The new tree.
+        previous_tree (Union[Tree, Structure]): The tree previous_obj was generated from.
+        previous_obj (Any): The previous config object.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+
+    Returns:
+        Any: The generated config object, previous_obj itself if nothing changed.
+    """
+    if tree == previous_tree:
+        return previous_obj
+    previous_attrs: dict[str, tuple[Any, Any]] = {
+        field_name: (previous_child, getattr(previous_obj, field_name))
+        for field_name, previous_child in zip(
+            dedupe_field_names(as_lowercase(child.name) for child in previous_tree.children), previous_tree.children
+        )
+    }
+    field_names = dedupe_field_names(as_lowercase(child.name) for child in tree.children)
+    return build_config_obj(
+        tree.name,
+        (
+            (field_name, reuse_node_value(frozen, child, *previous_attrs.get(field_name, (None, None)), slots))
+            for field_name, child in zip(field_names, tree.children)
+        ),
+        slots,
+    )
+
+
+# direct config generation (no tree)
 
-    # Deduplicate field names by adding suffix for duplicates
-    seen_names: dict[str, int] = {}
-    deduped_attrs = []
-    for field_name, field_value in attrs_dict:
-        if field_name in seen_names:
-            seen_names[field_name] += 1
-            deduped_name = f"{field_name}_{seen_names[field_name]}"
-        else:
-            seen_names[field_name] = 0
-            deduped_name = field_name
-        deduped_attrs.append((deduped_name, type(field_value), field_value))
 
-    dclass = make_dataclass(
+def rows_to_record_table(name: str, rows: Sequence[Any], mode: str) -> Optional[RecordTable]:
+    """
+    Store a list of uniform mappings as a RecordTable with one compact column per field.
+
+    Args:
+        name (str): The YAML key of the list.
+        rows (Sequence[Any]): The list items.
+        mode (str): Compact array mode of the columns ("array" or "numpy").
+
+    Returns:
+        RecordTable: The table, or None if the items are not uniform mappings of scalars.
+    """
+    split = uniform_columns(rows)
+    if split is None:
+        return None
+    keys, columns = split
+    field_names = dedupe_field_names(as_lowercase(key) for key in keys)
+    return RecordTable(as_uppercase(name + "_item"), field_names, tuple(compact_column(c, mode) for c in columns))
+
+
+def value_to_config_attr(
+    frozen: bool,
+    name: str,
+    value: Value,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    shared: Optional[SharedValues] = None,
+) -> Any:
+    """
+    Generate the attribute value of a parsed YAML value, exactly as tree_to_config_obj would for its node.
+
+    Args:
+        frozen (bool): Whether the dataclass should be frozen.
+        name (str): The YAML key of the value.
+        value (Value): The value.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+        arrays (str, optional): Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+        tables (bool): Whether lists of uniform mappings are stored as RecordTables.
+        shared (SharedValues, optional): Values built so far, aliased mappings and lists become the identical value.
+
+    Returns:
+        Any: The attribute value.
+
+    Raises:
+        NotIterable: If the value is an unsupported iterable.
+    """
+    match value:
+        case dict():
+            build = partial(dict_to_config_obj, frozen, value, name, slots, arrays, tables, shared=shared)
+            return shared_value(shared, value, name, build)
+        case list():
+            build = partial(sequence_to_config_attr, frozen, name, value, slots, arrays, tables, shared)
+            return shared_value(shared, value, name, build)
+        case tuple():
+            return sequence_to_config_attr(frozen, name, value, slots, arrays, tables, shared)
+        case set():
+            item_name = name + "_item"
+            return set(value_to_config_attr(frozen, item_name, item, slots, arrays, tables, shared) for item in value)
+        case str() | Path() | date():
+            return value
+        case _ if isinstance(value, Iterable):
+            raise NotIterable(value)
+    return value
+
+
+def sequence_to_config_attr(
+    frozen: bool,
+    name: str,
+    value: Sequence[Any],
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    shared: Optional[SharedValues] = None,
+) -> Any:
+    """
+    Generate the attribute value of a parsed YAML list, see value_to_config_attr.
+
+    Args:
+        frozen (bool): Whether the dataclass should be frozen.
+        name (str): The YAML key of the list.
+        value (Sequence[Any]): The list.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+        arrays (str, optional): Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+        tables (bool): Whether lists of uniform mappings are stored as RecordTables.
+        shared (SharedValues, optional): Values built so far.
+
+    Returns:
+        Any: A tuple (tuples are preferred in dataclasses, mutability), compact array or RecordTable.
+    """
+    if tables:
+        table = rows_to_record_table(name, value, arrays or "array")
+        if table is not None:
+            return table
+    if arrays is not None:
+        compact = compact_array(value, arrays)
+        if compact is not None:
+            return compact
+    item_name = name + "_item"
+    return tuple(value_to_config_attr(frozen, item_name, item, slots, arrays, tables, shared) for item in value)
+
+
+def dict_to_config_obj(
+    frozen: bool,
+    _dict: dict[Any, Any],
+    name: str = "Config",
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    lazy: bool = False,
+    shared: Optional[SharedValues] = None,
+) -> Any:
+    """
+    Generate a config object directly from a parsed YAML dict in one pass.
+    Produces the same objects (and classes) as tree_to_config_obj(frozen, tree_parser(_dict))
+    without allocating the intermediate tree, which is only needed for stubs.
+    Subtrees the loader shares between aliases (and merge keys) are built once and shared.
+
+    Args:
+        frozen (bool): Whether the dataclass should be frozen.
+        _dict (dict): The parsed YAML mapping.
+        name (str): The YAML key of the mapping, "Config" for the root.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+        arrays (str, optional): Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+        tables (bool): Whether lists of uniform mappings are stored as RecordTables.
+        lazy (bool): Whether the sections (mappings and lists) of this mapping are only built on first access,
+            the sections themselves are built eagerly. Aliases are only shared within a section.
+        shared (SharedValues, optional): Values built so far, None starts a new build.
+
+    Returns:
+        Any: The generated config object.
+    """
+    if lazy:
+        return build_config_obj(
+            name,
+            (
+                (
+                    as_lowercase(key),
+                    (
+                        LazySection(value_to_config_attr, frozen, key, value, slots, arrays, tables)
+                        if isinstance(value, (dict, list, tuple, set))
+                        else value_to_config_attr(frozen, key, value, slots, arrays, tables)
+                    ),
+                )
+                for key, value in _dict.items()
+            ),
+            slots,
+            lazy=True,
+        )
+    if shared is None:
+        shared = {}
+    return build_config_obj(
         name,
-        deduped_attrs,
-        frozen=True,
+        (
+            (as_lowercase(key), value_to_config_attr(frozen, key, value, slots, arrays, tables, shared))
+            for key, value in _dict.items()
+        ),
+        slots,
     )
-    return dclass()
 
 
 # parse dict
 def tree_parser(_dict: dict[Any, Any]) -> Tree:
     """
     Parse a dictionary and build a tree.
+    Subtrees the loader shares between aliases (and merge keys) become the identical node.
 
     Args:
         _dict (dict): The dictionary to be parsed.
@@ -450,7 +1012,7 @@ def tree_parser(_dict: dict[Any, Any]) -> Tree:
     Returns:
         Tree: The root node of the constructed tree.
     """
-    result = tree_builder(Tree, "Config", _dict)  # type: ignore[arg-type]
+    result = tree_builder(Tree, "Config", _dict, {})  # type: ignore[arg-type]
     if isinstance(result, Tree):
         return result
     # This shouldn't happen but mypy needs this
@@ -0,0 +1,185 @@
+from collections import OrderedDict, namedtuple
+from dataclasses import fields as dataclass_fields
+from dataclasses import make_dataclass
+from threading import Lock
+from typing import Any, Iterable, TypeAlias
+
+from heracless.utils.lazy import lazy_eq, lazy_getattribute
+
+"""
+process wide registry of generated config dataclasses:
+every distinct shape (class name, field names, field types) is created once and reused
+across list items and across reloads
+"""
+
+DEFAULT_MAXSIZE: int = 4096
+
+CacheInfo = namedtuple("CacheInfo", ("hits", "misses", "maxsize", "currsize"))
+ShapeKey: TypeAlias = tuple[str, tuple[str, ...], tuple[type, ...], bool, bool, bool]
+# attribute holding values derived from a config instance (path index, memoized dict), not a dataclass field
+DERIVED_ATTR: str = "_heracless_derived"
+
+
+class DerivedSlot:
+    """
+    Base of slotted config classes, reserves the slot for derived values (see DERIVED_ATTR),
+    instances with a __dict__ store them there.
+    """
+
+    __slots__ = (DERIVED_ATTR,)
+
+
+def reduce_config(config: Any) -> tuple[Any, ...]:
+    """
+    __reduce__ of generated config classes: the classes only exist at runtime,
+    so configs are pickled as their shape and values and restored through the class cache.
+
+    Args:
+        config (Any): The config object.
+
+    Returns:
+        tuple: restore_config and its arguments.
+    """
+    dclass = type(config)
+    names = tuple(field.name for field in dataclass_fields(config))
+    values = tuple(object.__getattribute__(config, name) for name in names)  # lazy sections stay unbuilt
+    slots = "__slots__" in dclass.__dict__
+    lazy = dclass.__dict__.get("__getattribute__") is lazy_getattribute
+    return restore_config, (dclass.__name__, names, values, dclass.__dataclass_params__.frozen, slots, lazy)
+
+
+def restore_config(
+    name: str, names: tuple[str, ...], values: tuple[Any, ...], frozen: bool, slots: bool, lazy: bool
+) -> Any:
+    """
+    Rebuild a pickled config object (see reduce_config).
+
+    Args:
+        name (str): The class name.
+        names (tuple[str, ...]): The field names.
+        values (tuple[Any, ...]): The field values.
+        frozen (bool): Whether the dataclass is frozen.
+        slots (bool): Whether the dataclass uses __slots__.
+        lazy (bool): Whether the dataclass builds LazySection fields on access.
+
+    Returns:
+        Any: The config object.
+    """
+    dclass = config_class(name, zip(names, map(type, values)), frozen, slots, lazy)
+    return dclass(*values)
+
+
+class ClassCache:
+    """
+    Bounded LRU cache of dataclasses keyed by their shape.
+
+    Args:
+        maxsize (int): Maximum number of classes kept alive by the cache.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._classes: OrderedDict[ShapeKey, type] = OrderedDict()
+        self._lock = Lock()
+
+    def get_or_create(
+        self,
+        name: str,
+        fields: Iterable[tuple[str, type]],
+        frozen: bool = True,
+        slots: bool = False,
+        lazy: bool = False,
+    ) -> type:
+        """
+        Return the dataclass for the given shape, creating it on the first request.
+
+        Args:
+            name (str): The class name.
+            fields (Iterable[tuple[str, type]]): The (field name, field type) pairs in declaration order.
+            frozen (bool): Whether the dataclass should be frozen.
+            slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+            lazy (bool): Whether LazySection fields are built on first access (see heracless.utils.lazy).
+
+        Returns:
+            type: The cached or newly created dataclass.
+        """
+        fields = tuple(fields)
+        key: ShapeKey = (name, tuple(f[0] for f in fields), tuple(f[1] for f in fields), frozen, slots, lazy)
+        with self._lock:
+            dclass = self._classes.get(key)
+            if dclass is not None:
+                self.hits += 1
+                self._classes.move_to_end(key)
+                return dclass
+            self.misses += 1
+            namespace: dict[str, Any] = {"__reduce__": reduce_config}
+            if lazy:
+                namespace.update(__getattribute__=lazy_getattribute, __eq__=lazy_eq)
+            bases = (DerivedSlot,) if slots else ()
+            dclass = make_dataclass(name, fields, bases=bases, frozen=frozen, slots=slots, namespace=namespace)
+            self._classes[key] = dclass
+            if len(self._classes) > self.maxsize:
+                self._classes.popitem(last=False)
+            return dclass
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Report the cache statistics.
+
+        Returns:
+            CacheInfo: hits, misses, maxsize and current size of the cache.
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._classes))
+
+    def cache_clear(self) -> None:
+        """
+        Drop all cached classes and reset the statistics.
+        """
+        with self._lock:
+            self._classes.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+CLASS_CACHE = ClassCache()
+
+
+def config_class(
+    name: str, fields: Iterable[tuple[str, type]], frozen: bool = True, slots: bool = False, lazy: bool = False
+) -> type:
+    """
+    Get the process wide dataclass for a config shape.
+
+    Args:
+        name (str): The class name.
+        fields (Iterable[tuple[str, type]]): The (field name, field type) pairs in declaration order.
+        frozen (bool): Whether the dataclass should be frozen.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+        lazy (bool): Whether LazySection fields are built on first access (see heracless.utils.lazy).
+
+    Returns:
+        type: The shared dataclass for this shape.
+    """
+    return CLASS_CACHE.get_or_create(name, fields, frozen, slots, lazy)
+
+
+def class_cache_info() -> CacheInfo:
+    """
+    Report hit/miss statistics of the process wide class cache.
+
+    Returns:
+        CacheInfo: hits, misses, maxsize and current size of the cache.
+    """
+    return CLASS_CACHE.cache_info()
+
+
+def class_cache_clear() -> None:
+    """
+    Clear the process wide class cache.
+    """
+    CLASS_CACHE.cache_clear()
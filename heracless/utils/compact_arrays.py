@@ -0,0 +1,240 @@
+from array import array
+from typing import Any, Optional, Sequence
+
+try:
+    import numpy
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    numpy = None  # type: ignore[assignment]
+    NUMPY_AVAILABLE = False
+
+"""
+compact storage of homogeneous scalar lists:
+opt-in replacement of tuples of boxed ints/floats/bools by array.array or read-only NumPy arrays
+"""
+
+ARRAY_MODES: tuple[str, ...] = ("array", "numpy", "auto")
+INT64_MIN: int = -(2**63)
+INT64_MAX: int = 2**63 - 1
+
+# scalar type -> (array.array typecode, stub annotation), bools have no array.array typecode and stay tuples
+ARRAY_TYPES: dict[type, tuple[str, str]] = {int: ("q", "array[int]"), float: ("d", "array[float]")}
+# scalar type -> (NumPy dtype name, stub annotation)
+NUMPY_TYPES: dict[type, tuple[str, str]] = {
+    int: ("int64", "numpy.typing.NDArray[numpy.int64]"),
+    float: ("float64", "numpy.typing.NDArray[numpy.float64]"),
+    bool: ("bool_", "numpy.typing.NDArray[numpy.bool_]"),
+}
+STUB_IMPORTS: dict[str, str] = {"array": "from array import array\n", "numpy": "import numpy\nimport numpy.typing\n"}
+# array.array methods changing the array in place, disabled on FrozenArray
+MUTATING_METHODS: tuple[str, ...] = (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "byteswap",
+    "extend",
+    "frombytes",
+    "fromfile",
+    "fromlist",
+    "fromunicode",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+)
+
+
+class FrozenArray(array):
+    """
+    Read-only array.array, the counterpart of the read-only NumPy arrays for frozen configs.
+    Mutating methods raise TypeError, instances are hashable (by typecode and values) and picklable,
+    copies are the instance itself. Writes through the buffer protocol (memoryview) are not prevented.
+    """
+
+    __slots__ = ()
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash((self.typecode, self.tobytes()))
+
+    def __reduce_ex__(self, protocol: Any) -> tuple[Any, ...]:
+        return FrozenArray, (self.typecode, self.tobytes())
+
+    def __copy__(self) -> "FrozenArray":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "FrozenArray":
+        return self
+
+
+def _read_only(self: Any, *args: Any) -> None:
+    raise TypeError("FrozenArray is read-only")
+
+
+for _method in MUTATING_METHODS:
+    setattr(FrozenArray, _method, _read_only)
+
+
+if NUMPY_AVAILABLE:
+
+    class FrozenNDArray(numpy.ndarray):
+        """
+        Read-only NumPy array of compact array configs, compares and hashes by shape and values like FrozenArray,
+        so configs holding it stay comparable and hashable. == and != return a bool (use numpy.equal for the
+        element-wise comparison), slices, copies and computation results are plain NumPy arrays.
+        """
+
+        def __eq__(self, other: object) -> bool:
+            if not isinstance(other, numpy.ndarray):
+                return NotImplemented
+            return self.shape == other.shape and bool(numpy.array_equal(self, other))
+
+        def __ne__(self, other: object) -> bool:
+            equal = self.__eq__(other)
+            return equal if equal is NotImplemented else not equal
+
+        def __hash__(self) -> int:  # type: ignore[override]
+            return hash((self.shape, tuple(self.ravel().tolist())))
+
+        def __getitem__(self, index: Any) -> Any:
+            item = super().__getitem__(index)
+            return item.view(numpy.ndarray) if isinstance(item, FrozenNDArray) else item
+
+        def __array_ufunc__(self, ufunc: Any, method: str, *inputs: Any, **kwargs: Any) -> Any:
+            inputs = tuple(numpy.asarray(value) if isinstance(value, FrozenNDArray) else value for value in inputs)
+            return getattr(ufunc, method)(*inputs, **kwargs)
+
+        def __reduce_ex__(self, protocol: Any) -> tuple[Any, ...]:
+            return frozen_ndarray, (numpy.asarray(self),)
+
+        def copy(self, order: Any = "C") -> Any:
+            return numpy.array(self, order=order)
+
+        def __copy__(self) -> "FrozenNDArray":
+            return self
+
+        def __deepcopy__(self, memo: Optional[dict[int, Any]] = None) -> "FrozenNDArray":
+            return self
+
+
+def frozen_ndarray(values: Any) -> Any:
+    """
+    Read-only copy of a NumPy array (see FrozenNDArray).
+
+    Args:
+        values (Any): The array.
+
+    Returns:
+        FrozenNDArray: The read-only array.
+    """
+    result = numpy.array(values).view(FrozenNDArray)
+    result.flags.writeable = False
+    return result
+
+
+def resolve_array_mode(arrays: Optional[str]) -> Optional[str]:
+    """
+    Resolve the requested compact array mode.
+
+    Args:
+        arrays (str, optional): None (tuples), "array", "numpy" or "auto" (NumPy if installed, else array).
+
+    Returns:
+        str: "array", "numpy" or None.
+
+    Raises:
+        ValueError: If the mode is unknown or NumPy is requested but not installed.
+    """
+    if arrays is None:
+        return None
+    if arrays not in ARRAY_MODES:
+        raise ValueError(f"Unknown array mode '{arrays}', choose one of: {', '.join(ARRAY_MODES)}")
+    if arrays == "auto":
+        return "numpy" if NUMPY_AVAILABLE else "array"
+    if arrays == "numpy" and not NUMPY_AVAILABLE:
+        raise ValueError("Array mode 'numpy' requires NumPy to be installed")
+    return arrays
+
+
+def scalar_type(values: Sequence[Any]) -> Optional[type]:
+    """
+    The common scalar type of a non-empty list of ints, floats or bools.
+
+    Args:
+        values (Sequence[Any]): The list items.
+
+    Returns:
+        type: int, float or bool if every item has exactly that type, else None.
+    """
+    if not values:
+        return None
+    first = type(values[0])
+    if first not in (int, float, bool) or any(type(value) is not first for value in values):
+        return None
+    if first is int and not all(INT64_MIN <= value <= INT64_MAX for value in values):
+        return None
+    return first
+
+
+def matrix_scalar_type(rows: Sequence[Any]) -> Optional[type]:
+    """
+    The common scalar type of a list of equal-length, homogeneous rows (2-D lists).
+
+    Args:
+        rows (Sequence[Any]): The list items.
+
+    Returns:
+        type: int, float or bool if rows form a matrix of that type, else None.
+    """
+    if not rows or not all(isinstance(row, (list, tuple)) for row in rows):
+        return None
+    if len({len(row) for row in rows}) != 1:
+        return None
+    types = {scalar_type(row) for row in rows}
+    if len(types) != 1:
+        return None
+    return types.pop()
+
+
+def compact_array(values: Sequence[Any], mode: str) -> Optional[Any]:
+    """
+    Convert a homogeneous list into a compact array.
+    Arrays are read-only and compare by value (FrozenArray or FrozenNDArray), so frozen configs stay immutable,
+    comparable and hashable, 2-D lists of equal-length rows become 2-D NumPy arrays.
+
+    Args:
+        values (Sequence[Any]): The list.
+        mode (str): "array" or "numpy".
+
+    Returns:
+        Any: The array, or None if the list cannot be stored compactly (it stays a tuple).
+    """
+    if mode == "numpy":
+        item_type = scalar_type(values) or matrix_scalar_type(values)
+        if item_type is None:
+            return None
+        return frozen_ndarray(numpy.array(values, dtype=NUMPY_TYPES[item_type][0]))
+    item_type = scalar_type(values)
+    if item_type not in ARRAY_TYPES:
+        return None
+    return FrozenArray(ARRAY_TYPES[item_type][0], values)
+
+
+def array_annotation(values: Sequence[Any], mode: str) -> Optional[str]:
+    """
+    Stub annotation of the compact array compact_array would create.
+
+    Args:
+        values (Sequence[Any]): The list.
+        mode (str): "array" or "numpy".
+
+    Returns:
+        str: The annotation, or None if the list stays a tuple.
+    """
+    if mode == "numpy":
+        item_type = scalar_type(values) or matrix_scalar_type(values)
+        return NUMPY_TYPES[item_type][1] if item_type is not None else None
+    item_type = scalar_type(values)
+    return ARRAY_TYPES[item_type][1] if item_type in ARRAY_TYPES else None
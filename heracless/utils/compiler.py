@@ -0,0 +1,209 @@
+import hashlib
+import importlib.util
+import math
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from heracless.fight import load_as_dict
+from heracless.loaders import get_loader
+from heracless.utils.cfg_tree import INDENT, as_lowercase, as_uppercase
+
+"""
+ahead of time compilation of YAML configs:
+turns a parsed config into a python module with concrete dataclasses and a CONFIG instance built from literals,
+importing it only costs a bytecode load (no YAML parsing, no tree building, no make_dataclass)
+"""
+
+MODULE_HEADER: str = (
+    "# Generated by heracless --compile, DO NOT EDIT.\n"
+    "from __future__ import annotations\n\n"
+    "import datetime\n"
+    "from dataclasses import dataclass\n"
+)
+
+
+def source_hash(cfg_dir: Path) -> str:
+    """
+    Hash the raw bytes of a YAML config file.
+
+    Args:
+        cfg_dir (Path): Path to the YAML configuration file.
+
+    Returns:
+        str: Hex encoded sha256 of the file content.
+    """
+    return hashlib.sha256(Path(cfg_dir).read_bytes()).hexdigest()
+
+
+class ModuleWriter:
+    """
+    Collects dataclass definitions and literal expressions for a compiled config module.
+
+    Args:
+        frozen (bool): Whether the generated dataclasses are frozen.
+    """
+
+    def __init__(self, frozen: bool) -> None:
+        self.frozen = frozen
+        self.definitions: list[str] = []
+        self._shapes: dict[tuple[str, tuple[tuple[str, str], ...]], str] = {}
+        self._class_names: set[str] = set()
+
+    def class_name(self, name: str, fields: tuple[tuple[str, str], ...]) -> str:
+        """
+        Get the class for a shape, defining it on first use.
+        Different shapes with the same name get numbered class names.
+
+        Args:
+            name (str): The YAML key the mapping is stored under.
+            fields (tuple[tuple[str, str], ...]): (field name, annotation) pairs.
+
+        Returns:
+            str: The class name.
+        """
+        base = as_uppercase(name)
+        key = (base, fields)
+        if key in self._shapes:
+            return self._shapes[key]
+        class_name, counter = base, 1
+        while class_name in self._class_names:
+            counter += 1
+            class_name = f"{base}{counter}"
+        self._shapes[key] = class_name
+        self._class_names.add(class_name)
+        entries = "".join(f"{INDENT}{field}: {annotation}\n" for field, annotation in fields) or f"{INDENT}pass\n"
+        self.definitions.append(f"\n\n@dataclass(frozen={self.frozen})\nclass {class_name}:\n{entries}")
+        return class_name
+
+    def literal(self, name: str, value: Any) -> tuple[str, str]:
+        """
+        Translate a parsed YAML value into an annotation and a python expression.
+
+        Args:
+            name (str): The YAML key the value is stored under.
+            value (Any): The value.
+
+        Returns:
+            tuple[str, str]: The annotation and the expression rebuilding the value.
+
+        Raises:
+            TypeError: If the value has no literal representation.
+        """
+        match value:
+            case dict():
+                seen_names: dict[str, int] = {}
+                fields, expressions = [], []
+                for key, child in value.items():
+                    field_name = as_lowercase(key)
+                    if field_name in seen_names:
+                        seen_names[field_name] += 1
+                        field_name = f"{field_name}_{seen_names[field_name]}"
+                    else:
+                        seen_names[field_name] = 0
+                    annotation, expression = self.literal(key, child)
+                    fields.append((field_name, annotation))
+                    expressions.append(expression)
+                class_name = self.class_name(name, tuple(fields))
+                return class_name, f"{class_name}({', '.join(expressions)})"
+            case list() | tuple():
+                items = [self.literal(f"{name}_item", item) for item in value]
+                if not items:
+                    return "tuple", "()"
+                return f"tuple[{items[0][0]}, ...]", f"({', '.join(item[1] for item in items)},)"
+            case set():
+                items = [self.literal(f"{name}_item", item) for item in value]
+                if not items:
+                    return "set", "set()"
+                return f"set[{items[0][0]}]", f"{{{', '.join(item[1] for item in items)}}}"
+            case bool() | int() | str() | None:
+                return ("None" if value is None else type(value).__name__), repr(value)
+            case float():
+                return "float", (repr(value) if math.isfinite(value) else f'float("{value}")')
+            case datetime() | date():
+                return f"datetime.{type(value).__name__}", repr(value)
+        raise TypeError(f"Cannot compile value of type {type(value).__name__} stored under '{name}'")
+
+
+def config_to_module_str(cfg_dict: dict[Any, Any], frozen: bool, digest: str) -> str:
+    """
+    Generate the source of a compiled config module.
+
+    Args:
+        cfg_dict (dict): The parsed YAML config.
+        frozen (bool): Whether the generated dataclasses are frozen.
+        digest (str): The source hash of the YAML file.
+
+    Returns:
+        str: The module source.
+    """
+    writer = ModuleWriter(frozen)
+    _, expression = writer.literal("Config", cfg_dict)
+    constants = f'\nSOURCE_HASH = "{digest}"\nFROZEN = {frozen}\n'
+    return MODULE_HEADER + constants + "".join(writer.definitions) + f"\n\nCONFIG = {expression}\n"
+
+
+def compile_config(
+    cfg_dir: Path | str, out_path: Path | str, frozen: bool = True, loader: Optional[str] = None
+) -> Path:
+    """
+    Compile a YAML config into an importable python module.
+
+    Args:
+        cfg_dir (Path|str): Path to the YAML configuration file.
+        out_path (Path|str): Path of the python module to write.
+        frozen (bool): Whether the generated dataclasses are frozen.
+        loader (str, optional): YAML loader backend, defaults to the fastest available.
+
+    Returns:
+        Path: The path of the written module.
+
+    Raises:
+        ValueError: If the config file is empty.
+    """
+    cfg_dir, out_path = Path(cfg_dir), Path(out_path)
+    cfg_dict = load_as_dict(cfg_dir, get_loader(loader).load)
+    if cfg_dict is None:
+        raise ValueError(f"Cannot compile empty config file {cfg_dir}")
+    module_str = config_to_module_str(cfg_dict, frozen, source_hash(cfg_dir))
+    with open(out_path, "w") as out:
+        out.write(module_str)
+    return out_path
+
+
+def load_compiled(module_path: Path | str, cfg_dir: Optional[Path | str] = None, frozen: bool = True) -> Optional[Any]:
+    """
+    Import a compiled config module and return its CONFIG if it is still up to date.
+
+    Args:
+        module_path (Path|str): Path of the compiled python module.
+        cfg_dir (Path|str, optional): YAML file the module was compiled from, skips the staleness check if None.
+        frozen (bool): Frozen flag the caller expects.
+
+    Returns:
+        Any: The compiled config object, or None if the module is missing, stale or was compiled differently.
+    """
+    module_path = Path(module_path).resolve()
+    if not module_path.exists():
+        return None
+    # the modification time is part of the name so a recompiled module is imported again
+    path_digest = hashlib.sha256(str(module_path).encode()).hexdigest()[:16]
+    module_name = f"_heracless_compiled_{path_digest}_{module_path.stat().st_mtime_ns}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        if spec is None or spec.loader is None:
+            return None
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module  # dataclasses look their module up while being created
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            del sys.modules[module_name]
+            return None
+    if getattr(module, "FROZEN", None) != frozen:
+        return None
+    if cfg_dir is not None and getattr(module, "SOURCE_HASH", None) != source_hash(Path(cfg_dir)):
+        return None
+    return getattr(module, "CONFIG", None)
@@ -0,0 +1,268 @@
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import StringIO
+from typing import IO, Any, Iterable, Iterator, Optional
+
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import FullConstructor
+from yaml.events import DocumentEndEvent, DocumentStartEvent, StreamEndEvent, StreamStartEvent
+from yaml.resolver import Resolver
+
+from heracless.utils.cfg_tree import dict_to_config_obj
+from heracless.utils.event_builder import UnsupportedEvent, config_builder, parse_events
+
+"""
+multi-document YAML streams:
+every `---` separated document becomes its own config object, documents are parsed and built one at a time.
+Configs of documents with the same shape share their classes (see class_cache).
+For parallel loading the text is split at the document markers and batches of documents are parsed in worker
+processes, the configs are built by the parent.
+YAML forbids `---` at the start of a line inside a document, so the split never cuts a document.
+"""
+
+# a document start marker at the beginning of a line
+DOCUMENT_START = re.compile(r"^---(?:[ \t\r\n]|$)")
+# documents sent to a worker process in one task, at least one document
+BATCH_CHARS: int = 64 * 1024
+
+
+class _EventReplay(Composer, FullConstructor, Resolver):
+    """
+    PyYAML's full loader reading already parsed events instead of a stream
+    """
+
+    def __init__(self, events: Iterable[Any]) -> None:
+        self._events = deque(events)
+        Composer.__init__(self)
+        FullConstructor.__init__(self)
+        Resolver.__init__(self)
+
+    def check_event(self, *choices: Any) -> bool:
+        if not self._events:
+            return False
+        return not choices or isinstance(self._events[0], choices)
+
+    def peek_event(self) -> Any:
+        return self._events[0]
+
+    def get_event(self) -> Any:
+        return self._events.popleft()
+
+    def dispose(self) -> None:
+        pass
+
+
+def document_events(events: Iterable[Any]) -> Iterator[list[Any]]:
+    """
+    Split a YAML event stream into the events of its documents.
+
+    Args:
+        events (Iterable[Any]): The yaml.Event objects of a stream.
+
+    Returns:
+        Iterator[list[Any]]: The events of each document, from its DocumentStartEvent to its DocumentEndEvent.
+    """
+    document: list[Any] = []
+    for event in events:
+        kind = type(event)
+        if kind is StreamStartEvent or kind is StreamEndEvent:
+            continue
+        document.append(event)
+        if kind is DocumentEndEvent:
+            yield document
+            document = []
+
+
+def build_document(
+    events: list[Any], index: int, frozen: bool, slots: bool = False, arrays: Optional[str] = None, tables: bool = False
+) -> Optional[Any]:
+    """
+    Build the config of one document, documents the event builder does not support are constructed like full_load.
+
+    Args:
+        events (list[Any]): The events of the document (see document_events).
+        index (int): Position of the document in the stream, used in errors.
+        frozen (bool): Whether the config object is frozen.
+        slots (bool): Whether the config classes use __slots__ instead of a per-instance __dict__.
+        arrays (str, optional): Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+        tables (bool): Whether lists of uniform mappings are stored as RecordTables.
+
+    Returns:
+        Any: The config object, None for an empty document.
+
+    Raises:
+        ValueError: If the document is neither empty nor a mapping.
+    """
+    try:
+        return config_builder(frozen, slots, arrays, tables).build(events)
+    except UnsupportedEvent:
+        pass  # e.g. explicit tags
+    value = _full_load(events, index)
+    return None if value is None else dict_to_config_obj(frozen, value, slots=slots, arrays=arrays, tables=tables)
+
+
+def _full_load(events: list[Any], index: int) -> Optional[dict[Any, Any]]:
+    """
+    constructs one document like full_load, None for an empty document, ValueError if it is not a mapping
+    """
+    value = _EventReplay([StreamStartEvent(), *events, StreamEndEvent()]).get_single_data()
+    if value is None:
+        return None
+    if not isinstance(value, dict):
+        raise ValueError(f"Document {index} is a {type(value).__name__}, not a mapping")
+    return value
+
+
+def parse_document(events: list[Any], index: int) -> Optional[dict[Any, Any]]:
+    """
+    Parse one document into plain values exactly like full_load, without building config objects.
+
+    Args:
+        events (list[Any]): The events of the document (see document_events).
+        index (int): Position of the document in the stream, used in errors.
+
+    Returns:
+        dict: The parsed mapping, None for an empty document.
+
+    Raises:
+        ValueError: If the document is neither empty nor a mapping.
+    """
+    try:
+        value: Optional[dict[Any, Any]] = config_builder(True).build(events, plain=True)
+    except UnsupportedEvent:
+        return _full_load(events, index)  # e.g. explicit tags or a root that is not a mapping
+    return value
+
+
+def iter_documents(
+    stream: IO[str], frozen: bool, slots: bool = False, arrays: Optional[str] = None, tables: bool = False
+) -> Iterator[Optional[Any]]:
+    """
+    Build the config of every document of a stream, each document is parsed when the iterator reaches it.
+
+    Args:
+        stream (IO[str]): The YAML stream.
+        frozen (bool): Whether the config objects are frozen.
+        slots (bool): Whether the config classes use __slots__ instead of a per-instance __dict__.
+        arrays (str, optional): Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+        tables (bool): Whether lists of uniform mappings are stored as RecordTables.
+
+    Returns:
+        Iterator[Optional[Any]]: The config objects, None for empty documents.
+
+    Raises:
+        ValueError: If a document is neither empty nor a mapping.
+        yaml.YAMLError: If the YAML is malformed.
+    """
+    for index, events in enumerate(document_events(parse_events(stream))):
+        yield build_document(events, index, frozen, slots, arrays, tables)
+
+
+def split_documents(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Split YAML text into the text of its documents at the `---` markers, without parsing it.
+    Directive lines (%YAML, %TAG) directly before a marker move to the following document.
+    A part may also hold no document (comments only).
+
+    Args:
+        lines (Iterable[str]): The lines of the YAML text, including line breaks.
+
+    Returns:
+        Iterator[str]: The text of each document.
+    """
+    part: list[str] = []
+    for line in lines:
+        if not DOCUMENT_START.match(line):
+            part.append(line)
+            continue
+        split = len(part)
+        while split and (part[split - 1].startswith("%") or not part[split - 1].strip()):
+            split -= 1
+        if not any(pending.startswith("%") for pending in part[split:]):
+            split = len(part)
+        if part[:split]:
+            yield "".join(part[:split])
+        part = part[split:] + [line]
+    if part:
+        yield "".join(part)
+
+
+def load_document_batch(text: str, start: int) -> list[Optional[dict[Any, Any]]]:
+    """
+    Worker process task: parse a batch of documents into plain values, the configs are built by the parent,
+    so every document is constructed once and shares the parent's config classes.
+
+    Args:
+        text (str): The YAML text of the documents.
+        start (int): Index of the first document of the batch text, used in errors.
+
+    Returns:
+        list[Optional[dict]]: The parsed mappings, None for empty documents.
+    """
+    events = document_events(parse_events(StringIO(text)))
+    return [parse_document(doc, start + index) for index, doc in enumerate(events)]
+
+
+def _batches(parts: Iterable[str]) -> Iterator[tuple[str, int]]:
+    """
+    group document texts into batches of about BATCH_CHARS, with the (approximate) index of their first part
+    """
+    batch: list[str] = []
+    size = start = count = 0
+    for part in parts:
+        batch.append(part)
+        size += len(part)
+        count += 1
+        if size >= BATCH_CHARS:
+            yield "".join(batch), start
+            batch, size, start = [], 0, count
+    if batch:
+        yield "".join(batch), start
+
+
+def iter_documents_parallel(
+    lines: Iterable[str],
+    workers: int,
+    frozen: bool,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+) -> Iterator[Optional[Any]]:
+    """
+    Build the config of every document in document order, the documents are parsed in worker processes
+    and built in this process. Only a few batches per worker are in flight, so the text is read as the iterator
+    advances.
+
+    Args:
+        lines (Iterable[str]): The lines of the YAML text.
+        workers (int): Number of worker processes.
+        frozen (bool): Whether the config objects are frozen.
+        slots (bool): Whether the config classes use __slots__ instead of a per-instance __dict__.
+        arrays (str, optional): Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+        tables (bool): Whether lists of uniform mappings are stored as RecordTables.
+
+    Returns:
+        Iterator[Optional[Any]]: The config objects, None for empty documents.
+
+    Raises:
+        ValueError: If a document is neither empty nor a mapping.
+        yaml.YAMLError: If the YAML is malformed.
+    """
+
+    def build(batch: Future) -> Iterator[Optional[Any]]:
+        for value in batch.result():
+            if value is None:
+                yield None
+            else:
+                yield dict_to_config_obj(frozen, value, slots=slots, arrays=arrays, tables=tables)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque[Future] = deque()
+        for text, start in _batches(split_documents(lines)):
+            in_flight.append(pool.submit(load_document_batch, text, start))
+            if len(in_flight) >= 2 * workers:
+                yield from build(in_flight.popleft())
+        while in_flight:
+            yield from build(in_flight.popleft())
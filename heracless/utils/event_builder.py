@@ -0,0 +1,573 @@
+from typing import IO, Any, Callable, Iterable, Optional, cast
+
+import yaml
+from yaml.constructor import ConstructorError, FullConstructor
+from yaml.events import (
+    AliasEvent,
+    DocumentStartEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+)
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+from heracless.utils.cfg_tree import (
+    SharedValues,
+    Structure,
+    Tree,
+    as_lowercase,
+    build_config_obj,
+    iterable_to_type_mapper,
+    tree_builder,
+    value_to_config_attr,
+)
+from heracless.utils.exceptions import ConfigPathError
+
+"""
+streaming construction of configs and trees from the YAML event stream:
+yaml.parse reads the file in bounded chunks and every mapping is turned into its config object (or tree node)
+as soon as its end event arrives, so the whole document never exists as a plain dict next to the config.
+Anchored subtrees, merge sources and, in compact array/table mode, sequences are kept as plain values
+because their representation depends on where they are used or on all of their items.
+With a selection only the selected subtrees are built, the events of all other subtrees are skipped
+without resolving or constructing their scalars (anchored nodes in skipped subtrees are still built, aliases may use them).
+"""
+
+MERGE_TAG: str = "tag:yaml.org,2002:merge"
+VALUE_TAG: str = "tag:yaml.org,2002:value"
+STR_TAG: str = "tag:yaml.org,2002:str"
+DEFAULT_TAGS: tuple[Optional[str], ...] = (None, "!", Resolver.DEFAULT_MAPPING_TAG, Resolver.DEFAULT_SEQUENCE_TAG)
+
+_RESOLVER = Resolver()
+_CONSTRUCTOR = FullConstructor()
+# selection of a mapping key that is not selected
+_SKIP: Any = object()
+
+
+class UnsupportedEvent(Exception):
+    """
+    The event stream uses a feature the streaming builder does not handle (explicit collection or custom tags,
+    several documents, a non mapping root, recursive or undefined aliases), load the file with a regular loader.
+    """
+
+
+class _Frame:
+    """
+    an open mapping or sequence
+    """
+
+    __slots__ = (
+        "is_mapping",
+        "name",
+        "plain",
+        "anchor",
+        "items",
+        "merges",
+        "key",
+        "has_key",
+        "merge_next",
+        "discard",
+        "select",
+        "path",
+        "segment",
+        "key_select",
+        "seen",
+    )
+
+    def __init__(
+        self,
+        is_mapping: bool,
+        name: Any,
+        plain: bool,
+        anchor: Optional[str],
+        discard: bool = False,
+        select: Optional[dict[str, Any]] = None,
+        path: str = "",
+    ) -> None:
+        self.is_mapping = is_mapping
+        self.name = name
+        self.plain = plain
+        self.anchor = anchor
+        self.items: list[Any] = []  # sequence items or (key, value) pairs
+        self.merges: list[tuple[Any, Any]] = []  # (key, plain value) pairs of merged mappings
+        self.key: Any = None
+        self.has_key = False
+        self.merge_next = False
+        self.discard = discard  # skipped subtree, its events are dropped
+        self.select = select  # selected keys of this mapping, None selects all
+        self.path = path  # dotted path, used in selection errors
+        self.segment: Optional[str] = None  # selection segment of the current key
+        self.key_select: Any = None  # selection of the current key: None (all), a dict or _SKIP
+        self.seen: set[str] = set()  # selected segments found so far
+
+    def reset_key(self) -> None:
+        self.key, self.has_key, self.merge_next, self.segment, self.key_select = None, False, False, None, None
+
+    @property
+    def dropping(self) -> bool:
+        """
+        whether the next value is dropped: inside a skipped subtree or the value of a key that is not selected
+        """
+        return self.discard or (self.has_key and self.key_select is _SKIP)
+
+
+class EventBuilder:
+    """
+    Builds a value from YAML events, the callbacks decide what mappings and sequences become.
+
+    Args:
+        convert (Callable[[Any, Any, Optional[SharedValues]], Any]): Converts a (name, plain value) pair: scalars,
+            aliases and plain subtrees. Anchored values are converted with the values shared by the whole build,
+            so every alias (and every merge key) of an anchor reuses the same converted value.
+        mapping (Callable[[Any, list[tuple[Any, Any]]], Any]): Builds a mapping from its name and (key, value) pairs.
+        sequence (Callable[[Any, list[Any]], Any]): Builds a sequence from its name and converted items.
+        root (Callable[[Any, list[tuple[Any, Any]]], Any], optional): Builds the root mapping, defaults to mapping.
+        plain_sequences (bool): Build sequences as plain lists and convert them when they end.
+    """
+
+    def __init__(
+        self,
+        convert: Callable[[Any, Any, Optional[SharedValues]], Any],
+        mapping: Callable[[Any, list[tuple[Any, Any]]], Any],
+        sequence: Callable[[Any, list[Any]], Any],
+        root: Optional[Callable[[Any, list[tuple[Any, Any]]], Any]] = None,
+        plain_sequences: bool = False,
+    ) -> None:
+        self.convert = convert
+        self._shared: SharedValues = {}
+        self.mapping = mapping
+        self.sequence = sequence
+        self.root = root or mapping
+        self.plain_sequences = plain_sequences
+
+    def build(
+        self,
+        events: Iterable[Any],
+        root_name: str = "Config",
+        plain: bool = False,
+        select: Optional[dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Consume the events of a single document stream.
+
+        Args:
+            events (Iterable[Any]): The yaml.Event objects, e.g. of yaml.parse(stream).
+            root_name (str): Name of the root mapping.
+            plain (bool): Build the whole document as plain values.
+            select (dict[str, Any], optional): Only build these subtrees (see selection_tree), None builds everything.
+
+        Returns:
+            Any: The built root mapping, None for an empty stream.
+
+        Raises:
+            UnsupportedEvent: If the stream needs a regular loader.
+            ConfigPathError: If a selected path does not exist or does not lead through mappings.
+            yaml.YAMLError: If the YAML is malformed.
+        """
+        self._shared = {}
+        try:
+            return self._consume(events, root_name, plain, select)
+        finally:
+            self._shared = {}  # the converted anchors are only shared within one document
+
+    def _consume(self, events: Iterable[Any], root_name: str, plain: bool, select: Optional[dict[str, Any]]) -> Any:
+        stack: list[_Frame] = []
+        anchors: dict[str, Any] = {}
+        root: Any = None
+        documents = 0
+        for event in events:
+            kind = type(event)
+            if kind is ScalarEvent:
+                if not stack:
+                    raise UnsupportedEvent("the document root is not a mapping")
+                frame = stack[-1]
+                if frame.dropping:  # skipped values are neither resolved nor constructed
+                    if event.anchor is not None:
+                        self._anchor(anchors, event.anchor, self._scalar_value(event, self._scalar_tag(event)))
+                    self._drop(frame)
+                    continue
+                tag = self._scalar_tag(event)
+                value = self._scalar_value(event, tag)
+                if event.anchor is not None:
+                    self._anchor(anchors, event.anchor, value)
+                self._add(frame, value, plain=True, tag=tag)
+            elif kind is MappingStartEvent or kind is SequenceStartEvent:
+                is_mapping = kind is MappingStartEvent
+                if not stack:
+                    if event.tag not in DEFAULT_TAGS:
+                        raise UnsupportedEvent(f"explicit tag {event.tag}")
+                    if not is_mapping:
+                        raise UnsupportedEvent("the document root is not a mapping")
+                    stack.append(_Frame(True, root_name, plain, event.anchor, select=select))
+                    continue
+                parent = stack[-1]
+                dropping = parent.dropping
+                if dropping and event.anchor is None:
+                    stack.append(_Frame(is_mapping, None, True, None, discard=True))
+                    continue
+                if event.tag not in DEFAULT_TAGS:
+                    raise UnsupportedEvent(f"explicit tag {event.tag}")
+                if not dropping and parent.is_mapping and not parent.has_key:
+                    raise UnsupportedEvent("collection used as a mapping key")
+                # anchored subtrees are built completely, the selection is applied where they are used
+                child_select = None if dropping or event.anchor is not None else parent.key_select
+                if child_select is not None and not is_mapping:
+                    raise ConfigPathError({self._key_path(parent): "is not a mapping"})
+                child_plain = (
+                    parent.plain
+                    or event.anchor is not None
+                    or (parent.is_mapping and parent.merge_next)
+                    or (not is_mapping and self.plain_sequences)
+                )
+                stack.append(
+                    _Frame(
+                        is_mapping,
+                        self._child_name(parent),
+                        child_plain,
+                        event.anchor,
+                        select=child_select,
+                        path=self._key_path(parent),
+                    )
+                )
+            elif kind is MappingEndEvent or kind is SequenceEndEvent:
+                frame = stack.pop()
+                if frame.discard:
+                    self._drop(stack[-1])
+                    continue
+                value = self._close(frame, self.mapping if stack else self.root)
+                if frame.anchor is not None:
+                    self._anchor(anchors, frame.anchor, value)
+                if not stack:
+                    root = value
+                    continue
+                self._add(
+                    stack[-1],
+                    value,
+                    plain=frame.plain,
+                    selected=frame.select is not None,
+                    shared=frame.anchor is not None,
+                )
+            elif kind is AliasEvent:
+                if not stack:
+                    raise UnsupportedEvent("the document root is an alias")
+                if stack[-1].dropping:
+                    self._drop(stack[-1])
+                    continue
+                if event.anchor not in anchors:
+                    raise UnsupportedEvent(f"undefined or recursive alias {event.anchor}")
+                self._add(stack[-1], anchors[event.anchor], plain=True, shared=True)
+            elif kind is DocumentStartEvent:
+                documents += 1
+                if documents > 1:
+                    raise UnsupportedEvent("more than one document")
+                anchors.clear()
+        return root
+
+    @staticmethod
+    def _scalar_tag(event: Any) -> str:
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = _RESOLVER.resolve(ScalarNode, event.value, event.implicit)
+        return str(tag)
+
+    @staticmethod
+    def _scalar_value(event: Any, tag: str) -> Any:
+        if tag == MERGE_TAG or tag == VALUE_TAG:
+            tag = STR_TAG
+        construct = _CONSTRUCTOR.yaml_constructors.get(tag)
+        if construct is None:
+            raise UnsupportedEvent(f"explicit tag {tag}")
+        return construct(_CONSTRUCTOR, ScalarNode(tag, event.value, style=event.style))
+
+    @staticmethod
+    def _anchor(anchors: dict[str, Any], anchor: str, value: Any) -> None:
+        if anchor in anchors:
+            raise UnsupportedEvent(f"duplicate anchor {anchor}")
+        anchors[anchor] = value
+
+    @staticmethod
+    def _child_name(frame: _Frame) -> Any:
+        return frame.key if frame.is_mapping else f"{frame.name}_item"
+
+    @staticmethod
+    def _key_path(frame: _Frame) -> str:
+        return join_path(frame.path, frame.segment) if frame.segment is not None else frame.path
+
+    @staticmethod
+    def _drop(frame: _Frame) -> None:
+        """
+        a value of the frame was skipped
+        """
+        if not frame.discard:
+            frame.reset_key()
+
+    def _add(
+        self,
+        frame: _Frame,
+        value: Any,
+        plain: bool,
+        tag: Optional[str] = None,
+        selected: bool = False,
+        shared: bool = False,
+    ) -> None:
+        """
+        add a finished value to its parent, plain values are converted unless the parent is plain itself,
+        selected tells that the selection of the key was already applied while building the value,
+        shared that the value is anchored (or an alias) and its conversion is shared
+        """
+        if frame.dropping:  # an anchored value in a skipped subtree
+            self._drop(frame)
+            return
+        if frame.is_mapping and not frame.has_key:
+            try:
+                hash(value)
+            except TypeError:
+                raise UnsupportedEvent("unhashable mapping key") from None
+            frame.key, frame.has_key, frame.merge_next = value, True, tag == MERGE_TAG
+            if frame.select is not None and not frame.merge_next:
+                frame.segment, frame.key_select = select_entry(frame.select, value)
+                if frame.segment is not None:
+                    frame.seen.add(frame.segment)
+            return
+        if frame.is_mapping and frame.merge_next:
+            frame.merges.extend(self._merge_pairs(value))
+        else:
+            if isinstance(frame.key_select, dict) and not selected:
+                value = select_dict(value, frame.key_select, self._key_path(frame))
+            name = self._child_name(frame)
+            if plain and not frame.plain:
+                value = self.convert(name, value, self._shared if shared else None)
+            if frame.is_mapping:
+                frame.items.append((frame.key, value))
+            else:
+                frame.items.append(value)
+        frame.reset_key()
+
+    @staticmethod
+    def _merge_pairs(value: Any) -> list[tuple[Any, Any]]:
+        """
+        (key, value) pairs a merge key contributes, in the order PyYAML's flatten_mapping uses
+        """
+        if isinstance(value, dict):
+            return list(value.items())
+        if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            return [pair for item in reversed(value) for pair in item.items()]
+        raise ConstructorError(None, None, "expected a mapping or list of mappings for merging", None)
+
+    def _close(self, frame: _Frame, mapping: Callable[[Any, list[tuple[Any, Any]]], Any]) -> Any:
+        """
+        build a finished mapping or sequence, merged keys come first and own keys override them like in PyYAML
+        """
+        if not frame.is_mapping:
+            return frame.items if frame.plain else self.sequence(frame.name, frame.items)
+        merges = frame.merges
+        if frame.select is not None:
+            merges = self._selected_merges(frame)
+            check_selected(frame.select, frame.seen, frame.path)
+        if frame.plain:
+            result = dict(merges)
+            result.update(frame.items)
+            return result
+        if not merges:
+            own = dict(frame.items)  # duplicate keys: the last value wins, the first position stays
+            return mapping(frame.name, list(own.items()))
+        merged, own = dict(merges), dict(frame.items)
+        keys = dict.fromkeys([key for key, _ in merges] + [key for key, _ in frame.items])
+        return mapping(
+            frame.name,
+            [(key, own[key] if key in own else self.convert(key, merged[key], self._shared)) for key in keys],
+        )
+
+    @staticmethod
+    def _selected_merges(frame: _Frame) -> list[tuple[Any, Any]]:
+        """
+        the merged (key, value) pairs of a mapping with a selection, only selected keys are kept
+        """
+        own = {key for key, _ in frame.items}
+        pairs = []
+        for key, value in frame.merges:
+            segment, entry = select_entry(cast(dict, frame.select), key)
+            if segment is None:
+                continue
+            frame.seen.add(segment)
+            if isinstance(entry, dict) and key not in own:
+                value = select_dict(value, entry, join_path(frame.path, segment))
+            pairs.append((key, value))
+        return pairs
+
+
+def join_path(path: str, segment: str) -> str:
+    """
+    Append a segment to a dotted path.
+
+    Args:
+        path (str): The dotted path, "" for the root.
+        segment (str): The segment.
+
+    Returns:
+        str: The joined path.
+    """
+    return f"{path}.{segment}" if path else segment
+
+
+def selection_tree(select: Iterable[str]) -> dict[str, Any]:
+    """
+    Turn dotted paths into a nested selection, every segment maps to None (the whole subtree)
+    or to a dict of its selected children. Selecting a path and one of its parents selects the parent.
+
+    Args:
+        select (Iterable[str]): Dotted paths of mapping keys, e.g. ["database", "cache.redis"].
+
+    Returns:
+        dict[str, Any]: The selection.
+
+    Raises:
+        ValueError: If no path is given or a path has an empty segment.
+    """
+    paths = [select] if isinstance(select, str) else list(select)
+    if not paths:
+        raise ValueError("select needs at least one dotted path")
+    tree: dict[str, Any] = {}
+    for path in paths:
+        segments = path.split(".")
+        if not all(segments):
+            raise ValueError(f"Invalid select path '{path}'")
+        node = tree
+        for segment in segments[:-1]:
+            child = node.setdefault(segment, {})
+            if child is None:  # a parent is selected completely
+                break
+            node = child
+        else:
+            node[segments[-1]] = None
+    return tree
+
+
+def select_entry(select: dict[str, Any], key: Any) -> tuple[Optional[str], Any]:
+    """
+    Look up a mapping key in a selection, by its YAML name or its attribute name.
+
+    Args:
+        select (dict[str, Any]): The selection of the mapping.
+        key (Any): The mapping key.
+
+    Returns:
+        tuple[Optional[str], Any]: The matching segment and its selection, (None, _SKIP) if the key is not selected.
+    """
+    name = str(key)
+    if name in select:
+        return name, select[name]
+    name = as_lowercase(name)
+    if name in select:
+        return name, select[name]
+    return None, _SKIP
+
+
+def check_selected(select: dict[str, Any], seen: set[str], path: str = "") -> None:
+    """
+    Check that every selected key of a mapping was found.
+
+    Args:
+        select (dict[str, Any]): The selection of the mapping.
+        seen (set[str]): The segments found in the mapping.
+        path (str): Dotted path of the mapping, "" for the root.
+
+    Raises:
+        ConfigPathError: If selected keys are missing.
+    """
+    missing = {join_path(path, segment): "not found" for segment in select if segment not in seen}
+    if missing:
+        raise ConfigPathError(missing)
+
+
+def select_dict(value: Any, select: dict[str, Any], path: str = "") -> dict[Any, Any]:
+    """
+    Keep only the selected subtrees of a plain mapping.
+
+    Args:
+        value (Any): The plain mapping.
+        select (dict[str, Any]): The selection (see selection_tree).
+        path (str): Dotted path of the mapping, "" for the root.
+
+    Returns:
+        dict[Any, Any]: A new mapping with the selected keys.
+
+    Raises:
+        ConfigPathError: If a selected path does not exist or does not lead through mappings.
+    """
+    if not isinstance(value, dict):
+        raise ConfigPathError({path: "is not a mapping"})
+    result, seen = {}, set()
+    for key, item in value.items():
+        segment, entry = select_entry(select, key)
+        if segment is None:
+            continue
+        seen.add(segment)
+        result[key] = item if entry is None else select_dict(item, entry, join_path(path, segment))
+    check_selected(select, seen, path)
+    return result
+
+
+def parse_events(stream: IO[str]) -> Iterable[Any]:
+    """
+    The YAML events of a stream, parsed by libyaml if available.
+    The parsers read the stream in bounded chunks (16 KiB for libyaml, 4 KiB for the pure Python parser).
+
+    Args:
+        stream (IO[str]): The YAML stream.
+
+    Returns:
+        Iterable[Any]: The yaml.Event objects.
+    """
+    loader = yaml.CLoader if yaml.__with_libyaml__ else yaml.Loader
+    events: Iterable[Any] = yaml.parse(stream, Loader=loader)
+    return events
+
+
+def config_builder(
+    frozen: bool, slots: bool = False, arrays: Optional[str] = None, tables: bool = False
+) -> EventBuilder:
+    """
+    EventBuilder producing config objects, identical to dict_to_config_obj of the loaded dict.
+
+    Args:
+        frozen (bool): Whether the dataclass should be frozen.
+        slots (bool): Whether the dataclass uses __slots__ instead of a per-instance __dict__.
+        arrays (str, optional): Compact array mode ("array" or "numpy"), None keeps lists as tuples.
+        tables (bool): Whether lists of uniform mappings are stored as RecordTables.
+
+    Returns:
+        EventBuilder: The builder.
+    """
+
+    def convert(name: Any, value: Any, shared: Optional[SharedValues]) -> Any:
+        return value_to_config_attr(frozen, name, value, slots, arrays, tables, shared)
+
+    def mapping(name: Any, pairs: list[tuple[Any, Any]]) -> Any:
+        return build_config_obj(name, ((as_lowercase(key), value) for key, value in pairs), slots)
+
+    return EventBuilder(
+        convert, mapping, lambda name, items: tuple(items), plain_sequences=arrays is not None or tables
+    )
+
+
+def tree_event_builder() -> EventBuilder:
+    """
+    EventBuilder producing tree nodes, identical to tree_parser of the loaded dict.
+
+    Returns:
+        EventBuilder: The builder.
+    """
+
+    def convert(name: Any, value: Any, shared: Optional[SharedValues]) -> Any:
+        return tree_builder(*iterable_to_type_mapper(name, value), shared)
+
+    return EventBuilder(
+        convert,
+        lambda name, pairs: Structure(name, "dict", tuple(node for _, node in pairs)),
+        lambda name, items: Structure(name, "tuple", tuple(items)),
+        root=lambda name, pairs: Tree(name, tuple(node for _, node in pairs)),
+    )
@@ -26,3 +26,23 @@ class YamlSyntaxError(Exception):
 
     def __str__(self) -> str:
         return f"Syntax Error in your YAML File:\n {self.value}"
+
+
+class ConfigPathError(Exception):
+    def __init__(self, errors: dict[str, str], *args: Any) -> None:
+        super().__init__(args)
+        self.errors = errors
+
+    def __str__(self) -> str:
+        details = "\n".join(f" {path}: {reason}" for path, reason in self.errors.items())
+        return f"Invalid config paths:\n{details}"
+
+
+class IncludeError(Exception):
+    def __init__(self, chain: tuple[Path | str, ...], reason: str, *args: Any) -> None:
+        super().__init__(args)
+        self.chain = chain
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return f"Invalid include {' -> '.join(str(path) for path in self.chain)}: {self.reason}"
@@ -1,7 +1,15 @@
-from dataclasses import asdict, replace
-from typing import Any, TypeVar
+from copy import deepcopy
+from dataclasses import fields, is_dataclass, replace
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, TypeVar
 
 import heracless.utils as _heracless_utils
+from heracless.utils.class_cache import DERIVED_ATTR
+from heracless.utils.compact_arrays import resolve_array_mode
+from heracless.utils.exceptions import ConfigPathError
+from heracless.utils.record_table import RecordTable, RecordView, row_items, table_records
 
 _T = TypeVar("_T")
 
@@ -26,24 +34,420 @@ def mutate_config(config: _T, name: str, value: Any) -> _T:
         )
 
 
+# key of a value assigned to a trie node, empty path segments are invalid so it cannot collide
+_VALUE = ""
+
+
+def build_path_trie(overrides: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    build_path_trie: a function that groups dotted override paths into a trie
+    args:
+        overrides: a mapping of dotted paths to values
+    returns:
+        dict: a nested dict with one level per path segment, assigned values are stored under _VALUE
+    raises:
+        ConfigPathError: if a path is empty or is both assigned and descended into
+    """
+    trie: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    for path, value in overrides.items():
+        node = trie
+        segments = path.split(".")
+        if "" in segments:
+            errors[path] = "empty path segment"
+            continue
+        for segment in segments:
+            if _VALUE in node:
+                errors[path] = "a parent path is assigned as well"
+                break
+            node = node.setdefault(segment, {})
+        else:
+            if node:
+                errors[path] = "a child path is assigned as well"
+            node[_VALUE] = value
+    if errors:
+        raise ConfigPathError(errors)
+    return trie
+
+
+def _merge_trie(target: dict[str, Any], source: dict[str, Any]) -> bool:
+    """
+    merge the paths of source into target, False if a node would be assigned twice or assigned and descended into
+    """
+    if _VALUE in target or _VALUE in source:
+        return False
+    for segment, child in source.items():
+        existing = target.setdefault(segment, child)
+        if existing is not child and not _merge_trie(existing, child):
+            return False
+    return True
+
+
+def _normalize_indices(items: tuple[Any, ...], trie: dict[str, Any], prefix: str) -> dict[str, str]:
+    """
+    rewrite the valid tuple index segments of a trie level to their canonical form ("-1" -> "2" for length 3),
+    paths reaching the same item are merged, or reported if they assign it more than once
+    """
+    errors: dict[str, str] = {}
+    first: dict[str, str] = {}
+    for segment in list(trie):
+        if segment == _VALUE or not segment.lstrip("-").isdigit() or not -len(items) <= int(segment) < len(items):
+            continue  # reported by validate_path_trie
+        index = str(int(segment) % len(items))
+        child = trie.pop(segment)
+        if index not in trie:
+            trie[index], first[index] = child, segment
+        elif not _merge_trie(trie[index], child):
+            errors[f"{prefix}{segment}"] = f"refers to the same item as '{prefix}{first[index]}'"
+    return errors
+
+
+def validate_path_trie(config: Any, trie: dict[str, Any], prefix: str = "") -> dict[str, str]:
+    """
+    validate_path_trie: a function that checks every path of a trie against a config without building anything
+    tuple indices are normalized in place (negative indices count from the end), so "xs.-1" and "xs.2"
+    address the same item of a tuple of length 3 and are reported if both assign it
+    args:
+        config: a Config object (or a tuple inside of it)
+        trie: a trie built by build_path_trie
+        prefix: the dotted path of config, used in error messages
+    returns:
+        dict: invalid paths mapped to the reason, empty if every path is valid
+    """
+    errors: dict[str, str] = {}
+    if isinstance(config, tuple):
+        errors.update(_normalize_indices(config, trie, prefix))
+    for segment, child in trie.items():
+        if segment == _VALUE:
+            continue
+        path = f"{prefix}{segment}"
+        if is_dataclass(config) and not isinstance(config, type):
+            if segment not in {field.name for field in fields(config)}:
+                errors[path] = f"{type(config).__name__} has no field '{segment}'"
+                continue
+            value = getattr(config, segment)
+        elif isinstance(config, tuple):
+            if not segment.lstrip("-").isdigit() or not -len(config) <= int(segment) < len(config):
+                errors[path] = f"'{segment}' is not a valid index into a tuple of length {len(config)}"
+                continue
+            value = config[int(segment)]
+        else:
+            errors[path] = f"cannot descend into a value of type {type(config).__name__}"
+            continue
+        if set(child) != {_VALUE}:
+            errors.update(validate_path_trie(value, child, f"{path}."))
+    return errors
+
+
+def apply_path_trie(config: Any, trie: dict[str, Any]) -> Any:
+    """
+    apply_path_trie: a function that rebuilds every node touched by a trie exactly once
+    args:
+        config: a Config object (or a tuple inside of it)
+        trie: a validated trie built by build_path_trie
+    returns:
+        Any: the new node, untouched subtrees are shared with config
+    """
+
+    def new_value(old: Any, child: dict[str, Any]) -> Any:
+        return child[_VALUE] if _VALUE in child else apply_path_trie(old, child)
+
+    if isinstance(config, tuple):
+        items = list(config)
+        for segment, child in trie.items():
+            items[int(segment)] = new_value(items[int(segment)], child)
+        return tuple(items)
+    return replace(config, **{segment: new_value(getattr(config, segment), child) for segment, child in trie.items()})
+
+
+def mutate_many(config: _T, overrides: Mapping[str, Any]) -> _T:
+    """
+    mutate_many: a function that applies many dotted path overrides to a config at once
+    every path is validated before anything is built and every affected node is rebuilt exactly once,
+    tuples are indexed with integers (e.g. "product.0.price")
+    args:
+        config: a Config object representing the configuration
+        overrides: a mapping of dotted paths to new values
+    returns:
+        Config: a new Config object with all overrides applied, unchanged subtrees are shared
+    raises:
+        ConfigPathError: if any of the paths is invalid, no partial result is built
+    """
+    if not overrides:
+        return config
+    trie = build_path_trie(overrides)
+    errors = validate_path_trie(config, trie)
+    if errors:
+        raise ConfigPathError(errors)
+    return apply_path_trie(config, trie)  # type: ignore[no-any-return]
+
+
+def _derived(config: Any) -> Optional[dict[str, Any]]:
+    """
+    the cache of values derived from a frozen config instance (path index, memoized dict), created on first use
+    mutable configs and instances without room for it (slotted classes not created by heracless) have none
+    """
+    params = getattr(type(config), "__dataclass_params__", None)
+    if params is None or not params.frozen:
+        return None
+    try:
+        return object.__getattribute__(config, DERIVED_ATTR)  # type: ignore[no-any-return]
+    except AttributeError:
+        pass
+    derived: dict[str, Any] = {}
+    try:
+        object.__setattr__(config, DERIVED_ATTR, derived)
+    except AttributeError:
+        return None
+    return derived
+
+
+@lru_cache(maxsize=4096)
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """
+    compile_path: a function that turns a dotted path into a fast accessor, accessors are cached per path
+    args:
+        path: a dotted path, integer segments index into tuples (e.g. "product.0.price")
+    returns:
+        Callable: a function returning the value at path for a config, raises AttributeError or IndexError if missing
+    """
+    segments = path.split(".")
+    if not any(segment.lstrip("-").isdigit() for segment in segments):
+        return attrgetter(path)
+    steps = tuple(
+        (lambda node, index=int(segment): node[index]) if segment.lstrip("-").isdigit() else attrgetter(segment)
+        for segment in segments
+    )
+
+    def accessor(config: Any) -> Any:
+        for step in steps:
+            config = step(config)
+        return config
+
+    return accessor
+
+
+def build_path_index(config: Any) -> dict[str, Any]:
+    """
+    build_path_index: a function that flattens a config into a dict of dotted paths
+    args:
+        config: a Config object representing the configuration
+    returns:
+        dict: every dotted path (nested configs, tuple items and leaves) mapped to its value
+    """
+    index: dict[str, Any] = {}
+    stack: list[tuple[str, Any]] = [("", config)]
+    while stack:
+        prefix, node = stack.pop()
+        if is_dataclass(node) and not isinstance(node, type):
+            children: Iterable[tuple[Any, Any]] = ((field.name, getattr(node, field.name)) for field in fields(node))
+        elif isinstance(node, (tuple, RecordTable)):
+            children = enumerate(node)
+        elif isinstance(node, RecordView):
+            children = row_items(node)
+        else:
+            continue
+        for key, value in children:
+            path = f"{prefix}{key}"
+            index[path] = value
+            stack.append((f"{path}.", value))
+    return index
+
+
+def path_index(config: Any) -> Mapping[str, Any]:
+    """
+    path_index: a function that returns the dotted path index of a config, built on first use
+    the index is cached on frozen config instances, mutable configs are indexed on every call
+    args:
+        config: a Config object representing the configuration
+    returns:
+        Mapping: every dotted path mapped to its value, read-only because it is shared
+    """
+    derived = _derived(config)
+    index = derived.get("path_index") if derived is not None else None
+    if index is None:
+        index = MappingProxyType(build_path_index(config))
+        if derived is not None:
+            derived["path_index"] = index
+    return index
+
+
+def _index_path(index: Mapping[str, Any], path: str) -> str:
+    """
+    rewrite negative tuple index segments to the keys of the path index ("product.-1" -> "product.1"),
+    paths with an index out of range are returned unchanged (and are missing from the index)
+    """
+    if "-" not in path:
+        return path
+    segments = path.split(".")
+    for position, segment in enumerate(segments):
+        if not (segment.startswith("-") and segment[1:].isdigit()) or not position:
+            continue
+        items = index.get(".".join(segments[:position]))
+        if not isinstance(items, (tuple, RecordTable)) or not -len(items) <= int(segment) < len(items):
+            return path
+        segments[position] = str(int(segment) % len(items))
+    return ".".join(segments)
+
+
+def get(config: Any, path: str, default: Any = None) -> Any:
+    """
+    get: a function that looks up a value by dotted path
+    args:
+        config: a Config object representing the configuration
+        path: a dotted path, integer segments index into tuples, negative ones from the end (e.g. "product.-1.price")
+        default: the value returned if the path does not exist (default: None)
+    returns:
+        Any: the value at path or default
+    """
+    index = path_index(config)
+    return index.get(_index_path(index, path), default)
+
+
+def get_many(config: Any, paths: Iterable[str], default: Any = None) -> dict[str, Any]:
+    """
+    get_many: a function that looks up many values by dotted path at once
+    args:
+        config: a Config object representing the configuration
+        paths: dotted paths
+        default: the value used for paths that do not exist (default: None)
+    returns:
+        dict: every path mapped to its value or default
+    """
+    index = path_index(config)
+    return {path: index.get(_index_path(index, path), default) for path in paths}
+
+
+def _to_dict(value: Any) -> Any:
+    """
+    dataclasses.asdict, except that RecordTables become tuples of dicts like lists of mappings without tables
+    """
+    if isinstance(value, RecordTable):
+        return table_records(value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return {field.name: _to_dict(getattr(value, field.name)) for field in fields(value)}
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return type(value)(_to_dict(item) for item in value)
+    if isinstance(value, dict):
+        return {_to_dict(key): _to_dict(item) for key, item in value.items()}
+    return deepcopy(value)
+
+
 def as_dict(config: Any) -> dict[str, Any]:
     """
     as_dict: a function that converts a Config object to a dictionary
+    every call returns a new dict owned by the caller (consumers like logging.config.dictConfig change it),
+    use as_mapping for a zero-copy view or as_readonly_dict for a memoized read-only dict
     args:
         config: a Config object representing the configuration
     returns:
         dict: a dictionary representation of the Config object
     """
-    return asdict(config)
+    return _to_dict(config)  # type: ignore[no-any-return]
+
+
+def _to_readonly(value: Any) -> Any:
+    """
+    _to_dict with read-only containers: mappings become MappingProxyTypes, lists and tables tuples
+    """
+    if isinstance(value, RecordTable):
+        return tuple(MappingProxyType(row) for row in table_records(value))
+    if is_dataclass(value) and not isinstance(value, type):
+        return MappingProxyType({field.name: _to_readonly(getattr(value, field.name)) for field in fields(value)})
+    if isinstance(value, (tuple, list)):
+        return tuple(_to_readonly(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_to_readonly(item) for item in value)
+    if isinstance(value, dict):
+        return MappingProxyType({_to_readonly(key): _to_readonly(item) for key, item in value.items()})
+    return value
+
+
+def as_readonly_dict(config: Any) -> Mapping[str, Any]:
+    """
+    as_readonly_dict: a function that converts a Config object to a read-only dictionary, memoized on frozen configs
+    nested sections are read-only as well (MappingProxyType), lists are tuples, so the cached result can be shared
+    args:
+        config: a Config object representing the configuration
+    returns:
+        Mapping: a read-only dictionary representation of the Config object, the same object on every call
+    """
+    derived = _derived(config)
+    result: Optional[Mapping[str, Any]] = derived.get("as_readonly_dict") if derived is not None else None
+    if result is None:
+        result = _to_readonly(config)
+        if derived is not None:
+            derived["as_readonly_dict"] = result
+    return result
+
+
+def _as_view(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return ConfigMapping(value)
+    if isinstance(value, tuple) and any(is_dataclass(item) and not isinstance(item, type) for item in value):
+        return tuple(_as_view(item) for item in value)
+    return value
+
+
+class ConfigMapping(Mapping[str, Any]):
+    """
+    ConfigMapping: a read-only Mapping view of a Config object, nothing is copied
+    nested configs are returned as views as well, so sections can be passed to code expecting mappings
+    args:
+        config: a Config object representing the configuration
+    """
+
+    __slots__ = ("config",)
+
+    def __init__(self, config: Any) -> None:
+        self.config = config
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.config.__dataclass_fields__:
+            raise KeyError(key)
+        return _as_view(getattr(self.config, key))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.config.__dataclass_fields__)
+
+    def __len__(self) -> int:
+        return len(self.config.__dataclass_fields__)
+
+    def __repr__(self) -> str:
+        return f"ConfigMapping({self.config!r})"
+
+
+def as_mapping(config: Any) -> ConfigMapping:
+    """
+    as_mapping: a function that wraps a Config object in a read-only Mapping view without copying it
+    args:
+        config: a Config object representing the configuration
+    returns:
+        ConfigMapping: a Mapping over the fields of config
+    """
+    return ConfigMapping(config)
 
 
-def from_dict(config_dict: dict[Any, Any], frozen: bool = True) -> Any:
+def from_dict(
+    config_dict: dict[Any, Any],
+    frozen: bool = True,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    lazy: bool = False,
+) -> Any:
     """
     from_dict: a function that creates a Config object from a dictionary
     args:
         config_dict: a dictionary representing the configuration
         frozen: a boolean indicating whether the Config object should be frozen (default: True)
+        slots: a boolean indicating whether the config classes use __slots__ (default: False)
+        arrays: store homogeneous scalar lists as "array", "numpy" or "auto" arrays (default: None, tuples)
+        tables: store lists of uniform mappings as columnar RecordTables (default: False)
+        lazy: build top level sections on first attribute access (default: False)
     returns:
         Config: a Config object created from the dictionary
     """
-    return _heracless_utils.cfg_tree.tree_to_config_obj(frozen, _heracless_utils.cfg_tree.tree_parser(config_dict))
+    return _heracless_utils.cfg_tree.dict_to_config_obj(
+        frozen, config_dict, slots=slots, arrays=resolve_array_mode(arrays), tables=tables, lazy=lazy
+    )
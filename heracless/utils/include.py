@@ -0,0 +1,248 @@
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from io import StringIO
+from pathlib import Path
+from typing import IO, Any, Callable, Optional
+
+import yaml
+
+from heracless.utils.exceptions import IncludeError
+
+"""
+assembling one config from several YAML files:
+`key: !include other.yaml` is replaced by the content of other.yaml and the files listed under a top level
+`include:` key are merged into the including mapping (its own keys win, like YAML merge keys).
+Paths are relative to the including file. All referenced files are parsed concurrently in a thread pool,
+every file is parsed once per load (keyed by path and mtime), cycles are reported with the include chain.
+"""
+
+INCLUDE_TAG: str = "!include"
+INCLUDE_KEY: str = "include"
+
+# placeholder the loaders construct for !include tags, replaced by the content of the file
+Include = namedtuple("Include", ("path",))
+# (container, key) of an Include placeholder
+IncludeSite = namedtuple("IncludeSite", ("container", "key", "include"))
+
+_INCLUDE_PATTERN = re.compile(r"(?:^|[\s\[{,])!include\b")
+
+
+def _construct_include(loader: yaml.Loader, node: yaml.Node) -> Include:
+    return Include(loader.construct_scalar(node))  # type: ignore[arg-type]
+
+
+class IncludeLoader(yaml.FullLoader):
+    """
+    PyYAML's full loader with !include tags.
+    """
+
+
+IncludeLoader.add_constructor(INCLUDE_TAG, _construct_include)
+
+if yaml.__with_libyaml__:
+
+    class CIncludeLoader(yaml.CFullLoader):
+        """
+        PyYAML's libyaml based full loader with !include tags.
+        """
+
+    CIncludeLoader.add_constructor(INCLUDE_TAG, _construct_include)
+
+
+def include_loader(yaml_load_func: Callable[[IO[str]], Any]) -> Callable[[IO[str]], Any]:
+    """
+    Wrap a loader backend so it understands !include tags.
+    Documents without the tag are loaded by the backend itself (e.g. the Rust parser, which releases the GIL),
+    documents with it by PyYAML. The wrapper is a partial of load_include_tags, so snapshot keys (see loader_id)
+    tell include loads and plain loads of the same file apart.
+
+    Args:
+        yaml_load_func (Callable[[IO[str]], Any]): The loader backend, see heracless.loaders.
+
+    Returns:
+        Callable[[IO[str]], Any]: The wrapped loader.
+    """
+    return partial(load_include_tags, yaml_load_func)
+
+
+def load_include_tags(yaml_load_func: Callable[[IO[str]], Any], stream: IO[str]) -> Any:
+    """
+    Load a document with !include tags as Include placeholders.
+
+    Args:
+        yaml_load_func (Callable[[IO[str]], Any]): The loader backend for documents without the tag.
+        stream (IO[str]): Text stream containing the YAML document.
+
+    Returns:
+        Any: Parsed YAML content.
+    """
+    content = stream.read()
+    if not _INCLUDE_PATTERN.search(content):
+        return yaml_load_func(StringIO(content))
+    loader = CIncludeLoader if yaml.__with_libyaml__ else IncludeLoader
+    return yaml.load(StringIO(content), Loader=loader)
+
+
+def include_sites(value: Any) -> list[IncludeSite]:
+    """
+    Find the !include placeholders in a parsed document.
+
+    Args:
+        value (Any): The parsed document.
+
+    Returns:
+        list[IncludeSite]: Where the placeholders are.
+    """
+    sites: list[IncludeSite] = []
+    if not isinstance(value, (dict, list)):
+        return sites
+    stack, visited = [value], {id(value)}
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, item in items:
+            if type(item) is Include:
+                sites.append(IncludeSite(container, key, item))
+            elif isinstance(item, (dict, list)) and id(item) not in visited:
+                visited.add(id(item))
+                stack.append(item)
+    return sites
+
+
+def listed_includes(value: Any, path: Path) -> tuple[str, ...]:
+    """
+    The files listed under the top level include key of a parsed document.
+
+    Args:
+        value (Any): The parsed document.
+        path (Path): The file, used in errors.
+
+    Returns:
+        tuple[str, ...]: The (relative) paths in merge order.
+
+    Raises:
+        IncludeError: If the include key is neither a path nor a list of paths.
+    """
+    if not isinstance(value, dict) or INCLUDE_KEY not in value:
+        return ()
+    listed = value[INCLUDE_KEY]
+    paths = [listed] if isinstance(listed, str) else listed
+    if not isinstance(paths, list) or not all(isinstance(item, str) for item in paths):
+        raise IncludeError((path,), f"'{INCLUDE_KEY}' must be a path or a list of paths")
+    return tuple(paths)
+
+
+class _Fragment:
+    """
+    a parsed file and the files it references
+    """
+
+    __slots__ = ("value", "sites", "listed")
+
+    def __init__(self, value: Any, path: Path) -> None:
+        self.value = value
+        self.sites = include_sites(value)
+        self.listed = listed_includes(value, path)
+
+    def references(self) -> list[str]:
+        return [site.include.path for site in self.sites] + list(self.listed)
+
+
+def _resolve(base: Path, reference: str) -> Path:
+    return Path(os.path.realpath(base.parent / os.path.expanduser(reference)))
+
+
+def load_with_includes(cfg_dir: Path, load: Callable[[Path], Any], workers: Optional[int] = None) -> Any:
+    """
+    Load a YAML file and everything it includes, the referenced files are parsed concurrently.
+
+    Args:
+        cfg_dir (Path): The root YAML file.
+        load (Callable[[Path], Any]): Parses one file (with include_loader), None for an empty file.
+        workers (int, optional): Threads parsing included files, None uses the ThreadPoolExecutor default.
+
+    Returns:
+        Any: The assembled document, None if the root file is empty.
+
+    Raises:
+        IncludeError: If an included file does not exist, an include cycle is found
+            or a file listed under the include key is not a mapping.
+    """
+    root = Path(os.path.realpath(cfg_dir))
+    fragments = {root: _Fragment(load(root), root)}
+    if not fragments[root].references():
+        return fragments[root].value
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="heracless-include") as pool:
+        _load_referenced(root, fragments, load, pool)
+    return _Assembler(fragments).assemble(root, ())
+
+
+def _load_referenced(
+    root: Path, fragments: dict[Path, "_Fragment"], load: Callable[[Path], Any], pool: ThreadPoolExecutor
+) -> None:
+    """
+    parse every file reachable from root, a file is submitted as soon as its includer is parsed
+    """
+    # a file is parsed once per load, keyed by path and mtime
+    parsed: dict[tuple[Path, int], Future] = {}
+    pending: dict[Future, Path] = {}
+
+    def submit(includer: Path, path: Path) -> None:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            raise IncludeError((includer, path), "file not found") from None
+        key = (path, mtime)
+        if key not in parsed:
+            parsed[key] = future = pool.submit(lambda: _Fragment(load(path), path))
+            pending[future] = path
+
+    for reference in fragments[root].references():
+        submit(root, _resolve(root, reference))
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            path = pending.pop(future)
+            fragments[path] = fragment = future.result()
+            for reference in fragment.references():
+                target = _resolve(path, reference)
+                if target not in fragments and target != root:
+                    submit(path, target)
+
+
+class _Assembler:
+    """
+    replaces the includes of the parsed files by the included content, every file is assembled once
+    """
+
+    def __init__(self, fragments: dict[Path, _Fragment]) -> None:
+        self.fragments = fragments
+        self.assembled: dict[Path, Any] = {}
+
+    def assemble(self, path: Path, chain: tuple[Path, ...]) -> Any:
+        if path in chain:
+            raise IncludeError(chain[chain.index(path) :] + (path,), "include cycle")
+        if path in self.assembled:
+            return self.assembled[path]
+        chain = chain + (path,)
+        fragment = self.fragments[path]
+        for site in fragment.sites:
+            site.container[site.key] = self.assemble(_resolve(path, site.include.path), chain)
+        value = fragment.value
+        if fragment.listed:
+            merged: dict[Any, Any] = {}
+            for reference in fragment.listed:
+                target = _resolve(path, reference)
+                included = self.assemble(target, chain)
+                if included is None:
+                    continue
+                if not isinstance(included, dict):
+                    raise IncludeError((path, target), "a file listed under the include key must be a mapping")
+                merged.update(included)
+            merged.update((key, item) for key, item in value.items() if key != INCLUDE_KEY)
+            value = merged
+        self.assembled[path] = value
+        return value
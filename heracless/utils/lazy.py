@@ -0,0 +1,117 @@
+import threading
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable
+
+"""
+lazy materialization of config sections:
+the sections of a lazy config are LazySection placeholders holding the raw parsed subtree,
+the first attribute access builds the section and replaces the placeholder on the config instance
+"""
+
+_MATERIALIZE_LOCK = threading.Lock()
+# marks a LazySection that has not been built yet
+_UNSET: Any = object()
+
+
+class LazySection:
+    """
+    Placeholder for a config section that is built on first access.
+
+    Args:
+        build (Callable[..., Any]): Builds the section value from args (e.g. value_to_config_attr).
+        args (Any): Arguments of build, including the raw parsed subtree.
+    """
+
+    __slots__ = ("_build", "_args", "_value")
+
+    def __init__(self, build: Callable[..., Any], *args: Any) -> None:
+        self._build = build
+        self._args = args
+        self._value = _UNSET
+
+    def materialize(self) -> Any:
+        """
+        Build the section once, concurrent callers all get the same object.
+
+        Returns:
+            Any: The section value.
+        """
+        value = self._value
+        if value is _UNSET:
+            built = self._build(*self._args)
+            with _MATERIALIZE_LOCK:
+                if self._value is _UNSET:
+                    self._value = built
+                    self._args = ()  # the raw subtree is not needed anymore
+                value = self._value
+        return value
+
+    def __repr__(self) -> str:
+        return "LazySection(materialized)" if self._value is not _UNSET else "LazySection(pending)"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        if self._value is not _UNSET:
+            return _materialized, (self._value,)
+        return LazySection, (self._build, *self._args)
+
+
+def _materialized(value: Any) -> Any:
+    """
+    unpickles a LazySection that was built before pickling as its value
+    """
+    return value
+
+
+def lazy_getattribute(self: Any, name: str) -> Any:
+    """
+    __getattribute__ of lazy config classes: builds LazySection fields on first access
+    and stores the result in the field of the (frozen) instance, in __dict__ or in the slot of slotted classes.
+    Every access still runs this function, later accesses only add a type check to the attribute read.
+
+    Args:
+        self (Any): The config object.
+        name (str): The attribute name.
+
+    Returns:
+        Any: The attribute value.
+    """
+    value = object.__getattribute__(self, name)
+    if type(value) is LazySection:
+        value = value.materialize()
+        object.__setattr__(self, name, value)
+    return value
+
+
+def lazy_eq(self: Any, other: Any) -> Any:
+    """
+    __eq__ of lazy config classes: equal to any config with the same class name, fields and values,
+    so lazy and eagerly built configs compare equal.
+
+    Args:
+        self (Any): The config object.
+        other (Any): The object to compare with.
+
+    Returns:
+        Any: True or False, NotImplemented for non-config objects.
+    """
+    if not is_dataclass(other) or isinstance(other, type) or type(other).__name__ != type(self).__name__:
+        return NotImplemented
+    names = tuple(field.name for field in fields(self))
+    if names != tuple(field.name for field in fields(other)):
+        return NotImplemented
+    return all(getattr(self, name) == getattr(other, name) for name in names)
+
+
+def is_pending(config: Any, name: str) -> bool:
+    """
+    Check whether a section of a lazy config has not been built yet, without building it.
+
+    Args:
+        config (Any): The config object.
+        name (str): The field name.
+
+    Returns:
+        bool: True if the field still holds an unbuilt LazySection.
+    """
+    value = object.__getattribute__(config, name)
+    return type(value) is LazySection and value._value is _UNSET
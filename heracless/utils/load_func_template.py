@@ -1,14 +1,34 @@
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from heracless import load_config as _load_config
+from heracless.utils.compiler import load_compiled as _load_compiled
+from heracless.utils.memo import invalidate as invalidate
+from heracless.utils.memo import memoized_fight as _memoized_load_config
 
 CONFIG_YAML_PATH: Optional[Path] = None
 # CONFIG_YAML_PATH is a global variable that sets the path of your yaml config file
 # Edit this to your config file path
+COMPILED_CONFIG_PATH: Optional[Path] = None
+# COMPILED_CONFIG_PATH optionally points to a module generated with `heracless config.yaml --compile config.py`
+# it is used instead of parsing the yaml file as long as it is up to date
 
 
-def load_config(config_path: Optional[Path | str] = None, frozen: bool = True, stub_dump: bool = True) -> Any:
+def load_config(
+    config_path: Optional[Path | str] = None,
+    frozen: bool = True,
+    stub_dump: bool = True,
+    loader: Optional[str] = None,
+    compiled_path: Optional[Path | str] = None,
+    cache: bool = True,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    lazy: bool = False,
+    stream: bool = False,
+    select: Optional[Iterable[str]] = None,
+    includes: bool = False,
+) -> Any:
     """
     Load the configuration from the specified directory and return a Config object.
 
@@ -16,6 +36,22 @@ def load_config(config_path: Optional[Path | str] = None, frozen: bool = True, s
         config_path (Path|str, optional): The path to the configuration file. Defaults to CONFIG_YAML_PATH.
         frozen (bool, optional): Whether the configuration should be frozen. Defaults to True.
         stub_dump (bool, optional): Whether to dump a stub file for typing support or not. Defaults to True.
+        loader (str, optional): YAML loader backend ("rust", "libyaml", "python"). Defaults to the fastest available.
+        compiled_path (Path|str, optional): Compiled config module to use while it matches the yaml file.
+            Defaults to COMPILED_CONFIG_PATH.
+        cache (bool, optional): Return the memoized config while the yaml file is unchanged (mtime, inode, size).
+            Use invalidate() to drop memoized configs. Defaults to True.
+        slots (bool, optional): Generate config classes with __slots__ (smaller instances). Defaults to False.
+        arrays (str, optional): Store homogeneous int/float/bool lists as compact arrays ("array", "numpy", "auto").
+            Defaults to None (tuples).
+        tables (bool, optional): Store lists of uniform mappings as columnar RecordTables. Defaults to False.
+        lazy (bool, optional): Build top level sections on first access instead of at load time. Defaults to False.
+        stream (bool, optional): Build the config from the YAML event stream instead of a dict of the whole file,
+            for very large files. Defaults to False.
+        select (Iterable[str], optional): Dotted paths of the sections to load, e.g. ["database", "cache.redis"],
+            all other sections are skipped while parsing. Defaults to None (everything).
+        includes (bool, optional): Resolve `!include file.yaml` tags and top level `include:` lists relative to
+            the including file, included files are parsed concurrently. Defaults to False.
 
     Returns:
         Any: The loaded configuration object.
@@ -31,5 +67,13 @@ def load_config(config_path: Optional[Path | str] = None, frozen: bool = True, s
         config_path = CONFIG_YAML_PATH
     if config_path is None:
         raise ValueError("config_path must be specified either as argument or via CONFIG_YAML_PATH")
+    if compiled_path is None:
+        compiled_path = COMPILED_CONFIG_PATH
+    if compiled_path is not None and not slots and arrays is None and not tables and select is None and not includes:
+        compiled = _load_compiled(compiled_path, config_path, frozen=frozen)
+        if compiled is not None:
+            return compiled
     file_path: Optional[Path] = Path(__file__).resolve() if stub_dump else None
-    return _load_config(config_path, file_path, frozen=frozen)
+    load = _memoized_load_config if cache else _load_config
+    options: dict[str, Any] = {"slots": slots, "arrays": arrays, "tables": tables, "lazy": lazy, "stream": stream}
+    return load(config_path, file_path, frozen=frozen, loader=loader, select=select, includes=includes, **options)
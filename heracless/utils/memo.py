@@ -0,0 +1,136 @@
+import os
+import threading
+from collections import namedtuple
+from pathlib import Path
+from typing import Any, Iterable, Optional, TypeAlias
+
+from heracless.fight import fight
+
+"""
+process level memo for loaded configs:
+configs are keyed by resolved path, stub path, frozen flag, loader and build options and are revalidated
+with a single os.stat call,
+so repeated loads of an unchanged file return the same instance without reading or parsing it again
+"""
+
+FileSignature = namedtuple("FileSignature", ("mtime_ns", "inode", "size"))
+MemoEntry = namedtuple("MemoEntry", ("signature", "config"))
+
+MemoKey: TypeAlias = tuple[
+    Path, Optional[Path], bool, Optional[str], bool, Optional[str], bool, bool, Optional[tuple[str, ...]]
+]
+
+_MEMO: dict[MemoKey, MemoEntry] = {}
+# one lock per key for the lifetime of its entry, so reloads after a file change are single flight too,
+# dropped together with the entry by invalidate
+_LOCKS: dict[MemoKey, threading.Lock] = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def file_signature(cfg_dir: Path) -> FileSignature:
+    """
+    Stat based signature of a file, changes whenever the file is rewritten or replaced.
+
+    Args:
+        cfg_dir (Path): Path to the file.
+
+    Returns:
+        FileSignature: Modification time in ns, inode and size of the file.
+
+    Raises:
+        OSError: If the file cannot be accessed.
+    """
+    stat = os.stat(cfg_dir)
+    return FileSignature(stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+
+def _key_lock(key: MemoKey) -> threading.Lock:
+    with _LOCKS_GUARD:
+        return _LOCKS.setdefault(key, threading.Lock())
+
+
+def memoized_fight(
+    cfg_dir: Path | str,
+    dump_dir: Optional[Path],
+    frozen: bool,
+    loader: Optional[str] = None,
+    slots: bool = False,
+    arrays: Optional[str] = None,
+    tables: bool = False,
+    lazy: bool = False,
+    stream: bool = False,
+    select: Optional[Iterable[str]] = None,
+    includes: bool = False,
+) -> Optional[Any]:
+    """
+    Memoized version of fight.
+    Only frozen configs are shared, mutable configs are loaded fresh for every call.
+    Concurrent first loads of the same key parse the file only once, the others wait for the result.
+    Stubs are only dumped when the file is actually parsed, a memo hit implies an unchanged schema
+    (the stub path is part of the key, so loading with another dump_dir parses and dumps again).
+
+    Args:
+        cfg_dir (Path|str): Path to the YAML configuration file.
+        dump_dir (Path, optional): Stub file to dump the config types into, None to skip dumping.
+        frozen (bool): Whether the config object is frozen.
+        loader (str, optional): YAML loader backend, None selects the fastest available one.
+        slots (bool): Whether the config classes use __slots__ instead of a per-instance __dict__.
+        arrays (str, optional): Compact array mode for homogeneous scalar lists, None keeps tuples.
+        tables (bool): Whether lists of uniform mappings are stored as RecordTables.
+        lazy (bool): Whether top level sections are only built on first access.
+        stream (bool): Whether the config is built from the YAML event stream (same result, not part of the key).
+        select (Iterable[str], optional): Dotted paths of the subtrees to load, None loads everything.
+        includes (bool): Whether !include tags and include keys are resolved. Such configs are not memoized,
+            the included files can change without the root file changing.
+
+    Returns:
+        Any: The (possibly shared) configuration object or None if the config is empty.
+    """
+    paths = ((select,) if isinstance(select, str) else tuple(select)) if select is not None else None
+    options: dict[str, Any] = {
+        "slots": slots,
+        "arrays": arrays,
+        "tables": tables,
+        "lazy": lazy,
+        "stream": stream,
+        "select": paths,
+    }
+    if not frozen or includes:
+        return fight(cfg_dir, dump_dir, frozen, loader, includes=includes, **options)
+    cfg_path = Path(cfg_dir).resolve()
+    try:
+        signature = file_signature(cfg_path)
+    except OSError:  # fight raises heracless' usual errors
+        return fight(cfg_path, dump_dir, frozen, loader, **options)
+    stub_path = Path(dump_dir).resolve() if dump_dir is not None else None
+    key = (cfg_path, stub_path, frozen, loader, slots, arrays, tables, lazy, paths)
+    entry = _MEMO.get(key)
+    if entry is not None and entry.signature == signature:
+        return entry.config
+    with _key_lock(key):
+        # the file may have been loaded by another thread while waiting for the lock
+        signature = file_signature(cfg_path)
+        entry = _MEMO.get(key)
+        if entry is not None and entry.signature == signature:
+            return entry.config
+        config = fight(cfg_path, dump_dir, frozen, loader, **options)
+        _MEMO[key] = MemoEntry(signature, config)
+        return config
+
+
+def invalidate(cfg_dir: Optional[Path | str] = None) -> None:
+    """
+    Drop memoized configs and their locks, forcing the next load to read the file again.
+
+    Args:
+        cfg_dir (Path|str, optional): Only drop configs loaded from this file, drops everything if None.
+    """
+    with _LOCKS_GUARD:
+        if cfg_dir is None:
+            _MEMO.clear()
+            _LOCKS.clear()
+            return
+        cfg_path = Path(cfg_dir).resolve()
+        for key in [key for key in {*_MEMO, *_LOCKS} if key[0] == cfg_path]:
+            _MEMO.pop(key, None)
+            _LOCKS.pop(key, None)
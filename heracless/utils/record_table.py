@@ -0,0 +1,260 @@
+from collections.abc import Sequence as SequenceABC
+from dataclasses import FrozenInstanceError
+from datetime import date, datetime
+from typing import Any, Generic, Iterator, Optional, Sequence, TypeVar, Union, cast, overload
+
+from heracless.utils.compact_arrays import array_annotation, compact_array
+
+"""
+columnar storage of uniform mapping lists:
+a list of mappings with identical keys and scalar values becomes one RecordTable holding a compact column per field,
+rows are lightweight read-only views into the columns.
+Tables and rows have no public methods, so every field name is available as an attribute,
+use the module functions (table_fields, table_column, table_records, row_items) for everything else.
+"""
+
+# scalar types a column may hold, all values of a column have exactly the same type
+COLUMN_TYPES: tuple[type, ...] = (int, float, bool, str, date, datetime)
+RECORD_TABLE_IMPORT: str = "from heracless.utils.record_table import RecordTable\n"
+
+_Row = TypeVar("_Row")
+
+
+def uniform_columns(rows: Sequence[Any]) -> Optional[tuple[tuple[Any, ...], tuple[list[Any], ...]]]:
+    """
+    Split a list of uniform mappings into its keys and columns.
+
+    Args:
+        rows (Sequence[Any]): The list items.
+
+    Returns:
+        tuple: (keys, columns), or None if the items are not mappings with the same keys (in the same order)
+        and one scalar type per column.
+    """
+    if not rows or not all(isinstance(row, dict) for row in rows):
+        return None
+    keys = tuple(rows[0])
+    if not keys or any(tuple(row) != keys for row in rows):
+        return None
+    columns = tuple([row[key] for row in rows] for key in keys)
+    for column in columns:
+        column_type = type(column[0])
+        if column_type not in COLUMN_TYPES or any(type(value) is not column_type for value in column):
+            return None
+    return keys, columns
+
+
+def compact_column(values: list[Any], mode: str) -> Any:
+    """
+    Store a column compactly: numeric columns become arrays (see compact_array), all others tuples.
+
+    Args:
+        values (list[Any]): The column values.
+        mode (str): Compact array mode ("array" or "numpy").
+
+    Returns:
+        Any: The column.
+    """
+    column = compact_array(values, mode)
+    return tuple(values) if column is None else column
+
+
+def column_annotation(values: list[Any], mode: str) -> str:
+    """
+    Stub annotation of the column compact_column would create.
+
+    Args:
+        values (list[Any]): The column values.
+        mode (str): Compact array mode ("array" or "numpy").
+
+    Returns:
+        str: The annotation.
+    """
+    return array_annotation(values, mode) or f"tuple[{type(values[0]).__name__}]"
+
+
+class RecordTable(Generic[_Row]):
+    """
+    Read-only columnar table of uniform records.
+    Supports len, iteration and indexing (rows are RecordView objects, slices are tables),
+    columns are attributes (table.price).
+    The row type parameter is only used by generated stubs, rows are typed as their dataclass there.
+
+    Args:
+        row_name (str): Class name of the rows, used in reprs.
+        fields (tuple[str, ...]): The field names.
+        columns (tuple[Any, ...]): One column per field, all of the same length.
+
+    Raises:
+        ValueError: If the number of columns or their lengths do not match.
+    """
+
+    __slots__ = ("_row_name", "_fields", "_columns", "_positions", "_length")
+
+    def __init__(self, row_name: str, fields: tuple[str, ...], columns: tuple[Any, ...]) -> None:
+        lengths = {len(column) for column in columns}
+        if len(fields) != len(columns) or len(lengths) > 1:
+            raise ValueError("RecordTable needs exactly one column per field and columns of equal length")
+        self._row_name = row_name
+        self._fields = tuple(fields)
+        self._columns = tuple(columns)
+        self._positions = {field: position for position, field in enumerate(self._fields)}
+        self._length = lengths.pop() if lengths else 0
+
+    def __getattr__(self, name: str) -> Any:
+        if name in RecordTable.__slots__:  # not initialized (yet)
+            raise AttributeError(name)
+        position = self._positions.get(name)
+        if position is None:
+            raise AttributeError(f"'RecordTable' of {self._row_name} has no column '{name}'")
+        return self._columns[position]
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> _Row: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "RecordTable[_Row]": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[_Row, "RecordTable[_Row]"]:
+        if isinstance(index, slice):
+            return RecordTable(self._row_name, self._fields, tuple(column[index] for column in self._columns))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("RecordTable index out of range")
+        return cast(_Row, RecordView(self, index))
+
+    def __iter__(self) -> Iterator[_Row]:
+        return (cast(_Row, RecordView(self, row)) for row in range(self._length))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RecordTable):
+            return NotImplemented
+        return self._fields == other._fields and all(
+            tuple(column) == tuple(other_column) for column, other_column in zip(self._columns, other._columns)
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._fields, tuple(tuple(column) for column in self._columns)))
+
+    def __repr__(self) -> str:
+        return f"RecordTable({self._row_name}, fields={self._fields}, rows={self._length})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return RecordTable, (self._row_name, self._fields, self._columns)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "RecordTable[_Row]":
+        return self  # read-only, exactly like a tuple of frozen configs
+
+
+SequenceABC.register(RecordTable)
+
+
+class RecordView:
+    """
+    Read-only view of one row of a RecordTable, the fields are attributes like on config objects.
+
+    Args:
+        table (RecordTable): The table.
+        row (int): The row index.
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: RecordTable, row: int) -> None:
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_row", row)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in RecordView.__slots__:  # not initialized (yet)
+            raise AttributeError(name)
+        table = self._table
+        position = table._positions.get(name)
+        if position is None:
+            raise AttributeError(f"'{table._row_name}' has no field '{name}'")
+        return table._columns[position][self._row]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RecordView):
+            return NotImplemented
+        return row_items(self) == row_items(other)
+
+    def __hash__(self) -> int:
+        return hash(row_items(self))
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{field}={value!r}" for field, value in row_items(self))
+        return f"{self._table._row_name}({values})"
+
+    def __dir__(self) -> list[str]:
+        return list(self._table._fields)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return RecordView, (self._table, self._row)
+
+
+def table_fields(table: RecordTable) -> tuple[str, ...]:
+    """
+    The field names of a table.
+
+    Args:
+        table (RecordTable): The table.
+
+    Returns:
+        tuple[str, ...]: The field names in YAML order.
+    """
+    return table._fields
+
+
+def table_column(table: RecordTable, name: str) -> Any:
+    """
+    A column by field name, also for fields shadowed by attributes (e.g. a field named "__class__").
+
+    Args:
+        table (RecordTable): The table.
+        name (str): The field name.
+
+    Returns:
+        Any: The column, an array or a tuple.
+
+    Raises:
+        KeyError: If the table has no such field.
+    """
+    return table._columns[table._positions[name]]
+
+
+def row_items(row: RecordView) -> tuple[tuple[str, Any], ...]:
+    """
+    The (field name, value) pairs of a row.
+
+    Args:
+        row (RecordView): The row.
+
+    Returns:
+        tuple[tuple[str, Any], ...]: The fields and values in YAML order.
+    """
+    table = row._table
+    return tuple((field, column[row._row]) for field, column in zip(table._fields, table._columns))
+
+
+def table_records(table: RecordTable) -> tuple[dict[str, Any], ...]:
+    """
+    Convert a table back into a tuple of dicts, one per row, array values become python scalars.
+
+    Args:
+        table (RecordTable): The table.
+
+    Returns:
+        tuple[dict[str, Any], ...]: The rows as dicts.
+    """
+    columns = tuple(column.tolist() if hasattr(column, "tolist") else column for column in table._columns)
+    return tuple(dict(zip(table._fields, values)) for values in zip(*columns))
@@ -0,0 +1,184 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from functools import partial
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+"""
+persistent snapshot cache for parsed YAML configs:
+the parsed value graph is pickled into an opt-in cache directory, keyed by the hash of the YAML content,
+the loader, the heracless version and the python version, so unchanged configs are never parsed twice across processes
+"""
+
+CACHE_DIR_ENV: str = "HERACLESS_CACHE_DIR"
+CACHE_MAX_BYTES_ENV: str = "HERACLESS_CACHE_MAX_BYTES"
+DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+SNAPSHOT_SUFFIX: str = ".snapshot"
+
+try:
+    HERACLESS_VERSION = version("heracless")
+except PackageNotFoundError:
+    HERACLESS_VERSION = "unknown"
+
+
+def default_cache_dir() -> Path:
+    """
+    Platform cache location for snapshots ($XDG_CACHE_HOME/heracless or ~/.cache/heracless).
+
+    Returns:
+        Path: The default cache directory.
+    """
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "heracless"
+
+
+def resolve_cache_dir(cache_dir: Optional[Path | str] = None) -> Optional[Path]:
+    """
+    Resolve the snapshot cache directory, the cache is disabled unless a directory is given
+    or HERACLESS_CACHE_DIR is set ("default" selects default_cache_dir()).
+
+    Args:
+        cache_dir (Path|str, optional): Explicit cache directory.
+
+    Returns:
+        Path: The cache directory or None if snapshot caching is disabled.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV) or None
+    if cache_dir is None:
+        return None
+    if str(cache_dir) == "default":
+        return default_cache_dir()
+    return Path(cache_dir).expanduser()
+
+
+def loader_id(load: Callable[..., Any]) -> str:
+    """
+    Identifier of a YAML load function, partials (e.g. include_loader) include their arguments.
+
+    Args:
+        load (Callable[..., Any]): The load function.
+
+    Returns:
+        str: Module and qualified name of the function.
+    """
+    if isinstance(load, partial):
+        args = ", ".join(loader_id(arg) if callable(arg) else repr(arg) for arg in load.args)
+        return f"{loader_id(load.func)}({args})"
+    return f"{getattr(load, '__module__', None)}.{getattr(load, '__qualname__', type(load).__qualname__)}"
+
+
+def snapshot_key(content: bytes, loader: str = "") -> str:
+    """
+    Cache key of a YAML document.
+    Loaders may parse the same content differently, so snapshots of one loader are never served to another.
+
+    Args:
+        content (bytes): Raw YAML content.
+        loader (str): Identifier of the loader parsing the content, see loader_id.
+
+    Returns:
+        str: Hex digest over the content, loader, heracless version, python version and pickle protocol.
+    """
+    digest = hashlib.blake2b(content, digest_size=20)
+    digest.update(f"\0{loader}\0{HERACLESS_VERSION}\0{sys.version_info[:2]}\0{pickle.HIGHEST_PROTOCOL}".encode())
+    return digest.hexdigest()
+
+
+def read_snapshot(cache_dir: Path, key: str) -> tuple[bool, Any]:
+    """
+    Read a snapshot, unreadable or corrupt snapshots count as misses.
+
+    Args:
+        cache_dir (Path): The cache directory.
+        key (str): The snapshot key.
+
+    Returns:
+        tuple[bool, Any]: (True, parsed value) on a hit, (False, None) on a miss.
+    """
+    path = cache_dir / f"{key}{SNAPSHOT_SUFFIX}"
+    try:
+        with open(path, "rb") as snapshot:
+            value = pickle.load(snapshot)
+    except FileNotFoundError:
+        return False, None
+    except Exception:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        return False, None
+    try:
+        os.utime(path)  # recently used snapshots survive eviction
+    except OSError:
+        pass
+    return True, value
+
+
+def write_snapshot(cache_dir: Path, key: str, value: Any, max_bytes: Optional[int] = None) -> None:
+    """
+    Atomically write a snapshot and evict old ones, failures never break loading.
+    Writers use private temp files and os.replace, so concurrent writers of the same key are safe.
+
+    Args:
+        cache_dir (Path): The cache directory.
+        key (str): The snapshot key.
+        value (Any): The parsed YAML value.
+        max_bytes (int, optional): Size bound of the cache, defaults to HERACLESS_CACHE_MAX_BYTES or 256 MiB.
+    """
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                pickle.dump(value, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, cache_dir / f"{key}{SNAPSHOT_SUFFIX}")
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        return
+    if max_bytes is None:
+        max_bytes = int(os.environ.get(CACHE_MAX_BYTES_ENV) or DEFAULT_MAX_BYTES)
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir: Path, max_bytes: int) -> None:
+    """
+    Remove least recently used snapshots until the cache fits into max_bytes.
+
+    Args:
+        cache_dir (Path): The cache directory.
+        max_bytes (int): Size bound of the cache.
+    """
+    entries = []
+    for path in cache_dir.glob(f"*{SNAPSHOT_SUFFIX}"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+def clear_snapshots(cache_dir: Optional[Path | str] = None) -> None:
+    """
+    Remove all snapshots from the cache directory.
+
+    Args:
+        cache_dir (Path|str, optional): The cache directory, defaults to the configured one.
+    """
+    resolved = resolve_cache_dir(cache_dir)
+    if resolved is not None and resolved.exists():
+        evict(resolved, 0)
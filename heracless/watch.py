@@ -0,0 +1,208 @@
+"""
+Hot reloading of heracless configs
+
+A ConfigHandle holds the current config object and optionally a background thread
+that polls the config file, parses changed files and swaps the new config in.
+Unchanged subtrees are shared between the old and the new config (see reload_config).
+Readers only read an attribute and never take a lock.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from heracless.fight import LoadedConfig, reload_config
+
+WatchSignature = namedtuple("WatchSignature", ("target", "mtime_ns", "inode", "size"))
+
+DEFAULT_INTERVAL: float = 1.0
+DEFAULT_DEBOUNCE: float = 0.2
+
+
+def watch_signature(cfg_dir: Path) -> Optional[WatchSignature]:
+    """
+    Signature of the file a config path currently points to.
+    Symlinks are resolved, so swapping a symlink (e.g. Kubernetes ConfigMap updates) changes the signature,
+    and replacing the file by rename (editors) changes the inode.
+
+    :param cfg_dir: Path to the YAML configuration file.
+    :return: The signature or None if the file does not exist (e.g. in the middle of a rename).
+    """
+    try:
+        stat = os.stat(cfg_dir)
+    except OSError:
+        return None
+    return WatchSignature(os.path.realpath(cfg_dir), stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+
+class ConfigHandle:
+    """
+    Holds the current config and reloads it when the YAML file changes.
+
+    :param cfg_dir: Path to the YAML configuration file.
+    :param frozen: Whether the config object is frozen.
+    :param loader: YAML loader backend, None selects the fastest available one.
+    :param dump_dir: Stub file to update on reloads, None to skip dumping.
+    :param interval: Seconds between two polls of the config file.
+    :param debounce: Seconds the file has to stay unchanged before it is reloaded.
+    :param on_reload: Called with the new config after every successful reload.
+    :param on_error: Called with the exception if a reload fails, the old config is kept.
+        Exceptions raised by the callbacks are stored in callback_error and do not stop the watcher.
+    :param watch: Start the background watcher right away.
+    :raises Exception: Whatever reload_config raises if the initial load fails.
+    """
+
+    def __init__(
+        self,
+        cfg_dir: Path | str,
+        frozen: bool = True,
+        loader: Optional[str] = None,
+        dump_dir: Optional[Path] = None,
+        interval: float = DEFAULT_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+        on_reload: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        watch: bool = True,
+    ) -> None:
+        self.cfg_dir = Path(cfg_dir)
+        self.frozen = frozen
+        self.loader = loader
+        self.dump_dir = dump_dir
+        self.interval = interval
+        self.debounce = debounce
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self.version = 0
+        self.last_error: Optional[BaseException] = None
+        self.callback_error: Optional[BaseException] = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending_reload: Optional[asyncio.Future[bool]] = None
+        self._signature = watch_signature(self.cfg_dir)
+        self._loaded: Optional[LoadedConfig] = None
+        self._loaded = self._load()
+        self._config = self._loaded.config
+        if watch:
+            self.start()
+
+    @property
+    def config(self) -> Any:
+        """
+        The current config object, swapped atomically on reloads.
+
+        :return: The config object.
+        """
+        return self._config
+
+    def _load(self) -> LoadedConfig:
+        loaded = reload_config(self.cfg_dir, self._loaded, self.dump_dir, self.frozen, self.loader)
+        if loaded is None:
+            raise ValueError(f"Config file {self.cfg_dir} is empty")
+        return loaded
+
+    def reload(self) -> bool:
+        """
+        Parse the config file and swap the new config in, unchanged subtrees keep their identity.
+        If parsing fails the old config is kept and the error is stored in last_error.
+
+        :return: True if the config was reloaded.
+        """
+        with self._reload_lock:
+            signature = watch_signature(self.cfg_dir)
+            try:
+                loaded = self._load()
+            except Exception as e:
+                self.last_error = e
+                self._notify(self.on_error, e)
+                return False
+            self._signature = signature
+            self._loaded = loaded
+            self._config = config = loaded.config
+            self.version += 1
+            self.last_error = None
+        self._notify(self.on_reload, config)
+        return True
+
+    def _notify(self, callback: Optional[Callable[[Any], None]], value: Any) -> None:
+        if callback is None:
+            return
+        try:
+            callback(value)
+        except Exception as e:  # a broken callback must not end the watcher thread
+            self.callback_error = e
+
+    async def areload(self) -> bool:
+        """
+        Like reload, but reads and parses the config file in the event loop's default executor.
+        Concurrent calls share one reload and all get its result.
+
+        :return: True if the config was reloaded.
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._pending_reload
+        if pending is None or pending.done() or pending.get_loop() is not loop:
+            pending = self._pending_reload = loop.run_in_executor(None, self.reload)
+        return await asyncio.shield(pending)  # a cancelled awaiter does not cancel the others
+
+    def poll(self) -> bool:
+        """
+        Check the config file once and reload it if it changed and stayed unchanged for the debounce time.
+
+        :return: True if the config was reloaded.
+        """
+        signature = watch_signature(self.cfg_dir)
+        if signature is None or signature == self._signature:
+            return False
+        deadline = time.monotonic() + self.debounce
+        while time.monotonic() < deadline:
+            if self._stop.wait(min(self.debounce, 0.05)):
+                return False
+            current = watch_signature(self.cfg_dir)
+            if current != signature:  # still being written
+                if current is None:
+                    return False
+                signature, deadline = current, time.monotonic() + self.debounce
+        if not self.reload():
+            self._signature = signature  # do not retry a broken file until it changes again
+            return False
+        return True
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:  # keep watching, the next change may load fine
+                self.last_error = e
+
+    def start(self) -> None:
+        """
+        Start the background watcher thread, does nothing if it is already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name=f"heracless-watch-{self.cfg_dir.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background watcher thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ConfigHandle":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return f"ConfigHandle({str(self.cfg_dir)!r}, version={self.version})"
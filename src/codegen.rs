@@ -1,4 +1,7 @@
-use crate::tree::{Node, Structure, Tree, to_pascal_case, to_snake_case};
+use crate::tree::{
+    as_lowercase, as_uppercase, parse_timestamp, to_pascal_case, to_snake_case, Leaf, Node, Structure, Tree,
+};
+use serde_yaml::Value;
 use std::collections::HashSet;
 
 /// Generate the type annotation for a node
@@ -143,6 +146,16 @@ fn collect_nested_structures<'a>(structure: &'a Structure, result: &mut Vec<&'a
 }
 
 // ==================== Python Code Generation ====================
+//
+// The output is byte for byte identical to heracless' Python stub generator
+// (`tree_to_string_translator`), which emits black formatted code.
+
+/// Imports at the top of every Python stub
+pub const PYTHON_IMPORTS: &str =
+    "from dataclasses import dataclass\nfrom datetime import datetime\nfrom datetime import date\nfrom pathlib import Path\n";
+/// Function declared at the end of every Python stub
+pub const PYTHON_FUNCTION_STUB: &str = "\n\ndef load_config(config_path: str) -> Config: ...\n";
+const PYTHON_INDENT: &str = "    ";
 
 /// Map Rust types to Python types
 fn rust_type_to_python(rust_type: &str) -> String {
@@ -151,141 +164,103 @@ fn rust_type_to_python(rust_type: &str) -> String {
         "f64" => "float".to_string(),
         "bool" => "bool".to_string(),
         "String" => "str".to_string(),
-        "Option<String>" => "str | None".to_string(),
-        other if other.starts_with("Vec<") => {
-            // Extract inner type and convert
-            let inner = &other[4..other.len()-1];
-            format!("tuple[{}]", rust_type_to_python(inner))
+        "Option<String>" => "None".to_string(),
+        _ => rust_type.to_string(), // Python type names (from a Python tree) are kept as-is
+    }
+}
+
+/// Python type of a leaf, resolving timestamps like PyYAML does
+fn python_leaf_type(leaf: &Leaf) -> String {
+    if let Value::String(s) = &leaf.value {
+        if let Some(timestamp) = parse_timestamp(s) {
+            return if timestamp.time.is_some() { "datetime" } else { "date" }.to_string();
         }
-        _ => rust_type.to_string(), // Keep as-is for custom types
     }
+    rust_type_to_python(&leaf.type_name)
 }
 
-/// Generate Python type annotation for a node
+/// Python container name of a non mapping structure
+fn python_sequence_type(structure: &Structure) -> &str {
+    match structure.type_name.as_str() {
+        "Vec" => "tuple",
+        other => other,
+    }
+}
+
+/// Generate Python type annotation for a node (mirrors `child_type_mapper`)
 fn generate_python_type_annotation(node: &Node) -> String {
     match node {
-        Node::Leaf(leaf) => rust_type_to_python(&leaf.type_name),
-        Node::Structure(structure) => {
-            match structure.type_name.as_str() {
-                "Mapping" => to_pascal_case(&structure.name),
-                "Vec" => {
-                    if let Some(first_child) = structure.children.first() {
-                        format!("tuple[{}]", generate_python_type_annotation(first_child))
-                    } else {
-                        "tuple".to_string()
-                    }
-                }
-                _ => structure.type_name.clone(),
-            }
-        }
+        Node::Leaf(leaf) => python_leaf_type(leaf),
+        Node::Structure(structure) => match structure.type_name.as_str() {
+            "Mapping" => format!("\"{}\"", as_uppercase(&structure.name)),
+            _ => match structure.children.first() {
+                Some(first_child) => format!(
+                    "{}[{}]",
+                    python_sequence_type(structure),
+                    generate_python_type_annotation(first_child)
+                ),
+                None => python_sequence_type(structure).to_string(),
+            },
+        },
     }
 }
 
 /// Generate Python field for dataclass
 fn generate_python_field(node: &Node) -> String {
-    let field_name = to_snake_case(node.name());
+    let field_name = as_lowercase(node.name());
     let type_annotation = generate_python_type_annotation(node);
-    format!("    {}: {}", field_name, type_annotation)
+    format!("{}{}: {}\n", PYTHON_INDENT, field_name, type_annotation)
 }
 
-/// Generate Python dataclass from Structure
-fn generate_python_dataclass(structure: &Structure, frozen: bool) -> String {
-    let class_name = to_pascal_case(&structure.name);
+/// Generate Python dataclass for a mapping
+fn generate_python_dataclass(name: &str, children: &[Node], frozen: bool) -> String {
     let mut result = String::new();
-
-    // Dataclass decorator
-    if frozen {
-        result.push_str(&format!("@dataclass(frozen=True)\n"));
-    } else {
-        result.push_str(&format!("@dataclass\n"));
+    let frozen = if frozen { "True" } else { "False" };
+    result.push_str(&format!("\n\n@dataclass(frozen={})\nclass {}:\n", frozen, as_uppercase(name)));
+    if children.is_empty() {
+        result.push_str(PYTHON_INDENT);
+        result.push_str("pass\n");
     }
+    for child in children {
+        result.push_str(&generate_python_field(child));
+    }
+    result
+}
 
-    // Class definition
-    result.push_str(&format!("class {}:\n", class_name));
-
-    // Fields
-    if structure.children.is_empty() {
-        result.push_str("    pass\n");
-    } else {
+/// Collect the dataclasses of all mappings in the same order as `tree_iterator`
+fn collect_python_dataclasses(node: &Node, frozen: bool, result: &mut Vec<String>) {
+    if let Node::Structure(structure) = node {
+        if structure.type_name == "Mapping" {
+            result.push(generate_python_dataclass(&structure.name, &structure.children, frozen));
+        }
         for child in &structure.children {
-            result.push_str(&generate_python_field(child));
-            result.push('\n');
+            collect_python_dataclasses(child, frozen, result);
         }
     }
-
-    result
 }
 
 /// Generate Python code for entire tree
 pub fn generate_python_code(tree: &Tree, frozen: bool) -> String {
-    let mut result = String::new();
-
-    // Header with imports
-    result.push_str("# Auto-generated by Heracless (Rust-powered)\n");
-    result.push_str("# DO NOT EDIT THIS FILE MANUALLY\n\n");
-    result.push_str("from dataclasses import dataclass\n");
-    result.push_str("from datetime import datetime, date\n");
-    result.push_str("from pathlib import Path\n");
-    result.push_str("from typing import Any\n\n");
-
-    // Collect all structures
-    let mut structures = Vec::new();
+    let mut dataclasses = vec![generate_python_dataclass(&tree.name, &tree.children, frozen)];
     for child in &tree.children {
-        match child {
-            Node::Structure(structure) if structure.type_name == "Mapping" => {
-                structures.push(structure);
-                collect_nested_structures(structure, &mut structures);
-            }
-            _ => {}
-        }
+        collect_python_dataclasses(child, frozen, &mut dataclasses);
     }
 
-    // Remove duplicates
+    // nested classes first, duplicates (e.g. list items of the same shape) only once
+    let mut result = String::from(PYTHON_IMPORTS);
     let mut seen = HashSet::new();
-    let mut unique_structures = Vec::new();
-    for structure in structures.iter().rev() {
-        let name = to_pascal_case(&structure.name);
-        if !seen.contains(&name) {
-            seen.insert(name);
-            unique_structures.push(*structure);
+    for dataclass in dataclasses.iter().rev() {
+        if seen.insert(dataclass.as_str()) {
+            result.push_str(dataclass);
         }
     }
-    unique_structures.reverse();
-
-    // Generate dataclass definitions (reversed for proper dependency order)
-    for structure in unique_structures.iter().rev() {
-        result.push_str(&generate_python_dataclass(structure, frozen));
-        result.push('\n');
-    }
-
-    // Generate root Config class
-    if frozen {
-        result.push_str("@dataclass(frozen=True)\n");
-    } else {
-        result.push_str("@dataclass\n");
-    }
-    result.push_str("class Config:\n");
-
-    if tree.children.is_empty() {
-        result.push_str("    pass\n");
-    } else {
-        for child in &tree.children {
-            result.push_str(&generate_python_field(child));
-            result.push('\n');
-        }
-    }
-
-    result.push_str("\n\ndef load_config(config_path: str) -> Config:\n");
-    result.push_str("    ...\n");
-
+    result.push_str(PYTHON_FUNCTION_STUB);
     result
 }
 
 #[cfg(test)]
 mod tests {
     use super::*;
-    use crate::tree::{Leaf, Node, Structure, Tree};
-    use serde_yaml::Value;
 
     #[test]
     fn test_generate_type_annotation() {
@@ -297,6 +272,30 @@ mod tests {
         assert_eq!(generate_type_annotation(&leaf), "String");
     }
 
+    #[test]
+    fn test_generate_python_code() {
+        let yaml = "invoice: 34843\ndate: 2001-01-23\nbill-to:\n  given: Chris\nproduct:\n  - sku: BL394D\n    price: 450.0\n  - sku: BL4438H\n    price: 2392.0\nempty: []\nnothing: null\n";
+        let value: Value = serde_yaml::from_str(yaml).unwrap();
+        let tree = crate::tree::parse_tree(&value).unwrap();
+        let expected = concat!(
+            "from dataclasses import dataclass\n",
+            "from datetime import datetime\n",
+            "from datetime import date\n",
+            "from pathlib import Path\n",
+            "\n\n@dataclass(frozen=True)\nclass ProductItem:\n    sku: str\n    price: float\n",
+            "\n\n@dataclass(frozen=True)\nclass BillTo:\n    given: str\n",
+            "\n\n@dataclass(frozen=True)\nclass Config:\n",
+            "    invoice: int\n",
+            "    date: date\n",
+            "    bill_to: \"BillTo\"\n",
+            "    product: tuple[\"ProductItem\"]\n",
+            "    empty: tuple\n",
+            "    nothing: None\n",
+            "\n\ndef load_config(config_path: str) -> Config: ...\n",
+        );
+        assert_eq!(generate_python_code(&tree, true), expected);
+    }
+
     #[test]
     fn test_generate_field() {
         let leaf = Node::Leaf(Leaf {
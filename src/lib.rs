@@ -141,6 +141,7 @@ pub fn fight(config_path: &Path, output_path: Option<&Path>, frozen: bool) -> Re
 // Python bindings using PyO3
 use pyo3::prelude::*;
 use pyo3::exceptions::PyException;
+use pyo3::types::{PyDict, PyList};
 
 /// Convert HeraclessError to Python exception
 impl std::convert::From<HeraclessError> for PyErr {
@@ -160,6 +161,40 @@ fn generate_python_stubs(config_path: String, frozen: bool) -> PyResult<String>
     Ok(code)
 }
 
+/// Convert a node of heracless' Python tree (Leaf/Structure namedtuples)
+fn py_node_to_node(node: &Bound<'_, PyAny>) -> PyResult<tree::Node> {
+    let name: String = node.getattr("name")?.extract()?;
+    let type_name: String = node.getattr("type")?.extract()?;
+    if !node.hasattr("children")? {
+        return Ok(tree::Node::Leaf(tree::Leaf {
+            name,
+            type_name,
+            value: serde_yaml::Value::Null,
+        }));
+    }
+    Ok(tree::Node::Structure(tree::Structure {
+        name,
+        type_name: if type_name == "dict" { "Mapping".to_string() } else { type_name },
+        children: py_children_to_nodes(&node.getattr("children")?)?,
+    }))
+}
+
+fn py_children_to_nodes(children: &Bound<'_, PyAny>) -> PyResult<Vec<tree::Node>> {
+    children.iter()?.map(|child| py_node_to_node(&child?)).collect()
+}
+
+/// Generate Python type stub code from heracless' Python tree
+///
+/// The output is identical to the pure Python stub generator
+#[pyfunction]
+fn generate_python_stubs_from_tree(tree: &Bound<'_, PyAny>, frozen: bool) -> PyResult<String> {
+    let tree = tree::Tree {
+        name: tree.getattr("name")?.extract()?,
+        children: py_children_to_nodes(&tree.getattr("children")?)?,
+    };
+    Ok(codegen::generate_python_code(&tree, frozen))
+}
+
 /// Parse YAML and return as JSON string for Python to deserialize
 #[pyfunction]
 fn parse_yaml_to_json(config_path: String) -> PyResult<String> {
@@ -173,11 +208,100 @@ fn parse_yaml_to_json(config_path: String) -> PyResult<String> {
     Ok(json)
 }
 
+/// Convert a resolved timestamp into a `datetime.date` or `datetime.datetime`
+fn timestamp_to_py(py: Python<'_>, timestamp: &tree::Timestamp) -> PyResult<PyObject> {
+    let datetime = py.import_bound("datetime")?;
+    let (year, month, day) = (timestamp.year, timestamp.month, timestamp.day);
+    let Some((hour, minute, second, microsecond)) = timestamp.time else {
+        return Ok(datetime.getattr("date")?.call1((year, month, day))?.unbind());
+    };
+    let tzinfo = match timestamp.offset_minutes {
+        Some(minutes) => {
+            let delta = datetime.getattr("timedelta")?.call1((0, minutes * 60))?;
+            datetime.getattr("timezone")?.call1((delta,))?.unbind()
+        }
+        None => py.None(),
+    };
+    let value = datetime
+        .getattr("datetime")?
+        .call1((year, month, day, hour, minute, second, microsecond, tzinfo))?;
+    Ok(value.unbind())
+}
+
+/// Build the Python value graph for a YAML value with PyYAML compatible typing
+fn value_to_py(py: Python<'_>, value: &serde_yaml::Value) -> PyResult<PyObject> {
+    use serde_yaml::Value;
+    Ok(match value {
+        Value::Null => py.None(),
+        Value::Bool(b) => b.into_py(py),
+        Value::Number(n) => {
+            if let Some(i) = n.as_i64() {
+                i.into_py(py)
+            } else if let Some(u) = n.as_u64() {
+                u.into_py(py)
+            } else {
+                n.as_f64().unwrap_or(f64::NAN).into_py(py)
+            }
+        }
+        Value::String(s) => match tree::parse_timestamp(s) {
+            Some(timestamp) => timestamp_to_py(py, &timestamp)?,
+            None => s.into_py(py),
+        },
+        Value::Sequence(seq) => {
+            let list = PyList::empty_bound(py);
+            for item in seq {
+                list.append(value_to_py(py, item)?)?;
+            }
+            list.into_py(py)
+        }
+        Value::Mapping(map) => {
+            let dict = PyDict::new_bound(py);
+            for (key, val) in map {
+                dict.set_item(value_to_py(py, key)?, value_to_py(py, val)?)?;
+            }
+            dict.into_py(py)
+        }
+        Value::Tagged(tagged) => value_to_py(py, &tagged.value)?,
+    })
+}
+
+/// Parse YAML text without holding the GIL, merging `<<` keys.
+/// Merged keys end up after the mapping's own keys (PyYAML puts them first), so the Python
+/// `rust_load` hands documents with merge keys to PyYAML to keep the key order identical.
+fn parse_yaml_value(py: Python<'_>, content: &str) -> PyResult<serde_yaml::Value> {
+    py.allow_threads(|| {
+        let mut value: serde_yaml::Value = serde_yaml::from_str(content)?;
+        value.apply_merge()?;
+        Ok::<_, serde_yaml::Error>(value)
+    })
+    .map_err(|e| PyException::new_err(format!("Failed to parse YAML: {}", e)))
+}
+
+/// Parse YAML text and build Python dicts, lists and scalars directly
+#[pyfunction]
+fn load_yaml(py: Python<'_>, content: &str) -> PyResult<PyObject> {
+    let value = parse_yaml_value(py, content)?;
+    value_to_py(py, &value)
+}
+
+/// Parse a YAML file and build Python dicts, lists and scalars directly
+#[pyfunction]
+fn parse_yaml_to_py(py: Python<'_>, config_path: String) -> PyResult<PyObject> {
+    let content = py
+        .allow_threads(|| std::fs::read_to_string(&config_path))
+        .map_err(|e| PyException::new_err(format!("Failed to read file: {}", e)))?;
+    let value = parse_yaml_value(py, &content)?;
+    value_to_py(py, &value)
+}
+
 /// Python module definition
 #[pymodule]
 fn heracless_core(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(generate_python_stubs, m)?)?;
+    m.add_function(wrap_pyfunction!(generate_python_stubs_from_tree, m)?)?;
     m.add_function(wrap_pyfunction!(parse_yaml_to_json, m)?)?;
+    m.add_function(wrap_pyfunction!(load_yaml, m)?)?;
+    m.add_function(wrap_pyfunction!(parse_yaml_to_py, m)?)?;
     Ok(())
 }
 
@@ -1,6 +1,7 @@
 use heck::{ToSnakeCase, ToPascalCase};
 use regex::Regex;
 use serde_yaml::Value;
+use std::sync::OnceLock;
 
 /// Represents a leaf node in the configuration tree (primitive value)
 #[derive(Debug, Clone, PartialEq)]
@@ -66,6 +67,121 @@ pub fn to_pascal_case(name: &str) -> String {
     sanitized.to_pascal_case()
 }
 
+/// Replace invalid characters the way heracless' Python `replace_invalid_names` does
+fn replace_invalid_python_names(name: &str) -> String {
+    name.chars()
+        .map(|c| if c.is_ascii_alphanumeric() || c == ' ' || c == '\n' { c } else { '_' })
+        .collect()
+}
+
+/// Field name conversion, identical to heracless' Python `as_lowercase`
+pub fn as_lowercase(name: &str) -> String {
+    let mut result = String::with_capacity(name.len() + 4);
+    for (i, c) in replace_invalid_python_names(name).chars().enumerate() {
+        if i > 0 && c.is_ascii_uppercase() {
+            result.push('_');
+        }
+        result.push(c.to_ascii_lowercase());
+    }
+    // Normalize multiple consecutive underscores to a single one
+    let mut normalized = String::with_capacity(result.len());
+    for c in result.chars() {
+        if !(c == '_' && normalized.ends_with('_')) {
+            normalized.push(c);
+        }
+    }
+    normalized
+}
+
+/// Python's `str.title` for the ASCII strings produced by `as_lowercase`
+fn python_title(word: &str) -> String {
+    let mut result = String::with_capacity(word.len());
+    let mut previous_cased = false;
+    for c in word.chars() {
+        if c.is_ascii_alphabetic() {
+            result.push(if previous_cased { c.to_ascii_lowercase() } else { c.to_ascii_uppercase() });
+            previous_cased = true;
+        } else {
+            result.push(c);
+            previous_cased = false;
+        }
+    }
+    result
+}
+
+/// Class name conversion, identical to heracless' Python `as_uppercase`
+pub fn as_uppercase(name: &str) -> String {
+    as_lowercase(name).split('_').map(python_title).collect()
+}
+
+/// A YAML 1.1 timestamp as resolved by PyYAML
+#[derive(Debug, Clone, Copy, PartialEq)]
+pub struct Timestamp {
+    pub year: i32,
+    pub month: u8,
+    pub day: u8,
+    /// (hour, minute, second, microsecond), `None` for plain dates
+    pub time: Option<(u8, u8, u8, u32)>,
+    /// UTC offset in minutes, `None` for naive timestamps
+    pub offset_minutes: Option<i32>,
+}
+
+fn timestamp_regex() -> &'static Regex {
+    static TIMESTAMP: OnceLock<Regex> = OnceLock::new();
+    TIMESTAMP.get_or_init(|| {
+        Regex::new(concat!(
+            r"^(?P<year>[0-9]{4})-(?P<month>[0-9]{1,2})-(?P<day>[0-9]{1,2})",
+            r"(?:(?:[Tt]|[ \t]+)(?P<hour>[0-9]{1,2}):(?P<minute>[0-9]{2}):(?P<second>[0-9]{2})",
+            r"(?:\.(?P<fraction>[0-9]*))?",
+            r"(?:[ \t]*(?P<tz>Z|(?P<tz_sign>[-+])(?P<tz_hour>[0-9]{1,2})(?::(?P<tz_minute>[0-9]{2}))?))?)?$",
+        ))
+        .unwrap()
+    })
+}
+
+/// Resolve a plain scalar the way PyYAML's implicit timestamp resolver does
+///
+/// serde_yaml does not keep the scalar style, so quoted scalars that look like
+/// timestamps are resolved as well.
+pub fn parse_timestamp(value: &str) -> Option<Timestamp> {
+    let caps = timestamp_regex().captures(value)?;
+    let number = |name: &str| caps.name(name).map(|m| m.as_str().parse::<u32>().unwrap_or(0));
+    let (month, day) = (caps.name("month")?.as_str(), caps.name("day")?.as_str());
+    if caps.name("hour").is_none() && (month.len() != 2 || day.len() != 2) {
+        return None; // date only timestamps need two digit months and days
+    }
+    let time = match caps.name("hour") {
+        Some(_) => {
+            let mut fraction: String = caps.name("fraction").map_or("", |m| m.as_str()).chars().take(6).collect();
+            while fraction.len() < 6 {
+                fraction.push('0');
+            }
+            Some((
+                number("hour")? as u8,
+                number("minute")? as u8,
+                number("second")? as u8,
+                fraction.parse::<u32>().unwrap_or(0),
+            ))
+        }
+        None => None,
+    };
+    let offset_minutes = match (caps.name("tz"), caps.name("tz_sign")) {
+        (Some(_), Some(sign)) => {
+            let minutes = (number("tz_hour")? * 60 + number("tz_minute").unwrap_or(0)) as i32;
+            Some(if sign.as_str() == "-" { -minutes } else { minutes })
+        }
+        (Some(_), None) => Some(0),
+        _ => None,
+    };
+    Some(Timestamp {
+        year: caps.name("year")?.as_str().parse().ok()?,
+        month: month.parse().ok()?,
+        day: day.parse().ok()?,
+        time,
+        offset_minutes,
+    })
+}
+
 /// Infer the Rust type name from a YAML value
 pub fn infer_type_name(value: &Value) -> String {
     match value {
@@ -106,11 +222,11 @@ pub fn build_tree(name: String, value: &Value) -> Result<Node, String> {
             }))
         }
         Value::Sequence(seq) => {
-            let mut children = Vec::new();
-            if let Some(first) = seq.first() {
-                // Build a representative child for type inference
-                let item_name = format!("{}_item", name);
-                children.push(build_tree(item_name, first)?);
+            // every item is kept, mirroring the Python tree builder
+            let item_name = format!("{}_item", name);
+            let mut children = Vec::with_capacity(seq.len());
+            for item in seq {
+                children.push(build_tree(item_name.clone(), item)?);
             }
             Ok(Node::Structure(Structure {
                 name: name.clone(),
@@ -194,6 +310,29 @@ mod tests {
         assert_eq!(to_pascal_case("test-name"), "TestName");
     }
 
+    #[test]
+    fn test_python_name_conversion() {
+        assert_eq!(as_lowercase("TestName"), "test_name");
+        assert_eq!(as_lowercase("bill-to"), "bill_to");
+        assert_eq!(as_lowercase("HTTPServer"), "h_t_t_p_server");
+        assert_eq!(as_lowercase("a__b"), "a_b");
+        assert_eq!(as_uppercase("bill-to"), "BillTo");
+        assert_eq!(as_uppercase("product_item"), "ProductItem");
+        assert_eq!(as_uppercase("abc1def"), "Abc1Def");
+    }
+
+    #[test]
+    fn test_parse_timestamp() {
+        let date = parse_timestamp("2001-01-23").unwrap();
+        assert_eq!((date.year, date.month, date.day, date.time), (2001, 1, 23, None));
+        let datetime = parse_timestamp("2001-12-14t21:59:43.10-05:00").unwrap();
+        assert_eq!(datetime.time, Some((21, 59, 43, 100000)));
+        assert_eq!(datetime.offset_minutes, Some(-300));
+        assert_eq!(parse_timestamp("2001-12-14 21:59:43Z").unwrap().offset_minutes, Some(0));
+        assert_eq!(parse_timestamp("2001-1-2"), None);
+        assert_eq!(parse_timestamp("1.0.0"), None);
+    }
+
     #[test]
     fn test_infer_type_name() {
         assert_eq!(infer_type_name(&Value::Bool(true)), "bool");
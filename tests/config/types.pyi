@@ -1,9 +1,18 @@
+# heracless-schema: f9ff079954504efd69e55d49a85a5f1b
 from dataclasses import dataclass
 from datetime import datetime
 from datetime import date
 from pathlib import Path
 
 
+@dataclass(frozen=True)
+class ProductItem:
+    sku: str
+    quantity: int
+    description: str
+    price: float
+
+
 @dataclass(frozen=True)
 class Address:
     lines: str
@@ -13,18 +22,17 @@ class Address:
 
 
 @dataclass(frozen=True)
-class BillTo:
+class ShipTo:
     given: str
     family: str
     address: "Address"
 
 
 @dataclass(frozen=True)
-class ProductItem:
-    sku: str
-    quantity: int
-    description: str
-    price: float
+class BillTo:
+    given: str
+    family: str
+    address: "Address"
 
 
 @dataclass(frozen=True)
@@ -39,11 +47,4 @@ class Config:
     comments: str
 
 
-@dataclass(frozen=True)
-class ShipTo:
-    given: str
-    family: str
-    address: "Address"
-
-
 def load_config(config_path: str) -> Config: ...
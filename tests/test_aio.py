@@ -0,0 +1,189 @@
+"""
+Tests for the asyncio interface in heracless.aio and ConfigHandle.areload
+"""
+
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import heracless.aio
+from heracless.aio import aload_config, watch
+from heracless.utils.exceptions import YamlSyntaxError
+from heracless.watch import ConfigHandle
+
+
+@pytest.fixture
+def config_file(tmp_path: Path) -> Path:
+    path = tmp_path / "config.yaml"
+    path.write_text("port: 1\ndatabase: {host: localhost}\n")
+    return path
+
+
+@pytest.fixture
+def slow_fight(monkeypatch: pytest.MonkeyPatch) -> list[Any]:
+    """Counts the parses of heracless.aio and makes each one take a while"""
+    calls: list[Any] = []
+    original = heracless.aio.fight
+
+    def counting_fight(*args: Any, **kwargs: Any) -> Any:
+        calls.append(threading.current_thread())
+        time.sleep(0.05)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(heracless.aio, "fight", counting_fight)
+    return calls
+
+
+def rewrite(path: Path, text: str) -> None:
+    """Rewrite a file and make sure the change is visible even on file systems with coarse timestamps"""
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestAloadConfig:
+    """Test aload_config"""
+
+    def test_load(self, config_file: Path) -> None:
+        config = asyncio.run(aload_config(config_file))
+        assert config.port == 1
+        assert config.database.host == "localhost"
+
+    def test_parses_off_the_loop(self, config_file: Path, slow_fight: list[Any]) -> None:
+        asyncio.run(aload_config(config_file))
+        assert slow_fight[0] is not threading.main_thread()
+
+    def test_concurrent_loads_coalesce(self, config_file: Path, slow_fight: list[Any]) -> None:
+        async def main() -> list[Any]:
+            return await asyncio.gather(*(aload_config(config_file) for _ in range(5)))
+
+        configs = asyncio.run(main())
+        assert len(slow_fight) == 1
+        assert all(config is configs[0] for config in configs)
+
+    def test_different_options_do_not_coalesce(self, config_file: Path, slow_fight: list[Any]) -> None:
+        async def main() -> list[Any]:
+            return await asyncio.gather(aload_config(config_file), aload_config(config_file, select=["database"]))
+
+        full, selected = asyncio.run(main())
+        assert len(slow_fight) == 2
+        assert not hasattr(selected, "port")
+
+    def test_string_select(self, config_file: Path, slow_fight: list[Any]) -> None:
+        async def main() -> list[Any]:
+            return await asyncio.gather(
+                aload_config(config_file, select="database"), aload_config(config_file, select=["database"])
+            )
+
+        selected, listed = asyncio.run(main())
+        assert len(slow_fight) == 1
+        assert selected is listed
+        assert selected.database.host == "localhost"
+        assert not hasattr(selected, "port")
+
+    def test_sequential_loads_parse_again(self, config_file: Path, slow_fight: list[Any]) -> None:
+        async def main() -> None:
+            await aload_config(config_file)
+            rewrite(config_file, "port: 2\n")
+            assert (await aload_config(config_file)).port == 2
+
+        asyncio.run(main())
+        assert len(slow_fight) == 2
+        assert not heracless.aio._IN_FLIGHT
+
+    def test_errors_reach_every_awaiter(self, tmp_path: Path) -> None:
+        broken = tmp_path / "broken.yaml"
+        broken.write_text("a: [1\n")
+
+        async def main() -> list[Any]:
+            return await asyncio.gather(aload_config(broken), aload_config(broken), return_exceptions=True)
+
+        assert all(isinstance(result, YamlSyntaxError) for result in asyncio.run(main()))
+
+    def test_cancelled_awaiter_does_not_cancel_others(self, config_file: Path, slow_fight: list[Any]) -> None:
+        async def main() -> Any:
+            first = asyncio.ensure_future(aload_config(config_file))
+            second = asyncio.ensure_future(aload_config(config_file))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(main()).port == 1
+
+
+class TestAreload:
+    """Test ConfigHandle.areload"""
+
+    def test_areload(self, config_file: Path) -> None:
+        handle = ConfigHandle(config_file, watch=False)
+        rewrite(config_file, "port: 2\ndatabase: {host: localhost}\n")
+        database = handle.config.database
+        assert asyncio.run(handle.areload())
+        assert handle.config.port == 2
+        assert handle.config.database is database
+
+    def test_concurrent_areloads_coalesce(self, config_file: Path) -> None:
+        handle = ConfigHandle(config_file, watch=False)
+
+        async def main() -> list[bool]:
+            return await asyncio.gather(*(handle.areload() for _ in range(4)))
+
+        assert asyncio.run(main()) == [True] * 4
+        assert handle.version == 1
+
+    def test_failed_areload_keeps_config(self, config_file: Path) -> None:
+        handle = ConfigHandle(config_file, watch=False)
+        rewrite(config_file, "port: [1\n")
+        assert not asyncio.run(handle.areload())
+        assert handle.config.port == 1
+        assert isinstance(handle.last_error, YamlSyntaxError)
+
+
+class TestWatch:
+    """Test the async watch iterator"""
+
+    def test_yields_versions(self, config_file: Path) -> None:
+        async def main() -> list[int]:
+            ports = []
+            async for config in watch(config_file, interval=0.01, debounce=0):
+                ports.append(config.port)
+                if len(ports) == 3:
+                    break
+                rewrite(config_file, f"port: {config.port + 1}\n")
+            return ports
+
+        assert asyncio.run(asyncio.wait_for(main(), 10)) == [1, 2, 3]
+
+    def test_failed_reload_is_skipped(self, config_file: Path) -> None:
+        errors: list[BaseException] = []
+
+        async def main() -> int:
+            versions = watch(config_file, interval=0.01, debounce=0, on_error=errors.append)
+            assert (await versions.__anext__()).port == 1
+            rewrite(config_file, "port: [1\n")
+            next_version = asyncio.ensure_future(versions.__anext__())  # polls until a reload succeeds
+            while not errors:
+                await asyncio.sleep(0.01)
+            rewrite(config_file, "port: 5\n")
+            config = await next_version
+            await versions.aclose()
+            return int(config.port)
+
+        assert asyncio.run(asyncio.wait_for(main(), 10)) == 5
+        assert isinstance(errors[0], YamlSyntaxError)
+
+    def test_initial_load_errors_raise(self, tmp_path: Path) -> None:
+        broken = tmp_path / "broken.yaml"
+        broken.write_text("a: [1\n")
+
+        async def main() -> None:
+            async for _ in watch(broken):
+                pass
+
+        with pytest.raises(YamlSyntaxError):
+            asyncio.run(main())
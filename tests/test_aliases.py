@@ -0,0 +1,89 @@
+"""
+Tests for sharing aliased YAML subtrees between config objects and tree nodes
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from heracless.fight import fight
+from heracless.loaders import available_loaders
+from heracless.utils.cfg_tree import dict_to_config_obj, tree_parser, tree_to_config_obj
+from heracless.utils.helper import as_dict
+
+CONFIG_DIR = Path(__file__).parent.parent.resolve() / Path("config/config.yaml")
+
+ALIAS_YAML = """
+defaults: &defaults
+  timeout: 5
+  pool: {size: 3}
+  hosts: [a, b]
+first:
+  <<: *defaults
+  name: one
+second:
+  <<: *defaults
+  name: two
+  timeout: 10
+users:
+  - pool: *defaults
+  - pool: *defaults
+"""
+
+
+class TestAliasSharing:
+    """Test that aliases become shared instances"""
+
+    @pytest.mark.parametrize("options", [{}, {"stream": True}, {"slots": True}, {"tables": True, "arrays": "array"}])
+    def test_merge_keys_reuse_base_pieces(self, tmp_path: Path, options: dict) -> None:
+        path = tmp_path / "aliases.yaml"
+        path.write_text(ALIAS_YAML)
+        config = fight(path, None, True, **options)
+        assert config.first.pool is config.defaults.pool
+        assert config.second.pool is config.defaults.pool
+        assert config.first.hosts is config.defaults.hosts
+        assert config.second.timeout == 10
+
+    @pytest.mark.parametrize("loader", available_loaders())
+    def test_every_loader_shares_aliases(self, tmp_path: Path, loader: str) -> None:
+        path = tmp_path / "aliases.yaml"
+        path.write_text(ALIAS_YAML)
+        config = fight(path, None, True, loader=loader)
+        assert config.first.pool is config.defaults.pool
+        assert config.first.hosts is config.defaults.hosts
+        assert config.users[0].pool is config.users[1].pool
+
+    def test_alias_under_same_key_is_one_instance(self) -> None:
+        config = dict_to_config_obj(True, yaml.safe_load(ALIAS_YAML))
+        assert config.users[0].pool is config.users[1].pool
+        assert config.users[0].pool.pool is config.defaults.pool
+
+    def test_alias_under_other_key_keeps_its_class(self) -> None:
+        config = fight(CONFIG_DIR, None, True)
+        assert type(config.bill_to).__name__ == "BillTo"
+        assert type(config.ship_to).__name__ == "ShipTo"
+        assert config.bill_to.address is config.ship_to.address
+
+    def test_equal_copies_are_not_shared(self) -> None:
+        config = dict_to_config_obj(True, {"a": {"pool": {"x": 1}}, "b": {"pool": {"x": 1}}})
+        assert config.a.pool == config.b.pool
+        assert config.a.pool is not config.b.pool
+
+    def test_tree_nodes_are_shared(self) -> None:
+        tree = tree_parser(yaml.safe_load(ALIAS_YAML))
+        nodes = {child.name: child for child in tree.children}
+        first_pool = next(child for child in nodes["first"].children if child.name == "pool")
+        defaults_pool = next(child for child in nodes["defaults"].children if child.name == "pool")
+        assert first_pool is defaults_pool
+        config = tree_to_config_obj(True, tree)
+        assert config.first.pool is config.defaults.pool
+
+    def test_same_config_as_copies(self) -> None:
+        parsed = yaml.safe_load(ALIAS_YAML)
+        copied = dict_to_config_obj(True, json.loads(json.dumps(parsed)))  # no aliases
+        shared = dict_to_config_obj(True, parsed)
+        assert copied.first.pool is not copied.defaults.pool
+        assert shared == copied
+        assert as_dict(shared) == as_dict(copied)
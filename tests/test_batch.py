@@ -0,0 +1,112 @@
+"""
+Tests for concurrent batch loading (load_configs) in heracless.utils.batch
+"""
+
+from pathlib import Path
+
+import pytest
+
+from heracless import load_config, load_configs
+from heracless.utils.batch import parse_files, resolve_executor
+from heracless.utils.exceptions import YamlSyntaxError
+
+
+@pytest.fixture
+def fleet(tmp_path: Path) -> list[Path]:
+    paths = []
+    for index in range(12):
+        path = tmp_path / f"host{index}.yaml"
+        path.write_text(f"host: h{index}\nport: {8000 + index}\nlimits: {{cpu: 2, mem: 4096}}\ntags: [a, b]\n")
+        paths.append(path)
+    paths[3].write_text("host: [broken\n")
+    paths[4].write_text("")
+    paths[5] = tmp_path / "missing" / "host5.yaml"
+    paths[6].write_text("host: h6\nextra: {nested: true}\n")
+    return paths
+
+
+def parse_upper(path: Path) -> str:
+    if path.name == "bad":
+        raise ValueError("bad file")
+    return path.name.upper()
+
+
+class TestResolveExecutor:
+    """Test choosing threads or processes"""
+
+    def test_auto(self) -> None:
+        assert resolve_executor("auto", "rust") == "thread"
+        assert resolve_executor("auto", "libyaml") == "process"
+        assert resolve_executor("auto", "python") == "process"
+
+    def test_explicit(self) -> None:
+        assert resolve_executor("thread", "python") == "thread"
+        assert resolve_executor("process", "rust") == "process"
+
+    def test_unknown(self) -> None:
+        with pytest.raises(ValueError, match="Unknown executor"):
+            resolve_executor("fibers", "python")
+
+
+class TestParseFiles:
+    """Test parse_files"""
+
+    @pytest.mark.parametrize("workers,executor", [(1, "thread"), (3, "thread"), (2, "process")])
+    def test_order_and_errors(self, workers: int, executor: str) -> None:
+        paths = [Path(name) for name in ("a", "bad", "c", "d")]
+        results = list(parse_files(paths, parse_upper, workers, executor))
+        assert [result for result, _ in results] == ["A", None, "C", "D"]
+        assert [error is None for _, error in results] == [True, False, True, True]
+        assert str(results[1][1]) == "bad file"
+
+    def test_empty(self) -> None:
+        assert list(parse_files([], parse_upper, 4, "process")) == []
+
+
+class TestLoadConfigs:
+    """Test load_configs"""
+
+    @pytest.mark.parametrize("workers,executor", [(1, "auto"), (4, "thread"), (2, "process"), (None, "auto")])
+    def test_results_in_input_order(self, fleet: list[Path], workers: int, executor: str) -> None:
+        results = load_configs(fleet, workers=workers, executor=executor)
+        assert [result.path for result in results] == fleet
+        for index in (0, 1, 2, 7, 11):
+            assert results[index].error is None
+            assert results[index].config == load_config(fleet[index], None, True)
+        assert results[6].config.extra.nested is True
+
+    def test_errors_are_captured(self, fleet: list[Path]) -> None:
+        results = load_configs(fleet, workers=2, executor="process")
+        assert isinstance(results[3].error, YamlSyntaxError)
+        assert results[3].config is None
+        assert isinstance(results[5].error, FileNotFoundError)
+        assert results[4].config is None and results[4].error is None  # empty file
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_missing_file_is_not_created(self, tmp_path: Path, executor: str) -> None:
+        missing = tmp_path / "missing.yaml"
+        (result,) = load_configs([missing], workers=1, executor=executor)
+        assert isinstance(result.error, FileNotFoundError)
+        assert result.error.filename == str(missing)
+        assert result.config is None
+        assert not missing.exists()
+
+    def test_classes_shared(self, fleet: list[Path]) -> None:
+        configs = [result.config for result in load_configs(fleet, workers=2, executor="process")]
+        assert type(configs[0]) is type(configs[11])
+        assert type(configs[0].limits) is type(configs[7].limits)
+        assert type(configs[0]) is not type(configs[6])
+
+    def test_options(self, fleet: list[Path]) -> None:
+        results = load_configs(fleet, slots=True, tables=True, workers=2, executor="thread")
+        config = results[0].config
+        assert not hasattr(config, "__dict__")
+        assert config.tags == ("a", "b")
+
+    def test_invalid_options_raise(self, fleet: list[Path]) -> None:
+        with pytest.raises(ValueError, match="Unknown YAML loader"):
+            load_configs(fleet, loader="nope")
+        with pytest.raises(ValueError, match="Unknown executor"):
+            load_configs(fleet, executor="nope")
+        with pytest.raises(ValueError, match="Unknown array mode"):
+            load_configs(fleet, arrays="nope")
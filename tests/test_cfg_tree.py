@@ -7,7 +7,10 @@ from pathlib import Path
 
 import pytest
 
+from heracless.rust_backend import generate_stubs_from_tree_rust, is_rust_available
 from heracless.utils.cfg_tree import (
+    FUNCTION_STUB,
+    IMPORTS,
     Leaf,
     Structure,
     Tree,
@@ -16,6 +19,7 @@ from heracless.utils.cfg_tree import (
     attribute_generation_function_mapper,
     child_type_mapper,
     class_heading_generator,
+    dict_to_config_obj,
     entry_generator_mapping,
     format_str,
     iterable_generator,
@@ -463,6 +467,56 @@ class TestComplexScenarios:
         assert "class Inner:" in result
 
 
+class TestStubFormatting:
+    """Test that stubs are emitted formatted, without running black"""
+
+    CONFIG = {
+        "invoice": 1,
+        "bill-to": {"given": "Chris", "address": {"city": "Royal Oak"}},
+        "product": [{"sku": "a", "price": 1.0}, {"sku": "b", "price": 2.0}],
+        "my-list": [1, 2],
+        "empty-list": [],
+        "empty": {},
+    }
+
+    def test_exact_output(self) -> None:
+        tree = tree_parser({"name": "x", "inner": {"value": 1}, "items": [1]})
+        assert tree_to_string_translator(True, tree) == (
+            IMPORTS
+            + "\n\n@dataclass(frozen=True)\nclass Inner:\n    value: int\n"
+            + '\n\n@dataclass(frozen=True)\nclass Config:\n    name: str\n    inner: "Inner"\n    items: tuple[int]\n'
+            + FUNCTION_STUB
+        )
+
+    def test_output_is_black_formatted(self) -> None:
+        pytest.importorskip("black")
+        result = tree_to_string_translator(True, tree_parser(self.CONFIG))
+        assert format_str(result) == result
+
+    def test_output_is_deterministic(self) -> None:
+        results = {tree_to_string_translator(False, tree_parser(self.CONFIG)) for _ in range(5)}
+        assert len(results) == 1
+
+    def test_list_items_of_same_shape_emitted_once(self) -> None:
+        result = tree_to_string_translator(True, tree_parser(self.CONFIG))
+        assert result.count("class ProductItem:") == 1
+
+    def test_list_field_names_are_lowercased(self) -> None:
+        result = tree_to_string_translator(True, tree_parser(self.CONFIG))
+        assert "    my_list: tuple[int]\n" in result
+        assert "    empty_list: tuple\n" in result
+
+    def test_empty_mapping_emits_pass(self) -> None:
+        result = tree_to_string_translator(True, tree_parser(self.CONFIG))
+        assert "class Empty:\n    pass\n" in result
+
+    @pytest.mark.skipif(not is_rust_available(), reason="Rust extension not built")
+    def test_rust_generator_matches_python(self) -> None:
+        tree = tree_parser(self.CONFIG)
+        python_result = IMPORTS + tree_to_str_generator(True, tree) + FUNCTION_STUB
+        assert generate_stubs_from_tree_rust(tree, True) == python_result
+
+
 class TestEdgeCases:
     """Test edge cases and error conditions"""
 
@@ -532,3 +586,28 @@ class TestEdgeCases:
         tree = tree_parser(config_dict)
         config = tree_to_config_obj(True, tree)
         assert config.file_path == test_path
+
+
+class TestDictToConfigObj:
+    """Test the direct dict materializer against the tree based one"""
+
+    CASES = [
+        {"a": 1, "b": "x", "c": None, "d": 1.5, "e": True},
+        {"db": {"host": "localhost", "port": 5432}, "tags": ["a", "b"]},
+        {"product": [{"sku": "a", "price": 1.0}, {"sku": "b", "price": 2.0}], "empty": [], "nested": [[1], [2, 3]]},
+        {"when": date(2001, 1, 23), "at": datetime(2001, 1, 23, 10, 0), "path": Path("/tmp")},
+        {"dup-key": 1, "dup_key": 2, "CamelCase": {"innerKey": 3}},
+        {"pairs": (1, 2), "unique": {1, 2}, "empty_dict": {}},
+    ]
+
+    @pytest.mark.parametrize("config_dict", CASES)
+    def test_matches_tree_materializer(self, config_dict: dict) -> None:
+        expected = tree_to_config_obj(True, tree_parser(config_dict))
+        result = dict_to_config_obj(True, config_dict)
+        assert result == expected
+        assert type(result) is type(expected)
+        assert repr(result) == repr(expected)
+
+    def test_unsupported_iterable(self) -> None:
+        with pytest.raises(NotIterable):
+            dict_to_config_obj(True, {"a": frozenset({1})})
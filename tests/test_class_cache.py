@@ -0,0 +1,93 @@
+"""
+Tests for heracless.utils.class_cache
+"""
+
+from dataclasses import fields, is_dataclass
+
+import pytest
+
+from heracless.utils import from_dict
+from heracless.utils.class_cache import ClassCache, class_cache_clear, class_cache_info, config_class
+
+
+class TestClassCache:
+    """Test the bounded LRU class cache"""
+
+    def test_same_shape_returns_same_class(self) -> None:
+        cache = ClassCache()
+        first = cache.get_or_create("Point", (("x", int), ("y", int)))
+        second = cache.get_or_create("Point", (("x", int), ("y", int)))
+        assert first is second
+        assert is_dataclass(first)
+        assert [f.name for f in fields(first)] == ["x", "y"]
+
+    def test_different_shapes_return_different_classes(self) -> None:
+        cache = ClassCache()
+        ints = cache.get_or_create("Point", (("x", int), ("y", int)))
+        floats = cache.get_or_create("Point", (("x", float), ("y", float)))
+        renamed = cache.get_or_create("Point", (("x", int), ("z", int)))
+        assert len({ints, floats, renamed}) == 3
+
+    def test_frozen_is_part_of_the_key(self) -> None:
+        cache = ClassCache()
+        frozen = cache.get_or_create("Point", (("x", int),), frozen=True)
+        mutable = cache.get_or_create("Point", (("x", int),), frozen=False)
+        assert frozen is not mutable
+        with pytest.raises(Exception):
+            frozen(1).x = 2  # type: ignore[attr-defined]
+
+    def test_hit_miss_counters(self) -> None:
+        cache = ClassCache()
+        cache.get_or_create("A", (("a", int),))
+        cache.get_or_create("A", (("a", int),))
+        cache.get_or_create("B", (("b", int),))
+        info = cache.cache_info()
+        assert info.hits == 1
+        assert info.misses == 2
+        assert info.currsize == 2
+
+    def test_lru_eviction(self) -> None:
+        cache = ClassCache(maxsize=2)
+        a = cache.get_or_create("A", (("a", int),))
+        cache.get_or_create("B", (("b", int),))
+        cache.get_or_create("A", (("a", int),))  # A is now most recently used
+        cache.get_or_create("C", (("c", int),))  # evicts B
+        assert cache.cache_info().currsize == 2
+        assert cache.get_or_create("A", (("a", int),)) is a
+        misses = cache.cache_info().misses
+        cache.get_or_create("B", (("b", int),))
+        assert cache.cache_info().misses == misses + 1
+
+    def test_cache_clear(self) -> None:
+        cache = ClassCache()
+        cache.get_or_create("A", (("a", int),))
+        cache.cache_clear()
+        assert cache.cache_info() == (0, 0, cache.maxsize, 0)
+
+    def test_invalid_maxsize(self) -> None:
+        with pytest.raises(ValueError):
+            ClassCache(maxsize=0)
+
+
+class TestSharedConfigClasses:
+    """Test that generated config objects share their classes"""
+
+    def test_list_items_share_class(self) -> None:
+        config = from_dict({"product": [{"sku": "a", "price": 1.0}, {"sku": "b", "price": 2.0}]})
+        assert type(config.product[0]) is type(config.product[1])
+        assert config.product[1].sku == "b"
+
+    def test_reloads_share_classes(self) -> None:
+        first = from_dict({"db": {"host": "localhost", "port": 5432}})
+        second = from_dict({"db": {"host": "example.org", "port": 1}})
+        assert type(first) is type(second)
+        assert type(first.db) is type(second.db)
+        assert second.db.host == "example.org"
+
+    def test_module_level_statistics(self) -> None:
+        class_cache_clear()
+        config_class("Stats", (("value", int),))
+        config_class("Stats", (("value", int),))
+        info = class_cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
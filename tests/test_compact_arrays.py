@@ -0,0 +1,170 @@
+"""
+Tests for compact array storage of homogeneous scalar lists
+"""
+
+import copy
+import pickle
+from array import array
+from pathlib import Path
+
+import pytest
+
+from heracless.fight import fight
+from heracless.utils import from_dict
+from heracless.utils.cfg_tree import schema_fingerprint, tree_parser, tree_to_string_translator
+from heracless.utils.compact_arrays import NUMPY_AVAILABLE, FrozenArray, compact_array, resolve_array_mode, scalar_type
+
+requires_numpy = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+
+CONFIG_DICT = {
+    "weights": [0.5, 1.5, 2.5],
+    "ids": [1, 2, 3],
+    "flags": [True, False],
+    "names": ["a", "b"],
+    "mixed": [1, 2.0],
+    "empty": [],
+    "matrix": [[1.0, 2.0], [3.0, 4.0]],
+    "huge": [2**70],
+}
+
+
+class TestScalarDetection:
+    """Test detection of homogeneous lists"""
+
+    def test_scalar_type(self) -> None:
+        assert scalar_type([1, 2]) is int
+        assert scalar_type([1.0]) is float
+        assert scalar_type([True, False]) is bool
+        assert scalar_type([1, True]) is None
+        assert scalar_type([1, 2.0]) is None
+        assert scalar_type([]) is None
+        assert scalar_type([2**63]) is None
+
+    def test_resolve_array_mode(self) -> None:
+        assert resolve_array_mode(None) is None
+        assert resolve_array_mode("array") == "array"
+        assert resolve_array_mode("auto") == ("numpy" if NUMPY_AVAILABLE else "array")
+        with pytest.raises(ValueError):
+            resolve_array_mode("list")
+
+    def test_bools_stay_tuples_in_array_mode(self) -> None:
+        assert compact_array([True, False], "array") is None
+
+
+class TestArrayMode:
+    """Test array.array storage"""
+
+    def test_runtime_values(self) -> None:
+        config = from_dict(CONFIG_DICT, arrays="array")
+        assert config.weights == array("d", [0.5, 1.5, 2.5])
+        assert config.ids == array("q", [1, 2, 3])
+        assert config.flags == (True, False)
+        assert config.names == ("a", "b")
+        assert config.mixed == (1, 2.0)
+        assert config.empty == ()
+        assert config.matrix == (array("d", [1.0, 2.0]), array("d", [3.0, 4.0]))
+        assert config.huge == (2**70,)
+
+    def test_default_keeps_tuples(self) -> None:
+        assert from_dict(CONFIG_DICT).weights == (0.5, 1.5, 2.5)
+
+    def test_arrays_are_read_only(self) -> None:
+        config = from_dict(CONFIG_DICT, arrays="array")
+        assert isinstance(config.ids, FrozenArray)
+        with pytest.raises(TypeError, match="read-only"):
+            config.ids[0] = 99
+        with pytest.raises(TypeError, match="read-only"):
+            config.ids.append(4)
+        with pytest.raises(TypeError, match="read-only"):
+            config.weights += array("d", [1.0])
+        assert config.ids == array("q", [1, 2, 3])
+
+    def test_configs_stay_hashable(self) -> None:
+        config = from_dict(CONFIG_DICT, arrays="array")
+        assert hash(config) == hash(from_dict(CONFIG_DICT, arrays="array"))
+        assert hash(FrozenArray("q", [1, 2])) != hash(FrozenArray("d", [1.0, 2.0]))
+
+    def test_pickle_and_copy(self) -> None:
+        config = from_dict(CONFIG_DICT, arrays="array")
+        restored = pickle.loads(pickle.dumps(config.ids))
+        assert type(restored) is FrozenArray and restored == config.ids
+        assert copy.deepcopy(config.ids) is config.ids
+
+    def test_stub_types(self) -> None:
+        stub = tree_to_string_translator(True, tree_parser(CONFIG_DICT), arrays="array")
+        assert "from array import array\n" in stub
+        assert "    weights: array[float]\n" in stub
+        assert "    ids: array[int]\n" in stub
+        assert "    flags: tuple[bool]\n" in stub
+        assert "    matrix: tuple[array[float]]\n" in stub
+        assert "    huge: tuple[int]\n" in stub
+
+    def test_fingerprint_depends_on_mode(self) -> None:
+        tree = tree_parser(CONFIG_DICT)
+        assert schema_fingerprint(True, tree, arrays="array") != schema_fingerprint(True, tree)
+
+    def test_fight(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        stub = tmp_path / "types.pyi"
+        config_file.write_text("weights: [0.1, 0.2]\nrows: [[1, 2], [3, 4]]\n")
+        config = fight(config_file, stub, frozen=True, arrays="array")
+        assert config.weights == array("d", [0.1, 0.2])
+        assert "    weights: array[float]\n" in stub.read_text()
+
+
+@requires_numpy
+class TestNumpyMode:
+    """Test NumPy storage"""
+
+    def test_runtime_values(self) -> None:
+        import numpy
+
+        config = from_dict(CONFIG_DICT, arrays="numpy")
+        assert config.weights.dtype == numpy.float64
+        assert config.ids.dtype == numpy.int64
+        assert config.flags.dtype == numpy.bool_
+        assert config.matrix.shape == (2, 2)
+        assert config.names == ("a", "b")
+        assert config.huge == (2**70,)
+
+    def test_arrays_are_read_only(self) -> None:
+        config = from_dict(CONFIG_DICT, arrays="numpy")
+        with pytest.raises(ValueError):
+            config.weights[0] = 1.0
+
+    def test_configs_compare_and_hash(self) -> None:
+        config = from_dict(CONFIG_DICT, arrays="numpy")
+        same = from_dict(CONFIG_DICT, arrays="numpy")
+        assert config == same
+        assert hash(config) == hash(same)
+        assert len({config, same}) == 1
+        assert config != from_dict({**CONFIG_DICT, "weights": [0.5, 0.25]}, arrays="numpy")
+
+    def test_derived_arrays_are_plain(self) -> None:
+        import numpy
+
+        config = from_dict(CONFIG_DICT, arrays="numpy")
+        assert type(config.weights * 2) is numpy.ndarray
+        assert type(config.matrix[0]) is numpy.ndarray
+        assert list(numpy.equal(config.weights, config.weights)) == [True] * len(config.weights)
+        copied = config.weights.copy()
+        copied[0] = 1.0
+        assert config.weights[0] != 1.0
+
+    def test_pickle_keeps_arrays_read_only(self) -> None:
+        config = from_dict(CONFIG_DICT, arrays="numpy")
+        restored = pickle.loads(pickle.dumps(config))
+        assert restored == config
+        assert not restored.weights.flags.writeable
+
+    def test_ragged_rows_stay_separate(self) -> None:
+        config = from_dict({"rows": [[1.0, 2.0], [3.0]]}, arrays="numpy")
+        assert isinstance(config.rows, tuple)
+        assert config.rows[1].shape == (1,)
+
+    def test_stub_types(self) -> None:
+        stub = tree_to_string_translator(True, tree_parser(CONFIG_DICT), arrays="numpy")
+        assert "import numpy\nimport numpy.typing\n" in stub
+        assert "    weights: numpy.typing.NDArray[numpy.float64]\n" in stub
+        assert "    flags: numpy.typing.NDArray[numpy.bool_]\n" in stub
+        assert "    matrix: numpy.typing.NDArray[numpy.float64]\n" in stub
@@ -0,0 +1,127 @@
+"""
+Tests for ahead of time compilation of configs into python modules
+"""
+
+import os
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from heracless.cli_tool import run_cli
+from heracless.fight import fight
+from heracless.utils.compiler import compile_config, load_compiled, source_hash
+from heracless.utils.load_func_template import load_config
+
+TEST_DIR = Path(__file__).parent.resolve() / Path("./test_config.yaml")
+
+
+def as_plain(value: Any) -> Any:
+    """Convert dataclass instances into plain dicts for comparison"""
+    return asdict(value) if is_dataclass(value) and not isinstance(value, type) else value
+
+
+class TestCompileConfig:
+    """Test compile_config and load_compiled"""
+
+    def test_compiled_config_matches_fight(self, tmp_path: Path) -> None:
+        module = compile_config(TEST_DIR, tmp_path / "compiled_cfg.py")
+        compiled = load_compiled(module, TEST_DIR)
+        assert compiled is not None
+        assert as_plain(compiled) == as_plain(fight(TEST_DIR, None, frozen=True))
+
+    def test_values_and_types(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            "day: 2001-01-23\n"
+            "stamp: 2001-12-14 21:59:43\n"
+            "empty: []\n"
+            "nested: [[1, 2], [3]]\n"
+            "ratio: .inf\n"
+            "db:\n  name: main\n"
+            "cache:\n  db:\n    size: 3\n"
+        )
+        compiled = load_compiled(compile_config(config_file, tmp_path / "cfg_types.py"), config_file)
+        assert compiled.day == date(2001, 1, 23)
+        assert compiled.stamp == datetime(2001, 12, 14, 21, 59, 43)
+        assert compiled.empty == ()
+        assert compiled.nested == ((1, 2), (3,))
+        assert compiled.ratio == float("inf")
+        # same key with different shapes gets separate classes
+        assert compiled.db.name == "main"
+        assert compiled.cache.db.size == 3
+        assert type(compiled.db) is not type(compiled.cache.db)
+
+    def test_compiled_config_is_frozen(self, tmp_path: Path) -> None:
+        compiled = load_compiled(compile_config(TEST_DIR, tmp_path / "cfg_frozen.py"), TEST_DIR)
+        with pytest.raises(AttributeError):
+            compiled.invoice = 1  # type: ignore[misc]
+
+    def test_missing_module(self, tmp_path: Path) -> None:
+        assert load_compiled(tmp_path / "missing.py") is None
+
+    def test_stale_module(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("port: 1\n")
+        module = compile_config(config_file, tmp_path / "cfg_stale.py")
+        config_file.write_text("port: 2\n")
+        assert load_compiled(module, config_file) is None
+        assert load_compiled(module).port == 1
+
+    def test_frozen_mismatch(self, tmp_path: Path) -> None:
+        module = compile_config(TEST_DIR, tmp_path / "cfg_unfrozen.py", frozen=False)
+        assert load_compiled(module, TEST_DIR, frozen=True) is None
+        assert load_compiled(module, TEST_DIR, frozen=False) is not None
+
+    def test_recompile_is_picked_up(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        module = tmp_path / "cfg_recompile.py"
+        config_file.write_text("port: 1\n")
+        compile_config(config_file, module)
+        assert load_compiled(module, config_file).port == 1
+        config_file.write_text("port: 2\n")
+        compile_config(config_file, module)
+        stat = module.stat()
+        os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert load_compiled(module, config_file).port == 2
+
+    def test_source_hash_stored(self, tmp_path: Path) -> None:
+        module = compile_config(TEST_DIR, tmp_path / "cfg_hash.py")
+        assert f'SOURCE_HASH = "{source_hash(TEST_DIR)}"' in module.read_text()
+
+    def test_empty_config(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "empty.yaml"
+        config_file.write_text("")
+        with pytest.raises(ValueError):
+            compile_config(config_file, tmp_path / "cfg_empty.py")
+
+
+class TestCompileIntegration:
+    """Test the --compile CLI option and the template fallback"""
+
+    def test_cli_compile(self, tmp_path: Path) -> None:
+        module = tmp_path / "cfg_cli.py"
+        with patch("sys.argv", ["heracless", str(TEST_DIR), "--compile", str(module)]):
+            run_cli()
+        assert load_compiled(module, TEST_DIR) is not None
+
+    def test_cli_rejects_non_python_target(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        with patch("sys.argv", ["heracless", str(TEST_DIR), "--compile", str(tmp_path / "cfg.txt")]):
+            run_cli()
+        assert "must be a Python module" in capsys.readouterr().out
+        assert not (tmp_path / "cfg.txt").exists()
+
+    def test_template_uses_compiled_module(self, tmp_path: Path) -> None:
+        module = compile_config(TEST_DIR, tmp_path / "cfg_template.py")
+        config = load_config(TEST_DIR, stub_dump=False, compiled_path=module)
+        assert config is load_compiled(module, TEST_DIR)
+
+    def test_template_falls_back_when_stale(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("port: 1\n")
+        module = compile_config(config_file, tmp_path / "cfg_fallback.py")
+        config_file.write_text("port: 2\n")
+        assert load_config(config_file, stub_dump=False, compiled_path=module).port == 2
@@ -0,0 +1,131 @@
+"""
+Tests for lazy multi-document loading (load_config_all) in heracless.utils.documents
+"""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from heracless import load_config_all
+from heracless.utils.cfg_tree import dict_to_config_obj
+from heracless.utils.documents import load_document_batch, split_documents
+from heracless.utils.exceptions import YamlSyntaxError
+
+MULTI_YAML = """\
+# tenants
+a: 1
+b: [1, 2]
+---
+a: 2
+b: [3]
+--- {a: 3, b: []}
+---
+...
+%YAML 1.1
+---
+values: !!set {q}
+empty:
+...
+---
+routes:
+  - {path: /a, weight: 1}
+  - {path: /b, weight: 2}
+"""
+
+
+@pytest.fixture
+def multi_path(tmp_path: Path) -> Path:
+    path = tmp_path / "multi.yaml"
+    path.write_text(MULTI_YAML)
+    return path
+
+
+def expected_configs(**options: object) -> list:
+    return [
+        None if document is None else dict_to_config_obj(True, document, **options)
+        for document in yaml.full_load_all(MULTI_YAML)
+    ]
+
+
+class TestSplitDocuments:
+    """Test splitting YAML text at document markers"""
+
+    def test_every_part_loads_like_the_whole(self) -> None:
+        parts = list(split_documents(MULTI_YAML.splitlines(keepends=True)))
+        documents = [document for part in parts for document in yaml.full_load_all(part)]
+        assert documents == list(yaml.full_load_all(MULTI_YAML))
+
+    def test_directives_move_to_next_document(self) -> None:
+        parts = list(split_documents(["a: 1\n", "...\n", "%YAML 1.1\n", "---\n", "b: 2\n"]))
+        assert parts == ["a: 1\n...\n", "%YAML 1.1\n---\nb: 2\n"]
+
+    def test_markers_need_line_start(self) -> None:
+        parts = list(split_documents(["a: |\n", "  ---\n", "b: x---\n", "---x: 1\n"]))
+        assert len(parts) == 1
+
+
+class TestLoadDocumentBatch:
+    """Test the worker task of parallel loading"""
+
+    def test_returns_plain_values(self) -> None:
+        assert load_document_batch(MULTI_YAML, 0) == list(yaml.full_load_all(MULTI_YAML))
+
+    def test_error_index_counts_from_batch_start(self) -> None:
+        with pytest.raises(ValueError, match="Document 5 is a list"):
+            load_document_batch("a: 1\n---\n- 1\n", 4)
+
+
+class TestLoadConfigAll:
+    """Test load_config_all"""
+
+    def test_documents_in_order(self, multi_path: Path) -> None:
+        assert list(load_config_all(multi_path)) == expected_configs()
+
+    def test_lazy(self, multi_path: Path) -> None:
+        documents = load_config_all(multi_path)
+        assert next(documents).a == 1
+        assert next(documents).b == (3,)
+        documents.close()
+
+    def test_classes_shared_across_documents(self, multi_path: Path) -> None:
+        configs = list(load_config_all(multi_path))
+        assert type(configs[0]) is type(configs[1]) is type(configs[2])
+        assert type(configs[0]) is not type(configs[-1])
+        assert type(configs[0]).__name__ == "Config"
+
+    def test_options(self, multi_path: Path) -> None:
+        configs = list(load_config_all(multi_path, tables=True, slots=True))
+        assert configs == expected_configs(tables=True, slots=True)
+        assert configs[-1].routes.weight[1] == 2
+
+    def test_worker_processes(self, multi_path: Path) -> None:
+        configs = list(load_config_all(multi_path, workers=2))
+        assert configs == expected_configs()
+        assert type(configs[0]) is type(next(load_config_all(multi_path)))
+
+    def test_many_documents_with_workers(self, tmp_path: Path) -> None:
+        path = tmp_path / "tenants.yaml"
+        path.write_text("".join(f"---\ntenant: t{index}\nlimits: {{cpu: {index}}}\n" for index in range(3000)))
+        configs = list(load_config_all(path, workers=2))
+        assert [config.tenant for config in configs] == [f"t{index}" for index in range(3000)]
+        assert len({type(config) for config in configs}) == 1
+
+    def test_non_mapping_document(self, tmp_path: Path) -> None:
+        path = tmp_path / "list.yaml"
+        path.write_text("a: 1\n---\n- 1\n- 2\n")
+        documents = load_config_all(path)
+        assert next(documents).a == 1
+        with pytest.raises(ValueError, match="Document 1 is a list"):
+            next(documents)
+
+    def test_syntax_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "broken.yaml"
+        path.write_text("a: 1\n---\nb: [1\n")
+        with pytest.raises(YamlSyntaxError):
+            list(load_config_all(path))
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "empty.yaml"
+        path.write_text("")
+        assert list(load_config_all(path)) == []
@@ -0,0 +1,140 @@
+"""
+Tests for building configs directly from the YAML event stream in heracless.utils.event_builder
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+import yaml
+
+from heracless.fight import fight
+from heracless.utils.cfg_tree import dict_to_config_obj, tree_parser, tree_to_string_translator
+from heracless.utils.event_builder import (
+    EventBuilder,
+    UnsupportedEvent,
+    config_builder,
+    parse_events,
+    tree_event_builder,
+)
+from heracless.utils.exceptions import YamlSyntaxError
+from heracless.utils.record_table import RecordTable
+
+TEST_DIR = Path(__file__).parent.resolve() / Path("./test_config.yaml")
+
+ANCHOR_YAML = """
+defaults: &defaults
+  timeout: 5
+  retries: [1, 2, 3]
+primary:
+  <<: *defaults
+  host: db1
+  timeout: 10
+replica:
+  <<: [*defaults, {host: db2, lag: 0.5}]
+shared: *defaults
+routes:
+  - path: /a
+    weight: 1
+  - path: /b
+    weight: 2
+Upper_Key: 1
+Upper_Key: 2
+stamp: 2024-01-01
+"""
+
+
+def build(text: str, builder: EventBuilder, plain: bool = False) -> object:
+    return builder.build(parse_events(io.StringIO(text)), plain=plain)
+
+
+class TestEventBuilder:
+    """Test that streamed configs match configs built from the loaded dict"""
+
+    @pytest.mark.parametrize(
+        "options",
+        [{}, {"slots": True}, {"arrays": "array"}, {"tables": True}, {"arrays": "array", "tables": True}],
+    )
+    def test_config_matches_dict_build(self, options: dict) -> None:
+        expected = dict_to_config_obj(True, yaml.safe_load(ANCHOR_YAML), **options)
+        assert build(ANCHOR_YAML, config_builder(True, **options)) == expected
+
+    def test_test_config_matches_dict_build(self) -> None:
+        with open(TEST_DIR) as file:
+            text = file.read()
+        assert build(text, config_builder(False)) == dict_to_config_obj(False, yaml.safe_load(text))
+
+    def test_plain_build_matches_safe_load(self) -> None:
+        assert build(ANCHOR_YAML, config_builder(True), plain=True) == yaml.safe_load(ANCHOR_YAML)
+
+    def test_merge_order_and_duplicate_keys(self) -> None:
+        config = build(ANCHOR_YAML, config_builder(True))
+        assert config.primary.timeout == 10
+        assert config.primary.retries == (1, 2, 3)
+        assert config.replica.host == "db2"
+        assert config.upper_key == 2
+
+    def test_tables_from_stream(self) -> None:
+        config = build(ANCHOR_YAML, config_builder(True, tables=True))
+        assert isinstance(config.routes, RecordTable)
+        assert config.routes[1].weight == 2
+
+    def test_tree_matches_tree_parser(self) -> None:
+        streamed = build(ANCHOR_YAML, tree_event_builder())
+        expected = tree_parser(yaml.safe_load(ANCHOR_YAML))
+        assert tree_to_string_translator(True, streamed) == tree_to_string_translator(True, expected)
+
+    @pytest.mark.parametrize(
+        "text",
+        ["a: !!set {x, y}", "a: !custom 1", "- 1\n- 2", "a: 1\n---\nb: 2", "a: *missing", "? [1, 2]\n: 3"],
+    )
+    def test_unsupported_documents(self, text: str) -> None:
+        with pytest.raises(UnsupportedEvent):
+            build(text, config_builder(True))
+
+    def test_empty_stream(self) -> None:
+        assert build("", config_builder(True)) is None
+
+    def test_bounded_reads(self) -> None:
+        sizes: list[int] = []
+
+        class CountingStream(io.StringIO):
+            def read(self, size: int = -1) -> str:  # type: ignore[override]
+                sizes.append(size)
+                return super().read(size)
+
+        text = "items:\n" + "".join(f"  - value_{index}\n" for index in range(20000))
+        config = config_builder(True).build(parse_events(CountingStream(text)))
+        assert len(config.items) == 20000
+        assert sizes and all(0 < size <= 16384 for size in sizes)
+
+
+class TestStreamLoading:
+    """Test fight(stream=True)"""
+
+    @pytest.mark.parametrize("options", [{}, {"lazy": True}, {"tables": True}, {"slots": True}])
+    def test_same_config_as_regular_load(self, options: dict) -> None:
+        expected = fight(TEST_DIR, None, frozen=True, **options)
+        assert fight(TEST_DIR, None, frozen=True, stream=True, **options) == expected
+
+    def test_same_stub_as_regular_load(self, tmp_path: Path) -> None:
+        regular, streamed = tmp_path / "regular.pyi", tmp_path / "streamed.pyi"
+        fight(TEST_DIR, regular, frozen=True)
+        fight(TEST_DIR, streamed, frozen=True, stream=True)
+        assert streamed.read_text() == regular.read_text()
+
+    def test_falls_back_for_tags(self, tmp_path: Path) -> None:
+        path = tmp_path / "tags.yaml"
+        path.write_text("values: !!set {a, b}\nname: x\n")
+        assert fight(path, None, frozen=True, stream=True) == fight(path, None, frozen=True)
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "empty.yaml"
+        path.write_text("")
+        assert fight(path, None, frozen=True, stream=True) is None
+
+    def test_syntax_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "broken.yaml"
+        path.write_text("a: [1, 2\nb: 3\n")
+        with pytest.raises(YamlSyntaxError):
+            fight(path, None, frozen=True, stream=True)
@@ -0,0 +1,158 @@
+"""
+Tests for assembling configs from several files in heracless.utils.include
+"""
+
+import threading
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from heracless.fight import fight, load_as_dict
+from heracless.loaders import get_loader, libyaml_load, python_load
+from heracless.utils.exceptions import IncludeError, YamlSyntaxError
+from heracless.utils.include import Include, include_loader, include_sites, load_with_includes
+from heracless.utils.snapshot import loader_id
+
+
+def write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    write(tmp_path / "frag" / "base.yaml", "name: base\nlevel: 1\nitem: !include item.yaml\n")
+    write(tmp_path / "frag" / "extra.yaml", "extra: true\n")
+    write(tmp_path / "frag" / "db.yaml", "host: h\nport: 1\n")
+    write(tmp_path / "frag" / "item.yaml", "x: 1\n")
+    return write(
+        tmp_path / "root.yaml",
+        "include: [frag/base.yaml, frag/extra.yaml]\nname: root\ndb: !include frag/db.yaml\n"
+        "items: [!include frag/item.yaml, 2]\n",
+    )
+
+
+def load_fragment(path: Path) -> object:
+    return load_as_dict(path, include_loader(get_loader().load))
+
+
+class TestIncludeLoader:
+    """Test parsing of !include tags"""
+
+    def test_placeholder(self) -> None:
+        load = include_loader(get_loader().load)
+        assert load(StringIO("a: !include b.yaml\nc: [1, !include d.yaml]\n")) == {
+            "a": Include("b.yaml"),
+            "c": [1, Include("d.yaml")],
+        }
+
+    def test_documents_without_tag_use_backend(self) -> None:
+        calls = []
+
+        def backend(stream: StringIO) -> dict:
+            calls.append(stream.read())
+            return {"a": 1}
+
+        assert include_loader(backend)(StringIO("a: 1\n")) == {"a": 1}
+        assert calls == ["a: 1\n"]
+
+    def test_snapshots_of_include_loads_stay_separate(self, root: Path, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        assert fight(root, None, True, cache_dir=cache_dir, includes=True).db.host == "h"
+        with pytest.raises(YamlSyntaxError):  # !include is an unknown tag without includes=True
+            fight(root, None, True, cache_dir=cache_dir)
+        assert fight(root, None, True, cache_dir=cache_dir, includes=True).db.port == 1
+
+    def test_snapshot_key_names_backend(self) -> None:
+        include_python = loader_id(include_loader(python_load))
+        assert include_python == "heracless.utils.include.load_include_tags(heracless.loaders.python_load)"
+        assert include_python != loader_id(include_loader(libyaml_load))
+        assert include_python != loader_id(python_load)
+
+    def test_include_sites(self) -> None:
+        shared = {"x": Include("x.yaml")}
+        sites = include_sites({"a": shared, "b": shared, "c": [Include("c.yaml")]})
+        assert sorted(site.include.path for site in sites) == ["c.yaml", "x.yaml"]
+        assert include_sites("scalar") == []
+
+
+class TestLoadWithIncludes:
+    """Test resolution of included files"""
+
+    def test_assembled_config(self, root: Path) -> None:
+        config = fight(root, None, True, includes=True)
+        assert config.name == "root"  # own keys win over listed files
+        assert config.level == 1
+        assert config.extra is True
+        assert config.item.x == 1
+        assert config.db.port == 1
+        assert config.items[0].x == 1
+
+    def test_merge_order(self, root: Path) -> None:
+        assembled = load_with_includes(root, load_fragment)
+        assert list(assembled) == ["name", "level", "item", "extra", "db", "items"]
+
+    def test_each_file_parsed_once(self, root: Path) -> None:
+        loaded: list[Path] = []
+        lock = threading.Lock()
+
+        def counting(path: Path) -> object:
+            with lock:
+                loaded.append(path)
+            return load_fragment(path)
+
+        load_with_includes(root, counting)
+        assert len(loaded) == len(set(loaded)) == 5
+
+    def test_parallel_workers(self, tmp_path: Path) -> None:
+        for index in range(12):
+            write(tmp_path / f"f{index}.yaml", f"section_{index}: {{value: {index}}}\n")
+        root = write(tmp_path / "root.yaml", "include:\n" + "".join(f"  - f{i}.yaml\n" for i in range(12)))
+        threads = set()
+
+        def recording(path: Path) -> object:
+            threads.add(threading.current_thread().name)
+            return load_fragment(path)
+
+        assembled = load_with_includes(root, recording, workers=4)
+        assert assembled == {f"section_{i}": {"value": i} for i in range(12)}
+        assert any(name.startswith("heracless-include") for name in threads)
+
+    def test_cycle(self, root: Path) -> None:
+        write(root.parent / "frag" / "extra.yaml", "include: ../root.yaml\n")
+        with pytest.raises(IncludeError, match="include cycle") as error:
+            fight(root, None, True, includes=True)
+        assert error.value.chain[0] == error.value.chain[-1]
+
+    def test_self_include(self, tmp_path: Path) -> None:
+        path = write(tmp_path / "self.yaml", "me: !include self.yaml\n")
+        with pytest.raises(IncludeError, match="include cycle"):
+            fight(path, None, True, includes=True)
+
+    def test_missing_file(self, root: Path) -> None:
+        write(root.parent / "frag" / "extra.yaml", "x: !include nope.yaml\n")
+        with pytest.raises(IncludeError, match="file not found"):
+            fight(root, None, True, includes=True)
+        assert not (root.parent / "frag" / "nope.yaml").exists()
+
+    def test_listed_file_must_be_mapping(self, root: Path) -> None:
+        write(root.parent / "frag" / "extra.yaml", "- 1\n- 2\n")
+        with pytest.raises(IncludeError, match="must be a mapping"):
+            fight(root, None, True, includes=True)
+
+    def test_include_key_is_regular_without_includes(self, root: Path) -> None:
+        write(root, "include: [a.yaml]\nname: x\n")
+        assert fight(root, None, True).include == ("a.yaml",)
+
+    def test_select_after_assembly(self, root: Path) -> None:
+        config = fight(root, None, True, includes=True, select=["db"])
+        assert vars(config).keys() == {"db"}
+
+    def test_stub_of_assembled_config(self, root: Path, tmp_path: Path) -> None:
+        stub = tmp_path / "config.pyi"
+        fight(root, stub, True, includes=True)
+        text = stub.read_text()
+        assert "class Db:" in text
+        assert "include" not in text
@@ -0,0 +1,95 @@
+"""
+Tests for incremental config generation with structural sharing
+"""
+
+from dataclasses import asdict
+from pathlib import Path
+
+from heracless.fight import reload_config
+from heracless.utils.cfg_tree import tree_parser, tree_to_config_obj, tree_to_config_obj_incremental
+from heracless.watch import ConfigHandle
+
+BASE = {
+    "database": {"host": "localhost", "port": 5432, "options": {"ssl": True}},
+    "server": {"workers": 4},
+    "product": [{"sku": "a", "price": 1.0}, {"sku": "b", "price": 2.0}],
+    "name": "shop",
+}
+
+
+def rebuild(old: dict, new: dict) -> tuple:
+    old_tree, new_tree = tree_parser(old), tree_parser(new)
+    old_obj = tree_to_config_obj(True, old_tree)
+    return old_obj, tree_to_config_obj_incremental(True, new_tree, old_tree, old_obj)
+
+
+class TestIncrementalConfigObj:
+    """Test tree_to_config_obj_incremental"""
+
+    def test_unchanged_returns_previous(self) -> None:
+        old, new = rebuild(BASE, dict(BASE))
+        assert new is old
+
+    def test_unchanged_subtrees_are_shared(self) -> None:
+        changed = {**BASE, "server": {"workers": 8}}
+        old, new = rebuild(BASE, changed)
+        assert new is not old
+        assert new.database is old.database
+        assert new.product is old.product
+        assert new.server is not old.server
+        assert new.server.workers == 8
+
+    def test_only_changed_path_is_rebuilt(self) -> None:
+        changed = {**BASE, "database": {**BASE["database"], "port": 1}}
+        old, new = rebuild(BASE, changed)
+        assert new.database is not old.database
+        assert new.database.options is old.database.options
+        assert new.server is old.server
+
+    def test_list_items_are_shared(self) -> None:
+        changed = {**BASE, "product": [BASE["product"][0], {"sku": "b", "price": 3.0}, {"sku": "c", "price": 4.0}]}
+        old, new = rebuild(BASE, changed)
+        assert new.product[0] is old.product[0]
+        assert new.product[1] is not old.product[1]
+        assert new.product[1].price == 3.0
+        assert new.product[2].sku == "c"
+
+    def test_matches_full_rebuild(self) -> None:
+        changed = {"database": {"host": "db", "port": "5432"}, "extra": [1, 2], "name": "shop"}
+        _, new = rebuild(BASE, changed)
+        assert asdict(new) == asdict(tree_to_config_obj(True, tree_parser(changed)))
+        assert isinstance(new.database.port, str)
+
+    def test_type_change_is_not_shared(self) -> None:
+        old, new = rebuild({"a": {"b": 1}}, {"a": {"b": 1.0}})
+        assert new.a is not old.a
+        assert isinstance(new.a.b, float)
+
+
+class TestReloadConfig:
+    """Test reload_config and its use in ConfigHandle"""
+
+    def test_reload_config_shares_subtrees(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("database:\n  port: 1\nserver:\n  workers: 4\n")
+        first = reload_config(config_file, None)
+        config_file.write_text("database:\n  port: 1\nserver:\n  workers: 8\n")
+        second = reload_config(config_file, first)
+        assert first is not None and second is not None
+        assert second.config.database is first.config.database
+        assert second.config.server.workers == 8
+
+    def test_empty_config(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("")
+        assert reload_config(config_file, None) is None
+
+    def test_handle_reload_shares_subtrees(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("database:\n  port: 1\nserver:\n  workers: 4\n")
+        handle = ConfigHandle(config_file, watch=False)
+        old = handle.config
+        config_file.write_text("database:\n  port: 1\nserver:\n  workers: 16\n")
+        assert handle.reload()
+        assert handle.config.database is old.database
+        assert handle.config.server.workers == 16
@@ -0,0 +1,111 @@
+"""
+Tests for lazy materialization of config sections in heracless.utils.lazy
+"""
+
+import pickle
+import threading
+from dataclasses import is_dataclass
+from pathlib import Path
+
+import pytest
+
+from heracless.fight import fight
+from heracless.utils import as_dict, from_dict, get
+from heracless.utils.exceptions import NotIterable
+from heracless.utils.lazy import LazySection, is_pending
+
+TEST_DIR = Path(__file__).parent.resolve() / Path("./test_config.yaml")
+
+CONFIG_DICT = {
+    "database": {"host": "localhost", "port": 5432, "pool": {"size": 5}},
+    "routes": [{"path": "/a"}, {"path": "/b"}],
+    "tags": ["x", "y"],
+    "name": "service",
+}
+
+
+class TestLazyConfig:
+    """Test lazy section materialization"""
+
+    def test_sections_are_pending_until_accessed(self) -> None:
+        config = from_dict(CONFIG_DICT, lazy=True)
+        assert all(is_pending(config, name) for name in ("database", "routes", "tags"))
+        assert not is_pending(config, "name")
+        assert config.database.pool.size == 5
+        assert not is_pending(config, "database")
+        assert is_pending(config, "routes")
+
+    def test_sections_become_real_dataclasses(self) -> None:
+        config = from_dict(CONFIG_DICT, lazy=True)
+        database = config.database
+        assert is_dataclass(database)
+        assert config.database is database
+        assert config.routes[1].path == "/b"
+        assert config.tags == ("x", "y")
+
+    def test_equal_to_eager_config(self) -> None:
+        lazy, eager = from_dict(CONFIG_DICT, lazy=True), from_dict(CONFIG_DICT)
+        assert lazy == eager
+        assert eager == lazy
+        assert hash(lazy) == hash(eager)
+        assert lazy != from_dict({**CONFIG_DICT, "name": "other"}, lazy=True)
+
+    def test_repr_and_as_dict(self) -> None:
+        eager = from_dict(CONFIG_DICT)
+        assert repr(from_dict(CONFIG_DICT, lazy=True)) == repr(eager)
+        assert as_dict(from_dict(CONFIG_DICT, lazy=True)) == as_dict(eager)
+        assert get(from_dict(CONFIG_DICT, lazy=True), "database.pool.size") == 5
+
+    def test_pickle_keeps_pending_sections_pending(self) -> None:
+        config = from_dict(CONFIG_DICT, lazy=True)
+        config.routes
+        restored = pickle.loads(pickle.dumps(config))
+        assert is_pending(restored, "database")
+        assert not is_pending(restored, "routes")
+        assert restored == from_dict(CONFIG_DICT)
+
+    def test_slots(self) -> None:
+        config = from_dict(CONFIG_DICT, lazy=True, slots=True)
+        assert config.database.port == 5432
+        assert not is_pending(config, "database")
+        assert config == from_dict(CONFIG_DICT, slots=True)
+
+    def test_built_section_is_stored_in_slot(self) -> None:
+        config = from_dict(CONFIG_DICT, lazy=True, slots=True)
+        database = config.database
+        assert object.__getattribute__(config, "database") is database  # the slot holds the section itself
+        assert config.database is database
+
+    def test_errors_surface_on_access(self) -> None:
+        config = from_dict({"broken": {"blob": b"bytes"}, "ok": 1}, lazy=True)
+        assert config.ok == 1
+        with pytest.raises(NotIterable):
+            config.broken
+
+    def test_concurrent_access_returns_one_object(self) -> None:
+        section = LazySection(lambda value: object(), 1)
+        results: list[object] = []
+        threads = [threading.Thread(target=lambda: results.append(section.materialize())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(result) for result in results}) == 1
+
+    def test_fight(self) -> None:
+        lazy = fight(TEST_DIR, None, frozen=True, lazy=True)
+        assert lazy == fight(TEST_DIR, None, frozen=True)
+
+
+class TestConfigPickling:
+    """Test pickling of eagerly built configs"""
+
+    def test_round_trip(self) -> None:
+        config = from_dict(CONFIG_DICT)
+        restored = pickle.loads(pickle.dumps(config))
+        assert restored == config
+        assert type(restored) is type(config)
+
+    def test_slots_round_trip(self) -> None:
+        config = from_dict(CONFIG_DICT, slots=True)
+        assert pickle.loads(pickle.dumps(config)) == config
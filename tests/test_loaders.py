@@ -0,0 +1,226 @@
+"""
+Tests for heracless.loaders
+"""
+
+from io import StringIO
+from pathlib import Path
+
+import pytest
+import yaml
+
+from heracless import loaders
+from heracless.fight import fight
+from heracless.loaders import (
+    LoaderBackend,
+    available_loaders,
+    get_loader,
+    last_backend,
+    needs_yaml11,
+    probe_loader,
+    register_loader,
+)
+from heracless.utils.cfg_tree import tree_parser
+
+
+@pytest.fixture
+def registry(monkeypatch: pytest.MonkeyPatch):  # type: ignore[no-untyped-def]
+    """Isolate registrations made by a test from the process wide registry"""
+    monkeypatch.setattr(loaders, "_REGISTRY", dict(loaders._REGISTRY))
+    probe_loader.cache_clear()
+    yield loaders._REGISTRY
+    probe_loader.cache_clear()
+
+
+TEST_DIR = Path(__file__).parent.resolve() / Path("./test_config.yaml")
+
+YAML11_DOCUMENTS = [
+    "quoted: '2001-01-23'\n",
+    'quoted: "2001-12-14 21:59:43.10 -5"\n',
+    "block: |-\n  2001-01-23\n",
+    "flags: [yes, No, on, OFF]\n",
+    "on: 1\n",
+    "octal: 017\n",
+    "prefixed: 0o17\n",
+    "underscore: 1_000\n",
+    "sexagesimal: 1:30\n",
+    "big: 18446744073709551616\n",
+    "small: -9223372036854775809\n",
+    "exponent: 1e3\n",
+    "unsigned_exponent: 1.5e3\n",
+    "infinity: inf\n",
+]
+
+DOCUMENTS = [
+    TEST_DIR.read_text(),
+    "a: 1\nb: 2.5\nc: true\nd: null\ne: [1, [2, 3]]\n",
+    "when: 2001-12-14 21:59:43.10 -5\nday: 2002-12-14\n",
+    "base: &b\n  x: 1\nchild:\n  <<: *b\n  y: 2\n",
+    "values: !!set {a, b}\n",
+    "empty: {}\nnone: []\n",
+    *YAML11_DOCUMENTS,
+    "mixed:\n  quoted: '2001-01-23'\n  flags: [yes, no, true]\n  ints: [0x1F, 0b11, 1_000, 017, 190:20:30]\n"
+    "  big: [123456789012345678901234567890, -123456789012345678901234567890]\n  floats: [1.5, -1.5e+3, .inf, 6.8523015e+5]\n",
+]
+
+
+def typed(value: object) -> object:
+    """value with the type of every scalar attached, so 1 != 1.0 != True"""
+    if isinstance(value, dict):
+        return {typed(key): typed(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [typed(item) for item in value]
+    if isinstance(value, float) and value != value:
+        return (float, "nan")
+    if isinstance(value, (set, frozenset)):
+        return {typed(item) for item in value}
+    return (type(value), value)
+
+
+class TestRegistry:
+    """Test backend registration and selection"""
+
+    def test_python_backend_always_available(self) -> None:
+        assert "python" in available_loaders()
+
+    def test_libyaml_available_when_compiled(self) -> None:
+        assert ("libyaml" in available_loaders()) == bool(yaml.__with_libyaml__)
+
+    def test_loaders_sorted_fastest_first(self) -> None:
+        loaders = available_loaders()
+        priorities = [get_loader(name).priority for name in loaders]
+        assert priorities == sorted(priorities, reverse=True)
+
+    def test_probe_selects_fastest_working_backend(self) -> None:
+        assert probe_loader() == available_loaders()[0]
+        assert get_loader().name == probe_loader()
+        assert get_loader("auto").name == probe_loader()
+
+    def test_unknown_loader(self) -> None:
+        with pytest.raises(ValueError):
+            get_loader("does-not-exist")
+
+    def test_register_loader(self, registry: dict[str, LoaderBackend]) -> None:
+        register_loader("custom", yaml.full_load, priority=1000)
+        assert available_loaders()[0] == "custom"
+        assert probe_loader() == "custom"
+        assert get_loader().load(StringIO("a: 1")) == {"a": 1}
+
+    def test_unavailable_loader(self, registry: dict[str, LoaderBackend]) -> None:
+        register_loader("unavailable", yaml.full_load, lambda: False, priority=1000)
+        assert "unavailable" not in available_loaders()
+        with pytest.raises(ValueError):
+            get_loader("unavailable")
+
+    def test_probe_skips_broken_backend(self, registry: dict[str, LoaderBackend]) -> None:
+        def broken(stream: object) -> object:
+            raise RuntimeError("broken")
+
+        register_loader("broken", broken, priority=1000)
+        assert available_loaders()[0] == "broken"
+        assert probe_loader() != "broken"
+
+
+class TestBackendParity:
+    """Test that every backend produces identical Trees"""
+
+    @pytest.mark.parametrize("name", available_loaders())
+    @pytest.mark.parametrize("document", DOCUMENTS)
+    def test_backend_matches_full_load(self, name: str, document: str) -> None:
+        result = get_loader(name).load(StringIO(document))
+        expected = yaml.full_load(document)
+        assert typed(result) == typed(expected)
+        assert tree_parser(result) == tree_parser(expected)
+
+
+class TestRustYaml11Fallback:
+    """Test that documents the Rust parser would resolve differently are loaded by PyYAML"""
+
+    @pytest.fixture
+    def rust_calls(self, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+        """Replaces the Rust parser by one recording its input, it resolves like PyYAML's YAML 1.1 loader"""
+        calls: list[str] = []
+
+        def fake_rust(stream: StringIO) -> object:
+            content = stream.read()
+            calls.append(content)
+            return yaml.full_load(content)
+
+        monkeypatch.setattr(loaders, "load_yaml_rust", fake_rust)
+        return calls
+
+    @pytest.mark.parametrize("document", YAML11_DOCUMENTS)
+    def test_yaml11_scalars_use_pyyaml(self, document: str, rust_calls: list[str]) -> None:
+        assert needs_yaml11(document)
+        assert loaders.rust_load(StringIO(document)) == yaml.full_load(document)
+        assert rust_calls == []
+
+    @pytest.mark.parametrize(
+        "document",
+        [
+            "a: 1\nb: -1.5e+3\nc: 0x1F\nd: 9223372036854775807\n",
+            "day: 2002-12-14\nwhen: 2001-12-14 21:59:43.10 -5\n",
+            "text: turn on the light\nanswer: yes please\nname: v1_2\nurl: http://host:80/path\n",
+        ],
+    )
+    def test_plain_documents_use_rust(self, document: str, rust_calls: list[str]) -> None:
+        assert not needs_yaml11(document)
+        loaders.rust_load(StringIO(document))
+        assert rust_calls == [document]
+
+    @pytest.mark.parametrize("document", ["b: &b {x: 1}\nd: {z: 3, <<: *b, y: 5}\n", "d: {'<<': {x: 1}, z: 3}\n"])
+    def test_merge_keys_use_pyyaml(self, document: str, rust_calls: list[str]) -> None:
+        result = loaders.rust_load(StringIO(document))
+        assert list(result["d"]) == list(yaml.full_load(document)["d"])
+        assert rust_calls == []
+
+    @pytest.mark.parametrize("document", ["a: &a {x: 1}\nb: *a\n", "- &a [1]\n- *a\n", "a: [&a 1, *a]\n"])
+    def test_anchors_use_pyyaml(self, document: str, rust_calls: list[str]) -> None:
+        assert loaders.rust_load(StringIO(document)) == yaml.full_load(document)
+        assert rust_calls == []
+
+    def test_ampersand_in_scalar_uses_rust(self, rust_calls: list[str]) -> None:
+        document = "query: a&b\nurl: http://host/?x=1&y=2\n"
+        loaders.rust_load(StringIO(document))
+        assert rust_calls == [document]
+
+    def test_probe_covers_yaml11_scalars(self) -> None:
+        assert needs_yaml11(loaders._PROBE_DOCUMENTS[0])
+        probe = loaders._PROBE_RESULTS[0]["probe"]
+        assert probe["quoted_date"] == "2001-01-23"
+        assert probe["flags"] == [True, False, True, False]
+        assert probe["ints"][:4] == ["0o17", 15, 1000, 90]
+
+    def test_probe_reaches_rust_parser(self, rust_calls: list[str]) -> None:
+        plain = loaders._PROBE_DOCUMENTS[1]
+        assert loaders.rust_load(StringIO(plain)) == loaders._PROBE_RESULTS[1]
+        assert rust_calls == [plain]
+
+    @pytest.mark.parametrize("works", [True, False])
+    def test_probe_rejects_broken_rust_parser(
+        self, works: bool, registry: dict[str, LoaderBackend], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def rust(stream: StringIO) -> object:
+            result = yaml.full_load(stream.read())
+            return result if works else {"probe": {}}
+
+        monkeypatch.setattr(loaders, "load_yaml_rust", rust)
+        register_loader("rust", loaders.rust_load, lambda: True, priority=1000)
+        assert (probe_loader() == "rust") == works
+
+
+class TestFightLoaderArgument:
+    """Test selecting the loader through fight"""
+
+    @pytest.mark.parametrize("name", available_loaders())
+    def test_fight_with_loader(self, name: str) -> None:
+        config = fight(TEST_DIR, None, frozen=True, loader=name)
+        assert config.invoice == 34843
+        assert last_backend() in (name, "libyaml", "python")
+
+    def test_fight_with_python_loader_reports_python(self) -> None:
+        fight(TEST_DIR, None, frozen=True, loader="python")
+        assert last_backend() == "python"
+
+    def test_fight_with_unknown_loader(self) -> None:
+        with pytest.raises(ValueError):
+            fight(TEST_DIR, None, frozen=True, loader="nope")
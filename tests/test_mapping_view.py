@@ -0,0 +1,92 @@
+"""
+Tests for mapping views and the memoized as_dict
+"""
+
+from collections.abc import Mapping
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from heracless.fight import fight
+from heracless.utils import as_dict, as_mapping, as_readonly_dict, from_dict, mutate_config
+from heracless.utils.helper import ConfigMapping
+
+TEST_DIR = Path(__file__).parent.resolve() / Path("./test_config.yaml")
+
+
+@pytest.fixture
+def config() -> object:
+    return fight(TEST_DIR, None, frozen=True)
+
+
+class TestConfigMapping:
+    """Test the read-only mapping view"""
+
+    def test_is_a_mapping(self, config: object) -> None:
+        view = as_mapping(config)
+        assert isinstance(view, Mapping)
+        assert view["invoice"] == 34843
+        assert list(view) == list(asdict(config))  # type: ignore[call-overload]
+        assert len(view) == len(asdict(config))  # type: ignore[call-overload]
+
+    def test_nested_views_share_instances(self, config: object) -> None:
+        view = as_mapping(config)
+        assert isinstance(view["bill_to"], ConfigMapping)
+        assert view["bill_to"].config is config.bill_to  # type: ignore[attr-defined]
+        assert view["bill_to"]["address"]["city"] == "Royal Oak"
+        assert view["product"][0]["sku"] == "BL394D"
+
+    def test_equals_asdict(self, config: object) -> None:
+        assert as_mapping(config) == asdict(config)  # type: ignore[call-overload]
+
+    def test_read_only(self, config: object) -> None:
+        view = as_mapping(config)
+        with pytest.raises(TypeError):
+            view["invoice"] = 0  # type: ignore[index]
+        with pytest.raises(KeyError):
+            view["missing"]
+
+    def test_unpacking(self) -> None:
+        def connect(host: str, port: int) -> str:
+            return f"{host}:{port}"
+
+        config = from_dict({"database": {"host": "localhost", "port": 5432}})
+        assert connect(**as_mapping(config.database)) == "localhost:5432"
+
+
+class TestAsDict:
+    """Test that as_dict returns a private copy"""
+
+    def test_fresh_copy(self, config: object) -> None:
+        assert as_dict(config) is not as_dict(config)
+        assert as_dict(config) == asdict(config)  # type: ignore[call-overload]
+
+    def test_changes_do_not_leak(self, config: Any) -> None:
+        first = as_dict(config)
+        first.pop("invoice")
+        first["bill_to"]["address"].pop("city")
+        second = as_dict(config)
+        assert second["invoice"] == config.invoice
+        assert second["bill_to"]["address"]["city"] == config.bill_to.address.city
+
+
+class TestReadonlyDict:
+    """Test the memoized read-only dict of frozen configs"""
+
+    def test_cached_result(self, config: object) -> None:
+        assert as_readonly_dict(config) is as_readonly_dict(config)
+        assert as_readonly_dict(config) == asdict(config)  # type: ignore[call-overload]
+
+    def test_read_only(self, config: object) -> None:
+        result = as_readonly_dict(config)
+        with pytest.raises(TypeError):
+            result["invoice"] = 0  # type: ignore[index]
+        with pytest.raises(TypeError):
+            result["bill_to"]["address"]["city"] = "x"
+        assert isinstance(result["product"], tuple)
+
+    def test_mutated_config_is_not_stale(self, config: object) -> None:
+        as_readonly_dict(config)
+        assert as_readonly_dict(mutate_config(config, "invoice", 0))["invoice"] == 0
@@ -0,0 +1,161 @@
+"""
+Tests for the memoized config loading in heracless.utils.memo
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import pytest
+
+import heracless.utils.memo
+from heracless.fight import fight
+from heracless.utils.load_func_template import load_config
+from heracless.utils.memo import file_signature, invalidate, memoized_fight
+
+
+@pytest.fixture(autouse=True)
+def clear_memo() -> Iterator[None]:
+    invalidate()
+    yield
+    invalidate()
+
+
+@pytest.fixture
+def config_file(tmp_path: Path) -> Path:
+    path = tmp_path / "config.yaml"
+    path.write_text("port: 1\n")
+    return path
+
+
+class TestMemoizedFight:
+    """Test memoized_fight and invalidate"""
+
+    def test_repeat_calls_share_instance(self, config_file: Path) -> None:
+        first = memoized_fight(config_file, None, frozen=True)
+        assert memoized_fight(str(config_file), None, frozen=True) is first
+
+    def test_key_includes_loader(self, config_file: Path) -> None:
+        first = memoized_fight(config_file, None, frozen=True, loader="python")
+        assert memoized_fight(config_file, None, frozen=True) is not first
+        assert memoized_fight(config_file, None, frozen=True, loader="python") is first
+
+    def test_key_includes_dump_dir(self, config_file: Path, tmp_path: Path) -> None:
+        first_stub, second_stub = tmp_path / "first.pyi", tmp_path / "second.pyi"
+        first = memoized_fight(config_file, first_stub, frozen=True)
+        assert memoized_fight(config_file, second_stub, frozen=True) is not first
+        assert "port: int" in second_stub.read_text()
+        assert memoized_fight(config_file, first_stub, frozen=True) is first
+
+    def test_lock_lives_as_long_as_the_entry(self, config_file: Path, tmp_path: Path) -> None:
+        other = tmp_path / "other.yaml"
+        other.write_text("port: 2\n")
+        memoized_fight(other, None, frozen=True)
+        memoized_fight(config_file, None, frozen=True)
+        locks = dict(heracless.utils.memo._LOCKS)
+        assert len(locks) == 2
+        config_file.write_text("port: 22\n")
+        memoized_fight(config_file, None, frozen=True)
+        assert heracless.utils.memo._LOCKS == locks
+        invalidate(config_file)
+        assert [key[0] for key in heracless.utils.memo._LOCKS] == [other.resolve()]
+        invalidate()
+        assert heracless.utils.memo._LOCKS == {}
+
+    def test_mutable_configs_are_not_shared(self, config_file: Path) -> None:
+        first = memoized_fight(config_file, None, frozen=False)
+        assert memoized_fight(config_file, None, frozen=False) is not first
+
+    def test_file_change_reloads(self, config_file: Path) -> None:
+        first = memoized_fight(config_file, None, frozen=True)
+        config_file.write_text("port: 22\n")
+        second = memoized_fight(config_file, None, frozen=True)
+        assert second is not first
+        assert second.port == 22
+
+    def test_replaced_file_reloads(self, config_file: Path, tmp_path: Path) -> None:
+        first = memoized_fight(config_file, None, frozen=True)
+        replacement = tmp_path / "replacement.yaml"
+        replacement.write_text("port: 2\n")
+        signature = file_signature(config_file)
+        replacement.replace(config_file)
+        assert file_signature(config_file).inode != signature.inode
+        assert memoized_fight(config_file, None, frozen=True).port == 2
+        assert first.port == 1
+
+    def test_invalidate_path(self, config_file: Path, tmp_path: Path) -> None:
+        other = tmp_path / "other.yaml"
+        other.write_text("port: 3\n")
+        first, other_config = memoized_fight(config_file, None, True), memoized_fight(other, None, True)
+        invalidate(config_file)
+        assert memoized_fight(config_file, None, True) is not first
+        assert memoized_fight(other, None, True) is other_config
+
+    def test_invalidate_all(self, config_file: Path) -> None:
+        first = memoized_fight(config_file, None, frozen=True)
+        invalidate()
+        assert memoized_fight(config_file, None, frozen=True) is not first
+
+    def test_missing_file_behaves_like_fight(self, tmp_path: Path) -> None:
+        assert memoized_fight(tmp_path / "missing.yaml", None, frozen=True) is None
+        with pytest.raises(Exception):
+            memoized_fight(tmp_path / "missing_dir" / "missing.yaml", None, frozen=True)
+
+    def test_single_flight(self, config_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        calls = []
+
+        def slow_fight(
+            cfg_dir: Path, dump_dir: Optional[Path], frozen: bool, loader: Optional[str], **kwargs: Any
+        ) -> Any:
+            calls.append(cfg_dir)
+            time.sleep(0.05)
+            return fight(cfg_dir, dump_dir, frozen, loader, **kwargs)
+
+        monkeypatch.setattr(heracless.utils.memo, "fight", slow_fight)
+        results: list[Any] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(memoized_fight(config_file, None, True))) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    def test_single_flight_after_change(self, config_file: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        first = memoized_fight(config_file, None, True)
+        calls = []
+
+        def slow_fight(
+            cfg_dir: Path, dump_dir: Optional[Path], frozen: bool, loader: Optional[str], **kwargs: Any
+        ) -> Any:
+            calls.append(cfg_dir)
+            time.sleep(0.05)
+            return fight(cfg_dir, dump_dir, frozen, loader, **kwargs)
+
+        monkeypatch.setattr(heracless.utils.memo, "fight", slow_fight)
+        config_file.write_text("port: 22\n")
+        results: list[Any] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(memoized_fight(config_file, None, True))) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert all(result is results[0] is not first for result in results)
+
+
+class TestTemplateCache:
+    """Test the cache option of the load_config template"""
+
+    def test_template_memoizes(self, config_file: Path) -> None:
+        first = load_config(config_file, stub_dump=False)
+        assert load_config(config_file, stub_dump=False) is first
+
+    def test_template_cache_disabled(self, config_file: Path) -> None:
+        first = load_config(config_file, stub_dump=False)
+        assert load_config(config_file, stub_dump=False, cache=False) is not first
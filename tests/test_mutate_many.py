@@ -0,0 +1,90 @@
+"""
+Tests for batch mutation with heracless.utils.mutate_many
+"""
+
+from pathlib import Path
+
+import pytest
+
+from heracless.fight import fight
+from heracless.utils import as_dict, mutate_config, mutate_many
+from heracless.utils.exceptions import ConfigPathError
+from heracless.utils.helper import build_path_trie
+
+TEST_DIR = Path(__file__).parent.resolve() / Path("./test_config.yaml")
+
+
+@pytest.fixture
+def config() -> object:
+    return fight(TEST_DIR, None, frozen=True)
+
+
+class TestBuildPathTrie:
+    """Test grouping of dotted paths"""
+
+    def test_shared_prefixes(self) -> None:
+        trie = build_path_trie({"a.b": 1, "a.c": 2, "d": 3})
+        assert trie == {"a": {"b": {"": 1}, "c": {"": 2}}, "d": {"": 3}}
+
+    def test_parent_and_child_conflict(self) -> None:
+        with pytest.raises(ConfigPathError):
+            build_path_trie({"a": 1, "a.b": 2})
+        with pytest.raises(ConfigPathError):
+            build_path_trie({"a.b": 2, "a": 1})
+
+    def test_empty_segment(self) -> None:
+        with pytest.raises(ConfigPathError):
+            build_path_trie({"a..b": 1})
+
+
+class TestMutateMany:
+    """Test mutate_many"""
+
+    def test_matches_repeated_mutate_config(self, config: object) -> None:
+        overrides = {"invoice": 0, "bill_to.address.city": "New City", "bill_to.given": "Ann", "tax": 1.5}
+        expected = config
+        for path, value in overrides.items():
+            expected = mutate_config(expected, path, value)
+        assert as_dict(mutate_many(config, overrides)) == as_dict(expected)
+
+    def test_tuple_indexing(self, config: object) -> None:
+        new = mutate_many(config, {"product.0.price": 1.0, "product.-1.quantity": 7})
+        assert new.product[0].price == 1.0  # type: ignore[attr-defined]
+        assert new.product[-1].quantity == 7  # type: ignore[attr-defined]
+        assert isinstance(new.product, tuple)  # type: ignore[attr-defined]
+
+    def test_structural_sharing(self, config: object) -> None:
+        new = mutate_many(config, {"bill_to.address.city": "New City", "product.1.price": 2.0})
+        assert new.ship_to is config.ship_to  # type: ignore[attr-defined]
+        assert new.bill_to.address is not config.bill_to.address  # type: ignore[attr-defined]
+        assert new.product[0] is config.product[0]  # type: ignore[attr-defined]
+        assert config.bill_to.address.city == "Royal Oak"  # type: ignore[attr-defined]
+
+    def test_replace_whole_subtree(self, config: object) -> None:
+        new = mutate_many(config, {"product.0": "gone"})
+        assert new.product[0] == "gone"  # type: ignore[attr-defined]
+
+    def test_no_overrides(self, config: object) -> None:
+        assert mutate_many(config, {}) is config
+
+    def test_all_paths_validated_first(self, config: object) -> None:
+        with pytest.raises(ConfigPathError) as e_info:
+            mutate_many(config, {"invoice": 0, "bill_to.nope": 1, "product.9.price": 1, "tax.value": 2})
+        assert set(e_info.value.errors) == {"bill_to.nope", "product.9", "tax.value"}
+        assert "bill_to.nope" in str(e_info.value)
+
+    def test_aliased_indices_conflict(self, config: object) -> None:
+        last = len(config.product) - 1  # type: ignore[attr-defined]
+        for overrides in (
+            {f"product.{last}.price": 1.0, "product.-1.price": 2.0},
+            {f"product.{last}": "gone", "product.-1.price": 2.0},
+            {"product.0.price": 1.0, "product.00.price": 2.0},
+        ):
+            with pytest.raises(ConfigPathError, match="refers to the same item"):
+                mutate_many(config, overrides)
+
+    def test_aliased_indices_merge(self, config: object) -> None:
+        last = len(config.product) - 1  # type: ignore[attr-defined]
+        new = mutate_many(config, {f"product.{last}.price": 1.0, "product.-1.quantity": 7})
+        assert new.product[last].price == 1.0  # type: ignore[attr-defined]
+        assert new.product[last].quantity == 7  # type: ignore[attr-defined]
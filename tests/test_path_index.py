@@ -0,0 +1,86 @@
+"""
+Tests for dotted path lookups: get, get_many and compile_path
+"""
+
+from pathlib import Path
+
+import pytest
+
+from heracless.fight import fight
+from heracless.utils import compile_path, get, get_many, mutate_config
+from heracless.utils.helper import build_path_index, path_index
+
+TEST_DIR = Path(__file__).parent.resolve() / Path("./test_config.yaml")
+
+
+@pytest.fixture
+def config() -> object:
+    return fight(TEST_DIR, None, frozen=True)
+
+
+class TestCompilePath:
+    """Test compiled accessors"""
+
+    def test_attribute_path(self, config: object) -> None:
+        assert compile_path("bill_to.address.city")(config) == "Royal Oak"
+
+    def test_index_path(self, config: object) -> None:
+        assert compile_path("product.0.sku")(config) == "BL394D"
+        assert compile_path("product.-1.sku")(config) == "BL4438H"
+
+    def test_accessors_are_cached(self) -> None:
+        assert compile_path("a.b") is compile_path("a.b")
+
+    def test_missing_path_raises(self, config: object) -> None:
+        with pytest.raises(AttributeError):
+            compile_path("bill_to.nope")(config)
+        with pytest.raises(IndexError):
+            compile_path("product.9.sku")(config)
+
+
+class TestPathIndex:
+    """Test the cached path index and lookups"""
+
+    def test_index_contains_every_path(self, config: object) -> None:
+        index = build_path_index(config)
+        assert index["invoice"] == 34843
+        assert index["bill_to.address.city"] == "Royal Oak"
+        assert index["product.1.price"] == 2392.0
+        assert index["bill_to"] is config.bill_to  # type: ignore[attr-defined]
+
+    def test_index_is_cached_on_instance(self, config: object) -> None:
+        assert path_index(config) is path_index(config)
+
+    def test_cache_does_not_change_equality_or_repr(self, config: object) -> None:
+        other = fight(TEST_DIR, None, frozen=True)
+        before = repr(config)
+        path_index(config)
+        assert config == other
+        assert repr(config) == before
+
+    def test_mutated_config_gets_fresh_index(self, config: object) -> None:
+        assert get(config, "invoice") == 34843
+        assert get(mutate_config(config, "invoice", 0), "invoice") == 0
+
+    def test_index_is_read_only(self, config: object) -> None:
+        with pytest.raises(TypeError):
+            path_index(config)["invoice"] = 0  # type: ignore[index]
+        assert get(config, "invoice") == 34843
+
+    def test_negative_indices(self, config: object) -> None:
+        for path in ("product.-1.sku", "product.-2.price", "product.-1"):
+            assert get(config, path) == compile_path(path)(config)
+        assert get(config, "product.-3.sku", "missing") == "missing"
+        assert get(config, "bill_to.-1", "missing") == "missing"
+        assert get_many(config, ["product.-1.sku"]) == {"product.-1.sku": "BL4438H"}
+
+    def test_get_default(self, config: object) -> None:
+        assert get(config, "bill_to.nope") is None
+        assert get(config, "bill_to.nope", 42) == 42
+
+    def test_get_many(self, config: object) -> None:
+        assert get_many(config, ["invoice", "product.0.quantity", "missing"], default=-1) == {
+            "invoice": 34843,
+            "product.0.quantity": 4,
+            "missing": -1,
+        }
@@ -0,0 +1,170 @@
+"""
+Tests for columnar storage of uniform mapping lists in heracless.utils.record_table
+"""
+
+import pickle
+from array import array
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
+import pytest
+
+from heracless.fight import fight
+from heracless.utils import as_dict, from_dict, get
+from heracless.utils.cfg_tree import schema_fingerprint, tree_parser, tree_to_string_translator
+from heracless.utils.compact_arrays import NUMPY_AVAILABLE
+from heracless.utils.record_table import (
+    RecordTable,
+    RecordView,
+    table_column,
+    table_fields,
+    table_records,
+    uniform_columns,
+)
+
+PRODUCTS = [
+    {"sku": "BL394D", "quantity": 4, "price": 450.0},
+    {"sku": "BL4438H", "quantity": 1, "price": 2392.0},
+    {"sku": "XX1", "quantity": 7, "price": 1.5},
+]
+
+
+@pytest.fixture
+def config() -> object:
+    return from_dict({"product": PRODUCTS, "name": "shop"}, tables=True)
+
+
+class TestUniformColumns:
+    """Test detection of uniform mapping lists"""
+
+    def test_uniform(self) -> None:
+        keys, columns = uniform_columns(PRODUCTS)  # type: ignore[misc]
+        assert keys == ("sku", "quantity", "price")
+        assert columns[1] == [4, 1, 7]
+
+    @pytest.mark.parametrize(
+        "rows",
+        [
+            [],
+            [1, 2],
+            [{"a": 1}, {"b": 1}],
+            [{"a": 1, "b": 2}, {"b": 2, "a": 1}],
+            [{"a": 1}, {"a": 1.0}],
+            [{"a": 1}, {"a": None}],
+            [{"a": [1]}, {"a": [2]}],
+            [{"a": {"b": 1}}],
+        ],
+    )
+    def test_not_uniform(self, rows: list) -> None:
+        assert uniform_columns(rows) is None
+
+    def test_non_uniform_lists_stay_tuples(self) -> None:
+        config = from_dict({"product": [{"a": 1}, {"a": "x"}]}, tables=True)
+        assert isinstance(config.product, tuple)
+        assert config.product[1].a == "x"
+
+
+class TestRecordTable:
+    """Test the table and row views"""
+
+    def test_columns(self, config: object) -> None:
+        table = config.product  # type: ignore[attr-defined]
+        assert isinstance(table, RecordTable)
+        assert table.price == array("d", [450.0, 2392.0, 1.5])
+        assert table.quantity == array("q", [4, 1, 7])
+        assert table.sku == ("BL394D", "BL4438H", "XX1")
+        assert table_fields(table) == ("sku", "quantity", "price")
+        assert table_column(table, "sku") is table.sku
+        with pytest.raises(AttributeError):
+            table.weight
+
+    def test_rows(self, config: object) -> None:
+        table = config.product  # type: ignore[attr-defined]
+        assert len(table) == 3
+        assert table[0].sku == "BL394D"
+        assert table[-1].price == 1.5
+        assert [row.quantity for row in table] == [4, 1, 7]
+        assert repr(table[1]) == "ProductItem(sku='BL4438H', quantity=1, price=2392.0)"
+        with pytest.raises(IndexError):
+            table[3]
+        with pytest.raises(AttributeError):
+            table[0].weight
+
+    def test_slices_are_tables(self, config: object) -> None:
+        part = config.product[1:]  # type: ignore[attr-defined]
+        assert isinstance(part, RecordTable)
+        assert part.sku == ("BL4438H", "XX1")
+
+    def test_rows_are_read_only(self, config: object) -> None:
+        row = config.product[0]  # type: ignore[attr-defined]
+        assert isinstance(row, RecordView)
+        with pytest.raises(FrozenInstanceError):
+            row.price = 1.0
+
+    def test_equality_and_hash(self, config: object) -> None:
+        other = from_dict({"product": PRODUCTS, "name": "shop"}, tables=True)
+        assert other == config
+        assert hash(other) == hash(config)
+        assert config.product[0] == other.product[0]  # type: ignore[attr-defined]
+        assert from_dict({"product": PRODUCTS[:2], "name": "shop"}, tables=True) != config
+
+    def test_pickle(self, config: object) -> None:
+        table = config.product  # type: ignore[attr-defined]
+        assert pickle.loads(pickle.dumps(table)) == table
+        assert pickle.loads(pickle.dumps(table[2])) == table[2]
+
+    def test_disabled_by_default(self) -> None:
+        assert isinstance(from_dict({"product": PRODUCTS}).product, tuple)
+
+    def test_nested_tables(self) -> None:
+        config = from_dict({"groups": [PRODUCTS, PRODUCTS[:1]]}, tables=True)
+        assert isinstance(config.groups, tuple)
+        assert len(config.groups[1]) == 1
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+    def test_numpy_columns(self) -> None:
+        config = from_dict({"product": PRODUCTS}, arrays="numpy", tables=True)
+        assert config.product.price.sum() == 2843.5
+        assert not config.product.price.flags.writeable
+
+
+class TestRecordTableHelpers:
+    """Test helper functions on configs holding tables"""
+
+    def test_as_dict(self, config: object) -> None:
+        assert as_dict(config) == {"product": tuple(PRODUCTS), "name": "shop"}
+        assert table_records(config.product) == tuple(PRODUCTS)  # type: ignore[attr-defined]
+        assert from_dict(as_dict(config), tables=True) == config
+
+    def test_get(self, config: object) -> None:
+        assert get(config, "product.1.sku") == "BL4438H"
+        assert get(config, "product.2.price") == 1.5
+
+
+class TestRecordTableStubs:
+    """Test stub generation for tables"""
+
+    def test_stub(self) -> None:
+        stub = tree_to_string_translator(True, tree_parser({"product": PRODUCTS}), tables=True)
+        assert "from heracless.utils.record_table import RecordTable\n" in stub
+        assert "class ProductItem:\n    sku: str\n    quantity: int\n    price: float\n" in stub
+        assert (
+            "class ProductTable(RecordTable[ProductItem]):\n"
+            "    sku: tuple[str]\n    quantity: array[int]\n    price: array[float]\n"
+        ) in stub
+        assert '    product: "ProductTable"\n' in stub
+
+    def test_stub_without_tables(self) -> None:
+        stub = tree_to_string_translator(True, tree_parser({"product": PRODUCTS}))
+        assert "RecordTable" not in stub
+
+    def test_fingerprint_depends_on_tables(self) -> None:
+        tree = tree_parser({"product": PRODUCTS})
+        assert schema_fingerprint(True, tree, tables=True) != schema_fingerprint(True, tree)
+
+    def test_fight(self, tmp_path: Path) -> None:
+        stub = tmp_path / "types.pyi"
+        config = fight(Path(__file__).parent.parent / "config" / "config.yaml", stub, frozen=True, tables=True)
+        assert isinstance(config.product, RecordTable)
+        assert config.product.price == array("d", [450.0, 2392.0])
+        assert "class ProductTable(RecordTable[ProductItem]):\n" in stub.read_text()
@@ -0,0 +1,86 @@
+"""
+Tests for the Rust backend integration in heracless.fight
+"""
+
+import importlib
+import sys
+import types
+import warnings
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from yaml import full_load
+
+from heracless.fight import fight
+from heracless.loaders import get_loader, last_backend, rust_load
+from heracless import rust_backend
+from heracless.rust_backend import is_rust_available
+
+TEST_DIR = Path(__file__).parent.resolve() / Path("./test_config.yaml")
+
+requires_rust = pytest.mark.skipif(not is_rust_available(), reason="Rust extension not built")
+
+
+class TestBackendSelection:
+    """Test backend selection and reporting"""
+
+    def test_default_backend_matches_availability(self) -> None:
+        assert (get_loader().name == "rust") == is_rust_available()
+
+    def test_fight_reports_backend(self) -> None:
+        config = fight(TEST_DIR, None, frozen=True)
+        assert config.invoice == 34843
+        assert last_backend() == get_loader().name
+
+    def test_rust_load_falls_back_to_pyyaml(self) -> None:
+        # PyYAML specific tags are handed to PyYAML
+        result = rust_load(StringIO("a: !!python/tuple [1, 2]"))
+        assert result == {"a": (1, 2)}
+        assert last_backend() in ("libyaml", "python")
+
+
+@requires_rust
+class TestRustLoad:
+    """Test that the Rust backend builds the same objects as PyYAML"""
+
+    def test_matches_pyyaml_on_test_config(self) -> None:
+        content = TEST_DIR.read_text()
+        assert rust_load(StringIO(content)) == full_load(content)
+        assert last_backend() == "rust"
+
+    def test_timestamps(self) -> None:
+        content = "d: 2001-01-23\nts: 2001-12-14t21:59:43.10-05:00\nnaive: 2001-12-14 21:59:43\n"
+        result = rust_load(StringIO(content))
+        assert result == full_load(content)
+        assert type(result["d"]) is date
+        assert result["ts"] == datetime(2001, 12, 14, 21, 59, 43, 100000, timezone(timedelta(hours=-5)))
+        assert result["naive"].tzinfo is None
+
+    def test_merge_keys(self) -> None:
+        content = "base: &b\n  x: 1\nchild:\n  <<: *b\n  y: 2\nd: {z: 3, <<: *b, y: 5}\n"
+        result = rust_load(StringIO(content))
+        assert result == full_load(content)
+        assert list(result["child"]) == ["x", "y"]
+        assert list(result["d"]) == ["x", "z", "y"] == list(full_load(content)["d"])
+
+
+class TestTopLevelExtension:
+    """Test the fallback import of an extension installed as a top level heracless_core module"""
+
+    def test_fallback_import_exposes_all_functions(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        extension = types.ModuleType("heracless_core")
+        for name in ("generate_python_stubs", "generate_python_stubs_from_tree", "load_yaml", "parse_yaml_to_py"):
+            setattr(extension, name, lambda *args, name=name: name)
+        try:
+            with monkeypatch.context() as patch:
+                patch.setitem(sys.modules, "heracless.heracless_core", None)  # packaged extension missing
+                patch.setitem(sys.modules, "heracless_core", extension)
+                backend = importlib.reload(rust_backend)
+                assert backend.RUST_AVAILABLE
+                assert backend.generate_stubs_from_tree_rust(None, True) == "generate_python_stubs_from_tree"
+        finally:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # "Rust backend not available" was already reported
+                importlib.reload(rust_backend)
@@ -0,0 +1,146 @@
+"""
+Tests for selective loading of config subtrees (fight(select=...))
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+import yaml
+
+from heracless.fight import fight
+from heracless.utils.event_builder import config_builder, parse_events, select_dict, selection_tree
+from heracless.utils.exceptions import ConfigPathError
+from heracless.utils.memo import invalidate, memoized_fight
+
+CONFIG_YAML = """
+defaults: &defaults
+  timeout: 5
+  pool: {size: 3, idle: 1}
+database:
+  <<: *defaults
+  host: db
+  port: 5432
+cache:
+  redis: {host: r, port: 6379}
+  memcached: {host: m}
+  Local_Size: 10
+services:
+  - name: a
+  - name: b
+unrelated:
+  - [1, 2, {x: &inner 3}]
+  - !custom_tag whatever
+uses_inner: *inner
+"""
+# the custom tag is only skipped by selective loads, regular loads reject it
+PLAIN_YAML = CONFIG_YAML.replace("!custom_tag ", "")
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG_YAML)
+    return path
+
+
+class TestSelectionTree:
+    """Test parsing of select paths"""
+
+    def test_nested_paths(self) -> None:
+        assert selection_tree(["database", "cache.redis", "cache.local_size"]) == {
+            "database": None,
+            "cache": {"redis": None, "local_size": None},
+        }
+
+    def test_parent_selects_everything(self) -> None:
+        assert selection_tree(["cache.redis", "cache"]) == {"cache": None}
+        assert selection_tree(["cache", "cache.redis"]) == {"cache": None}
+
+    def test_single_string(self) -> None:
+        assert selection_tree("database") == {"database": None}
+
+    @pytest.mark.parametrize("select", [[], ["cache..redis"], [""]])
+    def test_invalid_paths(self, select: list) -> None:
+        with pytest.raises(ValueError):
+            selection_tree(select)
+
+
+class TestSelectDict:
+    """Test selection of plain dicts"""
+
+    def test_select(self) -> None:
+        data = {"a": {"b": 1, "c": 2}, "d": 3}
+        assert select_dict(data, selection_tree(["a.c"])) == {"a": {"c": 2}}
+
+    def test_missing_and_non_mapping_paths(self) -> None:
+        with pytest.raises(ConfigPathError, match="a.x: not found"):
+            select_dict({"a": {"b": 1}}, selection_tree(["a.x"]))
+        with pytest.raises(ConfigPathError, match="a.b: is not a mapping"):
+            select_dict({"a": {"b": 1}}, selection_tree(["a.b.c"]))
+
+
+class TestSelectiveLoading:
+    """Test fight(select=...)"""
+
+    def test_only_selected_sections(self, config_path: Path) -> None:
+        config = fight(config_path, None, True, select=["database", "cache.redis", "cache.local_size"])
+        assert [field for field in vars(config)] == ["database", "cache"]
+        assert vars(config.cache).keys() == {"redis", "local_size"}
+        assert config.database.timeout == 5
+        assert config.database.pool.idle == 1
+        assert config.cache.redis.port == 6379
+
+    def test_matches_regular_load_of_subset(self, config_path: Path) -> None:
+        config_path.write_text(PLAIN_YAML)
+        select = ["database.pool", "cache.redis", "uses_inner"]
+        expected = fight(config_path, None, True)
+        config = fight(config_path, None, True, select=select)
+        assert config.database.pool == expected.database.pool
+        assert config.cache.redis == expected.cache.redis
+        assert config.uses_inner == 3
+
+    def test_anchor_in_skipped_subtree(self, config_path: Path) -> None:
+        assert fight(config_path, None, True, select=["uses_inner"]).uses_inner == 3
+
+    def test_matches_select_dict(self) -> None:
+        select = selection_tree(["database.pool.size", "cache"])
+        streamed = config_builder(True).build(parse_events(io.StringIO(PLAIN_YAML)), plain=True, select=select)
+        assert streamed == select_dict(yaml.safe_load(PLAIN_YAML), select)
+
+    @pytest.mark.parametrize("options", [{"lazy": True}, {"slots": True}, {"tables": True}, {"arrays": "array"}])
+    def test_modes(self, config_path: Path, options: dict) -> None:
+        config = fight(config_path, None, True, select=["database", "services"], **options)
+        assert config.database.pool.size == 3
+        assert config.services[1].name == "b"
+
+    def test_fallback_keeps_selection(self, tmp_path: Path) -> None:
+        path = tmp_path / "tags.yaml"
+        path.write_text("values: !!set {a, b}\nname: x\nother: 1\n")
+        config = fight(path, None, True, select=["values"])
+        assert vars(config).keys() == {"values"}
+
+    def test_stub_describes_subset(self, config_path: Path, tmp_path: Path) -> None:
+        stub = tmp_path / "config.pyi"
+        fight(config_path, stub, True, select=["cache.redis"])
+        text = stub.read_text()
+        assert "class Redis:" in text
+        assert "memcached" not in text
+        assert "class Database" not in text
+
+    def test_errors(self, config_path: Path) -> None:
+        with pytest.raises(ConfigPathError, match="nope: not found"):
+            fight(config_path, None, True, select=["nope"])
+        with pytest.raises(ConfigPathError, match="services: is not a mapping"):
+            fight(config_path, None, True, select=["services.name"])
+        with pytest.raises(ConfigPathError, match="database.host: is not a mapping"):
+            fight(config_path, None, True, select=["database.host.x"])
+
+    def test_memo_keyed_by_selection(self, config_path: Path) -> None:
+        config_path.write_text(PLAIN_YAML)
+        invalidate()
+        database = memoized_fight(config_path, None, True, select=["database"])
+        assert memoized_fight(config_path, None, True, select=["database"]) is database
+        assert memoized_fight(config_path, None, True, select=["cache"]) is not database
+        assert memoized_fight(config_path, None, True) is not database
+        invalidate()
@@ -0,0 +1,82 @@
+"""
+Tests for slotted config classes (slots=True)
+"""
+
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+from heracless.fight import fight
+from heracless.utils import as_dict, as_mapping, from_dict, get, get_many, mutate_config, mutate_many
+from heracless.utils.class_cache import DERIVED_ATTR
+from heracless.utils.helper import path_index
+from heracless.utils.cfg_tree import schema_fingerprint, tree_parser, tree_to_config_obj, tree_to_string_translator
+
+TEST_DIR = Path(__file__).parent.resolve() / Path("./test_config.yaml")
+CONFIG_DICT = {"db": {"host": "localhost", "port": 5432}, "routes": [{"path": "/a"}, {"path": "/b"}]}
+
+
+class TestSlottedClasses:
+    """Test runtime classes generated with slots=True"""
+
+    def test_instances_have_no_dict_or_weakref(self) -> None:
+        config = from_dict(CONFIG_DICT, slots=True)
+        for obj in (config, config.db, config.routes[0]):
+            assert not hasattr(obj, "__dict__")
+            assert "__weakref__" not in type(obj).__slots__
+            assert type(obj).__slots__
+
+    def test_values_match_regular_classes(self) -> None:
+        assert asdict(from_dict(CONFIG_DICT, slots=True)) == asdict(from_dict(CONFIG_DICT))
+
+    def test_slotted_and_regular_classes_are_distinct(self) -> None:
+        assert type(from_dict(CONFIG_DICT, slots=True)) is not type(from_dict(CONFIG_DICT))
+        assert type(from_dict(CONFIG_DICT, slots=True)) is type(from_dict(CONFIG_DICT, slots=True))
+
+    def test_tree_materializer(self) -> None:
+        config = tree_to_config_obj(True, tree_parser(CONFIG_DICT), slots=True)
+        assert not hasattr(config.db, "__dict__")
+
+    def test_smaller_instances(self) -> None:
+        regular, slotted = from_dict(CONFIG_DICT).db, from_dict(CONFIG_DICT, slots=True).db
+        assert sys.getsizeof(slotted) < sys.getsizeof(regular) + sys.getsizeof(regular.__dict__)
+
+    def test_fight(self) -> None:
+        config = fight(TEST_DIR, None, frozen=True, slots=True)
+        assert config.bill_to.address.city == "Royal Oak"
+        assert not hasattr(config, "__dict__")
+
+    def test_helpers(self) -> None:
+        config = from_dict(CONFIG_DICT, slots=True)
+        assert mutate_config(config, "db.port", 1).db.port == 1
+        assert mutate_many(config, {"routes.1.path": "/c"}).routes[1].path == "/c"
+        assert get(config, "routes.0.path") == "/a"
+        assert as_dict(config) == CONFIG_DICT | {"routes": ({"path": "/a"}, {"path": "/b"})}
+        assert as_mapping(config)["db"]["host"] == "localhost"
+
+    def test_path_index_is_cached(self) -> None:
+        config = from_dict(CONFIG_DICT, slots=True)
+        assert path_index(config) is path_index(config)
+        assert get_many(config, ["db.port", "routes.1.path"]) == {"db.port": 5432, "routes.1.path": "/b"}
+        assert DERIVED_ATTR in type(config).__mro__[1].__slots__
+        assert asdict(config) == asdict(from_dict(CONFIG_DICT))  # the cache is not a field
+
+
+class TestSlottedStubs:
+    """Test stub output for slotted classes"""
+
+    def test_stub_declares_slots(self) -> None:
+        stub = tree_to_string_translator(True, tree_parser(CONFIG_DICT), slots=True)
+        assert "@dataclass(frozen=True, slots=True)\nclass Db:\n" in stub
+        assert "slots=True" not in tree_to_string_translator(True, tree_parser(CONFIG_DICT))
+
+    def test_fingerprint_depends_on_slots(self) -> None:
+        tree = tree_parser(CONFIG_DICT)
+        assert schema_fingerprint(True, tree, slots=True) != schema_fingerprint(True, tree)
+
+    def test_fight_dumps_slotted_stub(self, tmp_path: Path) -> None:
+        stub = tmp_path / "types.pyi"
+        fight(TEST_DIR, stub, frozen=True)
+        assert "slots=True" not in stub.read_text()
+        fight(TEST_DIR, stub, frozen=True, slots=True)
+        assert "@dataclass(frozen=True, slots=True)\nclass Config:\n" in stub.read_text()
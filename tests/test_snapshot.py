@@ -0,0 +1,152 @@
+"""
+Tests for the persistent snapshot cache in heracless.utils.snapshot
+"""
+
+import os
+import threading
+from functools import partial
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+from yaml import full_load
+
+from heracless.fight import fight, load_as_dict
+from heracless.loaders import libyaml_load, python_load
+from heracless.utils.snapshot import (
+    CACHE_DIR_ENV,
+    SNAPSHOT_SUFFIX,
+    clear_snapshots,
+    default_cache_dir,
+    evict,
+    loader_id,
+    read_snapshot,
+    resolve_cache_dir,
+    snapshot_key,
+    write_snapshot,
+)
+
+TEST_DIR = Path(__file__).parent.resolve() / Path("./test_config.yaml")
+
+
+def counting_loader(calls: list[int]) -> Callable[[Any], Any]:
+    def load(stream: Any) -> Any:
+        calls.append(1)
+        return full_load(stream)
+
+    return load
+
+
+class TestSnapshotCache:
+    """Test snapshot reading, writing and eviction"""
+
+    def test_disabled_by_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+        assert resolve_cache_dir() is None
+
+    def test_env_var(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        assert resolve_cache_dir() == tmp_path
+        monkeypatch.setenv(CACHE_DIR_ENV, "default")
+        assert resolve_cache_dir() == default_cache_dir()
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        value = full_load(TEST_DIR.read_text())
+        key = snapshot_key(TEST_DIR.read_bytes())
+        assert read_snapshot(tmp_path, key) == (False, None)
+        write_snapshot(tmp_path, key, value)
+        assert read_snapshot(tmp_path, key) == (True, value)
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_key_depends_on_content(self) -> None:
+        assert snapshot_key(b"a: 1") != snapshot_key(b"a: 2")
+
+    def test_key_depends_on_loader(self) -> None:
+        assert snapshot_key(b"a: 1", loader_id(python_load)) != snapshot_key(b"a: 1", loader_id(libyaml_load))
+        assert loader_id(python_load) == "heracless.loaders.python_load"
+        assert loader_id(partial(python_load, "x")) == "heracless.loaders.python_load('x')"
+
+    def test_corrupt_snapshot_is_a_miss(self, tmp_path: Path) -> None:
+        (tmp_path / f"broken{SNAPSHOT_SUFFIX}").write_bytes(b"not a pickle")
+        assert read_snapshot(tmp_path, "broken") == (False, None)
+        assert not (tmp_path / f"broken{SNAPSHOT_SUFFIX}").exists()
+
+    def test_eviction_removes_least_recently_used(self, tmp_path: Path) -> None:
+        for index, key in enumerate(("old", "middle", "new")):
+            write_snapshot(tmp_path, key, "x" * 1000, max_bytes=10**6)
+            os.utime(tmp_path / f"{key}{SNAPSHOT_SUFFIX}", ns=(index * 10**9, index * 10**9))
+        size = (tmp_path / f"new{SNAPSHOT_SUFFIX}").stat().st_size
+        evict(tmp_path, 2 * size)
+        assert sorted(path.stem for path in tmp_path.glob(f"*{SNAPSHOT_SUFFIX}")) == ["middle", "new"]
+
+    def test_concurrent_writers(self, tmp_path: Path) -> None:
+        value = full_load(TEST_DIR.read_text())
+        threads = [threading.Thread(target=write_snapshot, args=(tmp_path, "key", value)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert read_snapshot(tmp_path, "key") == (True, value)
+        assert [path.name for path in tmp_path.iterdir()] == [f"key{SNAPSHOT_SUFFIX}"]
+
+    def test_clear_snapshots(self, tmp_path: Path) -> None:
+        write_snapshot(tmp_path, "key", 1)
+        clear_snapshots(tmp_path)
+        assert read_snapshot(tmp_path, "key") == (False, None)
+
+
+class TestLoadAsDictSnapshots:
+    """Test snapshot usage in load_as_dict and fight"""
+
+    def test_second_load_skips_parsing(self, tmp_path: Path) -> None:
+        calls: list[int] = []
+        first = load_as_dict(TEST_DIR, counting_loader(calls), tmp_path)
+        second = load_as_dict(TEST_DIR, counting_loader(calls), tmp_path)
+        assert first == second == full_load(TEST_DIR.read_text())
+        assert len(calls) == 1
+
+    def test_changed_content_is_parsed(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        cache_dir = tmp_path / "cache"
+        calls: list[int] = []
+        config_file.write_text("port: 1\n")
+        load_as_dict(config_file, counting_loader(calls), cache_dir)
+        config_file.write_text("port: 2\n")
+        assert load_as_dict(config_file, counting_loader(calls), cache_dir) == {"port": 2}
+        assert len(calls) == 2
+
+    def test_loaders_do_not_share_snapshots(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("answer: yes\n")
+
+        def yaml12_load(stream: Any) -> Any:
+            return {"answer": "yes"}
+
+        assert load_as_dict(config_file, yaml12_load, tmp_path / "cache") == {"answer": "yes"}
+        assert load_as_dict(config_file, python_load, tmp_path / "cache") == {"answer": True}
+        assert len(list((tmp_path / "cache").glob(f"*{SNAPSHOT_SUFFIX}"))) == 2
+
+    def test_syntax_errors_are_not_cached(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("a: [1, 2\n")
+        with pytest.raises(Exception):
+            load_as_dict(config_file, full_load, tmp_path / "cache")
+        assert not list((tmp_path / "cache").glob(f"*{SNAPSHOT_SUFFIX}"))
+
+    def test_fight_with_cache_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        uncached = fight(TEST_DIR, None, frozen=True, cache_dir=None)
+        assert list(tmp_path.glob(f"*{SNAPSHOT_SUFFIX}"))
+        assert fight(TEST_DIR, None, frozen=True) == uncached
+
+    def test_load_as_dict_accepts_stream_loaders(self, tmp_path: Path) -> None:
+        # loaders receive a text stream, exactly like without a cache
+        streams: list[Any] = []
+
+        def load(stream: Any) -> Any:
+            streams.append(stream.read())
+            return full_load(StringIO(streams[-1]))
+
+        load_as_dict(TEST_DIR, load, tmp_path)
+        assert streams == [TEST_DIR.read_text()]
@@ -0,0 +1,107 @@
+"""
+Tests for schema fingerprinting and stub regeneration skipping
+"""
+
+from pathlib import Path
+
+import pytest
+
+import heracless.fight
+from heracless.fight import dump_in_file, fight
+from heracless.utils.cfg_tree import SCHEMA_HEADER, schema_fingerprint, tree_parser, tree_to_string_translator
+
+
+class TestSchemaFingerprint:
+    """Test schema_fingerprint"""
+
+    def test_value_changes_keep_fingerprint(self) -> None:
+        first = tree_parser({"db": {"host": "localhost", "port": 5432}, "tags": ["a"]})
+        second = tree_parser({"db": {"host": "example.org", "port": 1}, "tags": ["b"]})
+        assert schema_fingerprint(True, first) == schema_fingerprint(True, second)
+
+    def test_type_change_changes_fingerprint(self) -> None:
+        first = tree_parser({"port": 5432})
+        second = tree_parser({"port": "5432"})
+        assert schema_fingerprint(True, first) != schema_fingerprint(True, second)
+
+    def test_name_change_changes_fingerprint(self) -> None:
+        first = tree_parser({"db": {"host": "localhost"}})
+        second = tree_parser({"db": {"hostname": "localhost"}})
+        assert schema_fingerprint(True, first) != schema_fingerprint(True, second)
+
+    def test_key_order_changes_fingerprint(self) -> None:
+        first = tree_parser({"a": 1, "b": 2})
+        second = tree_parser({"b": 2, "a": 1})
+        assert schema_fingerprint(True, first) != schema_fingerprint(True, second)
+
+    def test_frozen_changes_fingerprint(self) -> None:
+        tree = tree_parser({"a": 1})
+        assert schema_fingerprint(True, tree) != schema_fingerprint(False, tree)
+
+    def test_growing_uniform_list_keeps_fingerprint(self) -> None:
+        first = tree_parser({"product": [{"sku": "a", "price": 1.0}]})
+        second = tree_parser({"product": [{"sku": "a", "price": 1.0}, {"sku": "b", "price": 2.0}]})
+        assert schema_fingerprint(True, first) == schema_fingerprint(True, second)
+
+    def test_new_item_shape_changes_fingerprint(self) -> None:
+        first = tree_parser({"product": [{"sku": "a"}]})
+        second = tree_parser({"product": [{"sku": "a"}, {"sku": "b", "price": 2.0}]})
+        assert schema_fingerprint(True, first) != schema_fingerprint(True, second)
+
+    @pytest.mark.parametrize(
+        "first, second",
+        [
+            ([{"a": 1}, {"b": "x"}], [{"a": 1}, {"b": "x"}, {"a": 1}]),
+            ([{"a": 1}, {"b": "x"}], [{"a": 1}, {"a": 2}, {"b": "x"}, {"b": "y"}]),
+        ],
+    )
+    def test_item_order_follows_stub(self, first: list, second: list) -> None:
+        first_tree, second_tree = tree_parser({"xs": first}), tree_parser({"xs": second})
+        same_stub = tree_to_string_translator(True, first_tree) == tree_to_string_translator(True, second_tree)
+        assert (schema_fingerprint(True, first_tree) == schema_fingerprint(True, second_tree)) == same_stub
+
+
+class TestDumpInFileSkipping:
+    """Test that dump_in_file skips regeneration for unchanged schemas"""
+
+    def test_stub_starts_with_header(self, tmp_path: Path) -> None:
+        stub = tmp_path / "types.pyi"
+        tree = tree_parser({"a": 1})
+        dump_in_file(True, tree, stub)
+        assert stub.read_text().splitlines()[0] == f"{SCHEMA_HEADER}{schema_fingerprint(True, tree)}"
+
+    def test_value_only_change_skips_generation(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        stub = tmp_path / "types.pyi"
+        dump_in_file(True, tree_parser({"a": 1}), stub)
+        content = stub.read_text()
+
+        def fail(*args: object) -> str:
+            raise AssertionError("stub should not be regenerated")
+
+        monkeypatch.setattr(heracless.fight, "tree_to_string_translator", fail)
+        dump_in_file(True, tree_parser({"a": 2}), stub)
+        assert stub.read_text() == content
+
+    def test_schema_change_regenerates(self, tmp_path: Path) -> None:
+        stub = tmp_path / "types.pyi"
+        dump_in_file(True, tree_parser({"a": 1}), stub)
+        dump_in_file(True, tree_parser({"a": 1, "b": "x"}), stub)
+        assert "    b: str\n" in stub.read_text()
+
+    def test_stub_without_header_is_regenerated(self, tmp_path: Path) -> None:
+        stub = tmp_path / "types.pyi"
+        stub.write_text("# hand written\n")
+        dump_in_file(True, tree_parser({"a": 1}), stub)
+        assert stub.read_text().startswith(SCHEMA_HEADER)
+        assert "    a: int\n" in stub.read_text()
+
+    def test_fight_reuses_stub(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        stub = tmp_path / "types.pyi"
+        config_file.write_text("port: 1\n")
+        fight(config_file, stub, frozen=True)
+        mtime = stub.stat().st_mtime_ns
+        config_file.write_text("port: 2\n")
+        config = fight(config_file, stub, frozen=True)
+        assert config.port == 2
+        assert stub.stat().st_mtime_ns == mtime
@@ -0,0 +1,157 @@
+"""
+Tests for hot reloading with heracless.watch.ConfigHandle
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from heracless.watch import ConfigHandle, watch_signature
+
+
+@pytest.fixture
+def config_file(tmp_path: Path) -> Path:
+    path = tmp_path / "config.yaml"
+    path.write_text("port: 1\n")
+    return path
+
+
+def touch_forward(path: Path) -> None:
+    """Make sure a rewrite is visible even on file systems with coarse timestamps"""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestConfigHandle:
+    """Test ConfigHandle reloading"""
+
+    def test_initial_load(self, config_file: Path) -> None:
+        handle = ConfigHandle(config_file, watch=False)
+        assert handle.config.port == 1
+        assert handle.version == 0
+
+    def test_initial_load_errors_raise(self, tmp_path: Path) -> None:
+        broken = tmp_path / "broken.yaml"
+        broken.write_text("a: [1\n")
+        with pytest.raises(Exception):
+            ConfigHandle(broken, watch=False)
+
+    def test_poll_without_change(self, config_file: Path) -> None:
+        handle = ConfigHandle(config_file, watch=False, debounce=0)
+        config = handle.config
+        assert not handle.poll()
+        assert handle.config is config
+
+    def test_poll_picks_up_rewrite(self, config_file: Path) -> None:
+        handle = ConfigHandle(config_file, watch=False, debounce=0)
+        config_file.write_text("port: 2\n")
+        touch_forward(config_file)
+        assert handle.poll()
+        assert handle.config.port == 2
+        assert handle.version == 1
+
+    def test_rename_write(self, config_file: Path, tmp_path: Path) -> None:
+        handle = ConfigHandle(config_file, watch=False, debounce=0)
+        tmp = tmp_path / ".config.yaml.swp"
+        tmp.write_text("port: 3\n")
+        tmp.replace(config_file)
+        assert handle.poll()
+        assert handle.config.port == 3
+
+    def test_symlink_swap(self, tmp_path: Path) -> None:
+        # mimics the ..data symlink swap Kubernetes does for mounted ConfigMaps
+        first, second = tmp_path / "v1", tmp_path / "v2"
+        first.mkdir()
+        second.mkdir()
+        (first / "config.yaml").write_text("port: 1\n")
+        (second / "config.yaml").write_text("port: 2\n")
+        os.symlink(first, tmp_path / "..data")
+        os.symlink(tmp_path / "..data" / "config.yaml", tmp_path / "config.yaml")
+        handle = ConfigHandle(tmp_path / "config.yaml", watch=False, debounce=0)
+        assert handle.config.port == 1
+        os.symlink(second, tmp_path / "..data_tmp")
+        os.replace(tmp_path / "..data_tmp", tmp_path / "..data")
+        assert handle.poll()
+        assert handle.config.port == 2
+
+    def test_failed_reload_keeps_old_config(self, config_file: Path) -> None:
+        errors: list[BaseException] = []
+        handle = ConfigHandle(config_file, watch=False, debounce=0, on_error=errors.append)
+        config = handle.config
+        config_file.write_text("port: [1\n")
+        touch_forward(config_file)
+        assert not handle.poll()
+        assert handle.config is config
+        assert handle.last_error is not None
+        assert errors == [handle.last_error]
+        # the broken file is not parsed again until it changes
+        assert not handle.poll()
+        assert len(errors) == 1
+
+    def test_empty_file_keeps_old_config(self, config_file: Path) -> None:
+        handle = ConfigHandle(config_file, watch=False, debounce=0)
+        config_file.write_text("")
+        assert not handle.poll()
+        assert handle.config.port == 1
+        assert isinstance(handle.last_error, ValueError)
+
+    def test_missing_file_keeps_old_config(self, config_file: Path) -> None:
+        handle = ConfigHandle(config_file, watch=False, debounce=0)
+        config_file.unlink()
+        assert watch_signature(config_file) is None
+        assert not handle.poll()
+        assert handle.config.port == 1
+
+    def test_on_reload_callback(self, config_file: Path) -> None:
+        reloaded: list[Any] = []
+        handle = ConfigHandle(config_file, watch=False, on_reload=reloaded.append)
+        assert handle.reload()
+        assert reloaded == [handle.config]
+
+    def test_raising_callbacks_are_recorded(self, config_file: Path) -> None:
+        def fail(value: Any) -> None:
+            raise RuntimeError(f"callback failed on {value!r}")
+
+        handle = ConfigHandle(config_file, watch=False, debounce=0, on_reload=fail, on_error=fail)
+        assert handle.reload()
+        reload_error = handle.callback_error
+        assert isinstance(reload_error, RuntimeError)
+        config_file.write_text("port: [1\n")
+        touch_forward(config_file)
+        assert not handle.poll()
+        assert handle.config.port == 1
+        assert handle.last_error is not None
+        assert isinstance(handle.callback_error, RuntimeError)
+        assert handle.callback_error is not reload_error
+
+    def test_watcher_survives_raising_callback(self, config_file: Path) -> None:
+        seen: list[int] = []
+
+        def on_reload(config: Any) -> None:
+            seen.append(config.port)
+            raise RuntimeError("callback failed")
+
+        with ConfigHandle(config_file, interval=0.01, debounce=0.02, on_reload=on_reload) as handle:
+            for port in (5, 6):
+                config_file.write_text(f"port: {port}\n")
+                touch_forward(config_file)
+                deadline = time.monotonic() + 5
+                while port not in seen and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            assert handle.config.port == 6
+            assert seen == [5, 6]
+            assert handle._thread is not None and handle._thread.is_alive()
+            assert isinstance(handle.callback_error, RuntimeError)
+
+    def test_background_watcher(self, config_file: Path) -> None:
+        with ConfigHandle(config_file, interval=0.01, debounce=0.02) as handle:
+            config_file.write_text("port: 5\n")
+            touch_forward(config_file)
+            deadline = time.monotonic() + 5
+            while handle.config.port != 5 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert handle.config.port == 5
+        assert handle._thread is None